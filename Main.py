@@ -1,5 +1,5 @@
-import pgzrun
 from pgzhelper import *
+from frameProfiler import FrameProfiler, section
 import pgzero.screen
 screen : pgzero.screen.Screen
 
@@ -9,6 +9,10 @@ HEIGHT = 1024
 nodeArray = []
 
 angles = [0,0]
+
+#Set to True to time each phase of update() and draw(). F3 toggles the timing HUD and F4 writes the timings as Chrome trace JSON
+profileFrames = False
+profiler = FrameProfiler() if profileFrames else None
 class NodeGroup:
     def __init__(self, speed, headSize, headConstraintRadius, startingPosition):
         self.speed = speed
@@ -46,12 +50,17 @@ class NodeGroup:
         self.headNode.desiredPoint = self.desiredPoint
 
     def updateNodePositions(self):
-        vectorToDesiredPos = [self.desiredPoint[0] - self.headNode.position[0], self.desiredPoint[1] - self.headNode.position[1]]
-        vectorToDesiredPos = normalizeVector(vectorToDesiredPos)
-        vectorToDesiredPos = multiplyVectorByScalar(vectorToDesiredPos, self.speed)
-        self.headNode.position[0] += vectorToDesiredPos[0]
-        self.headNode.position[1] += vectorToDesiredPos[1]
+        with section(profiler, "head move"):
+            vectorToDesiredPos = [self.desiredPoint[0] - self.headNode.position[0], self.desiredPoint[1] - self.headNode.position[1]]
+            vectorToDesiredPos = normalizeVector(vectorToDesiredPos)
+            vectorToDesiredPos = multiplyVectorByScalar(vectorToDesiredPos, self.speed)
+            self.headNode.position[0] += vectorToDesiredPos[0]
+            self.headNode.position[1] += vectorToDesiredPos[1]
+
+        with section(profiler, "follow pass + angle constraint"):
+            self.followHeadNode()
 
+    def followHeadNode(self):
         curNode = self.headNode
 
         while curNode.getNextNode() != None:
@@ -197,6 +206,8 @@ for i in range(20):
 
 
 def update():
+    if profiler != None:
+        profiler.beginFrame()
     screen.clear()
     nodeGroup.updateHeadNode()
     nodeGroup.updateNodePositions()
@@ -211,20 +222,36 @@ def update():
 def on_mouse_move(pos):
     nodeGroup.desiredPoint = pos
 
+def on_key_down(key):
+    if profiler != None:
+        if key == pygame.K_F3:
+            profiler.toggleHud()
+        elif key == pygame.K_F4:
+            profiler.exportChromeTrace("frameTrace.json")
+
 def draw():
     screen.fill((255, 255, 255))
-    nodeGroup.drawSegments()
+    with section(profiler, "drawSegments"):
+        nodeGroup.drawSegments()
+
+    with section(profiler, "angle text"):
+        if angles[0] < angles[1]:
+            screen.draw.text("cw " + str(angles[0]), [50, 150], color='green')
+            screen.draw.text(" ccw " + str(angles[1]), [150, 50], color="red")
+        elif angles[0] > angles[1]:
+            screen.draw.text("cw " + str(angles[0]), [50, 150], color='red')
+            screen.draw.text(" ccw " + str(angles[1]), [150, 50], color="green")
 
-    if angles[0] < angles[1]:
-        screen.draw.text("cw " + str(angles[0]), [50, 150], color='green')
-        screen.draw.text(" ccw " + str(angles[1]), [150, 50], color="red")
-    elif angles[0] > angles[1]:
-        screen.draw.text("cw " + str(angles[0]), [50, 150], color='red')
-        screen.draw.text(" ccw " + str(angles[1]), [150, 50], color="green")
+    if profiler != None:
+        profiler.drawHud(screen.surface)
+        profiler.endFrame()
 
     
 
-pgzrun.go()
+#pgzrun is only imported when this file is run directly so the simulation above can be imported without starting the game loop
+if __name__ == "__main__":
+    import pgzrun
+    pgzrun.go()
 
 
 
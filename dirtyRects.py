@@ -0,0 +1,73 @@
+#This file contains the dirty rectangle renderer used by pygameConversion.py. Instead of clearing and flipping the whole window
+#every frame, only the areas the creatures covered last frame and cover this frame are cleared and sent to the display
+
+
+
+
+import pygame
+
+
+
+class DirtyRectRenderer:
+    """
+    Tracks the screen areas drawn each frame. clear() paints the background over everything drawn last frame, the caller then draws
+    and reports the areas it drew to with track(), and update() pushes only last frame's and this frame's areas to the display
+    """
+    def __init__(self, surface, backgroundColor):
+        """
+        Args:
+            surface (_pygame.Surface_): the display surface
+            backgroundColor (_(int, int, int)_): the color the window is cleared to
+        """
+        self.surface = surface
+        self.backgroundColor = backgroundColor
+        self._previousRects = []
+        self._currentRects = []
+        self._needsFullRedraw = True
+
+
+    def clear(self):
+        """Clears the areas drawn to last frame. The first frame clears the whole surface
+        """
+        if self._needsFullRedraw:
+            self.surface.fill(self.backgroundColor)
+            return
+        for rect in self._previousRects:
+            self.surface.fill(self.backgroundColor, rect)
+
+
+    def track(self, rect):
+        """Records an area that was drawn to this frame
+
+        Args:
+            rect (_pygame.Rect_): the area drawn to
+        """
+        if rect != None:
+            self._currentRects.append(rect.clip(self.surface.get_rect()))
+
+
+    def update(self):
+        """Sends the changed areas to the display. An area from last frame that overlaps one from this frame is merged with it
+        so the same pixels aren't updated twice
+        """
+        if self._needsFullRedraw:
+            pygame.display.update()
+            self._needsFullRedraw = False
+        else:
+            rects = list(self._currentRects)
+            for previous in self._previousRects:
+                index = previous.collidelist(rects)
+                if index == -1:
+                    rects.append(previous)
+                else:
+                    rects[index] = rects[index].union(previous)
+            pygame.display.update(rects)
+
+        self._previousRects = self._currentRects
+        self._currentRects = []
+
+
+    def invalidate(self):
+        """Makes the next frame clear and update the whole window, e.g. after the window has been covered or resized
+        """
+        self._needsFullRedraw = True
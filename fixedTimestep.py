@@ -0,0 +1,64 @@
+#This file contains the fixed timestep accumulator used by pygameConversion.py. The simulation always advances in steps of the same
+#length no matter how long frames take to render, so creatures move at the same speed at any frame rate. The time left over after the
+#last whole step is returned as alpha, which the renderer uses to draw creatures part way between their last two simulated states
+
+
+
+
+import time
+
+
+
+class FixedTimestep:
+    """
+    Turns real frame times into a whole number of fixed length simulation steps. Each creature (or group of creatures) can have its
+    own FixedTimestep, so background creatures can be simulated at a lower rate than the ones the player is looking at
+    """
+    def __init__(self, simulationHz=60, maxSubSteps=5, clock=time.perf_counter):
+        """
+        Args:
+            simulationHz (_float_, optional): simulation steps per second. Defaults to 60.
+            maxSubSteps (_int_, optional): most steps run for a single frame. When a frame takes longer than this many steps the extra time
+            is dropped, so one slow frame can't make every following frame slower as well. Defaults to 5.
+            clock (_function_, optional): returns the current time in seconds. Defaults to time.perf_counter.
+        """
+        self.simulationHz = simulationHz
+        self.dt = 1/simulationHz
+        """Length of one simulation step in seconds
+        """
+        self.maxSubSteps = maxSubSteps
+        self.clock = clock
+        self.alpha = 0
+        """How far the current frame is between the previous simulation step and the latest one, from 0 to 1
+        """
+        self._accumulator = 0
+        self._lastTime = None
+
+
+    def advance(self, frameSeconds=None):
+        """Adds a frame's worth of time and works out how many simulation steps should be run for it
+
+        Args:
+            frameSeconds (_float_, optional): length of the frame. Defaults to the time since the last call.
+
+        Returns:
+            _int_: number of steps of length dt to run this frame
+        """
+        if frameSeconds == None:
+            now = self.clock()
+            frameSeconds = 0 if self._lastTime == None else now - self._lastTime
+            self._lastTime = now
+
+        self._accumulator += min(frameSeconds, self.maxSubSteps*self.dt)
+        steps = int(self._accumulator/self.dt)
+        self._accumulator -= steps*self.dt
+        self.alpha = self._accumulator/self.dt
+        return steps
+
+
+    def reset(self):
+        """Drops any accumulated time, e.g. after the simulation was paused
+        """
+        self._accumulator = 0
+        self._lastTime = None
+        self.alpha = 0
@@ -0,0 +1,214 @@
+#This file renders the headless snake scene to disk instead of to a window, e.g. for promo clips on a build server with no display.
+#The creatures are simulated at a fixed timestep, every frame is drawn onto an offscreen surface, and the frames are written either as
+#numbered PNGs, compressed by a pool of worker processes so encoding doesn't hold up the simulation, or as one raw RGB stream
+#Example: python frameExport.py --frames 10000 --output clip --format png
+#A raw stream can be turned into a video with: ffmpeg -f rawvideo -pix_fmt rgb24 -s 1280x1024 -r 60 -i clip/frames.rgb clip.mp4
+
+
+
+
+import argparse
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+#The dummy video driver lets pygame draw onto offscreen surfaces on machines with no display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from headlessRunner import ENGINES, SCREEN_WIDTH, SCREEN_HEIGHT, buildCreatures, stepCreatures, drawCreatures
+from proceduralSpine import SIMULATION_HZ
+
+FORMATS = ["png", "raw"]
+
+
+
+class FrameExporter:
+    """
+    Writes frames to a directory. PNG frames are handed to a process pool as raw pixels and compressed there, raw frames are appended
+    to frames.rgb by a writer thread. Either way write() returns as soon as the pixels have been copied, unless more than maxPending
+    frames are still waiting to be written, in which case it waits for the oldest one so memory use stays bounded
+    """
+    def __init__(self, outputDir, imageFormat="png", workerCount=None, maxPending=None, compressionLevel=6):
+        """
+        Args:
+            outputDir (_str_): directory the frames are written to. It is created if it doesn't exist
+            imageFormat (_str_, optional): "png" for numbered PNG files or "raw" for a single stream of 24 bit RGB frames. Defaults to "png".
+            workerCount (_int_, optional): number of PNG encoding processes. Defaults to one per CPU core.
+            maxPending (_int_, optional): most frames waiting to be written at once. Defaults to 4 per worker.
+            compressionLevel (_int_, optional): zlib level of the PNGs, from 1 (fastest) to 9 (smallest). Defaults to 6.
+        """
+        if imageFormat not in FORMATS:
+            raise ValueError(f"imageFormat must be one of {FORMATS}")
+        os.makedirs(outputDir, exist_ok=True)
+        self.outputDir = outputDir
+        self.imageFormat = imageFormat
+        self.compressionLevel = compressionLevel
+        self.frameCount = 0
+
+        if workerCount == None:
+            workerCount = os.cpu_count() or 1
+        if maxPending == None:
+            maxPending = 4*workerCount
+        self.maxPending = maxPending
+
+        self._pool = None
+        self._pending = deque()
+        self._rawQueue = None
+        self._rawThread = None
+        self._rawError = None
+        if imageFormat == "png":
+            self._pool = ProcessPoolExecutor(workerCount)
+        else:
+            self._rawQueue = queue.Queue(maxsize=maxPending)
+            self._rawThread = threading.Thread(target=self._writeRaw, args=(os.path.join(outputDir, "frames.rgb"),), daemon=True)
+            self._rawThread.start()
+
+
+    def write(self, surface):
+        """Queues a frame to be written
+
+        Args:
+            surface (_pygame.Surface_): the frame. Its pixels are copied, so it can be drawn over straight away
+
+        Returns:
+            _int_: the number of the frame
+        """
+        frame = self.frameCount
+        pixels = pygame.image.tobytes(surface, "RGB")
+        if self._pool != None:
+            while len(self._pending) >= self.maxPending:
+                self._pending.popleft().result()
+            path = os.path.join(self.outputDir, f"frame{frame:06d}.png")
+            self._pending.append(self._pool.submit(_encodePng, pixels, surface.get_size(), path, self.compressionLevel))
+        else:
+            if self._rawError != None:
+                raise self._rawError
+            self._rawQueue.put(pixels)
+        self.frameCount += 1
+        return frame
+
+
+    def _writeRaw(self, path):
+        """Writer thread loop. Appends every queued frame to the raw stream until None is queued
+        """
+        with open(path, "wb") as stream:
+            while True:
+                pixels = self._rawQueue.get()
+                if pixels == None:
+                    return
+                if self._rawError == None:
+                    try:
+                        stream.write(pixels)
+                    except OSError as error:
+                        self._rawError = error
+
+
+    def close(self):
+        """Waits for every queued frame to be written
+        """
+        if self._pool != None:
+            while self._pending:
+                self._pending.popleft().result()
+            self._pool.shutdown()
+            self._pool = None
+        if self._rawThread != None:
+            self._rawQueue.put(None)
+            self._rawThread.join()
+            self._rawThread = None
+            if self._rawError != None:
+                raise self._rawError
+
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+
+
+
+def _encodePng(pixels, size, path, compressionLevel):
+    """Worker process job. Compresses one frame of raw RGB pixels to a PNG file. The file is written directly rather than with
+    pygame.image.save(), which takes about twice as long for the same size of file
+    """
+    width, height = size
+    stride = width*3
+    #Every row starts with a filter type byte, 0 meaning the row is stored as is
+    rows = b"".join(b"\0" + pixels[y*stride:(y + 1)*stride] for y in range(height))
+    with open(path, "wb") as image:
+        image.write(b"\x89PNG\r\n\x1a\n")
+        _writePngChunk(image, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        _writePngChunk(image, b"IDAT", zlib.compress(rows, compressionLevel))
+        _writePngChunk(image, b"IEND", b"")
+
+
+def _writePngChunk(image, chunkType, data):
+    image.write(struct.pack(">I", len(data)))
+    image.write(chunkType)
+    image.write(data)
+    image.write(struct.pack(">I", zlib.crc32(chunkType + data)))
+
+
+def exportFrames(outputDir, frameCount, engine="node", creatureCount=1, fps=60, imageFormat="png", workerCount=None, compressionLevel=6):
+    """Simulates the headless scene at a fixed timestep and writes frameCount frames of it to outputDir
+
+    Args:
+        outputDir (_str_): directory the frames are written to
+        frameCount (_int_): number of frames to export
+        engine (_str_, optional): one of headlessRunner.ENGINES. Defaults to "node".
+        creatureCount (_int_, optional): number of snakes. Defaults to 1.
+        fps (_float_, optional): frame rate of the exported clip. The simulation always runs at SIMULATION_HZ. Defaults to 60.
+        imageFormat (_str_, optional): "png" or "raw". Defaults to "png".
+        workerCount (_int_, optional): number of PNG encoding processes. Defaults to one per CPU core.
+        compressionLevel (_int_, optional): zlib level of the PNGs, from 1 (fastest) to 9 (smallest). Defaults to 6.
+
+    Returns:
+        _float_: frames exported per second
+    """
+    creatures = buildCreatures(engine, creatureCount)
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    step = 0
+
+    start = time.perf_counter()
+    try:
+        with FrameExporter(outputDir, imageFormat, workerCount, compressionLevel=compressionLevel) as exporter:
+            for frame in range(frameCount):
+                #The steps due by the end of each frame are counted from the start of the clip rather than accumulated frame by frame,
+                #so rounding never adds or drops a step and the same clip is exported every time
+                dueSteps = int((frame + 1)*SIMULATION_HZ/fps + 1e-9)
+                while step < dueSteps:
+                    stepCreatures(creatures, step)
+                    step += 1
+                drawCreatures(creatures, surface)
+                exporter.write(surface)
+    finally:
+        if engine == "sharded":
+            creatures.close()
+    return frameCount/(time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Renders procedurally animated snakes to image files without a window")
+    parser.add_argument("--output", default="frames", help="directory to write the frames to")
+    parser.add_argument("--frames", type=int, default=600, help="number of frames to export")
+    parser.add_argument("--fps", type=float, default=60, help="frame rate of the exported clip")
+    parser.add_argument("--format", choices=FORMATS, default="png", help="numbered PNG files or a single raw RGB stream")
+    parser.add_argument("--engine", choices=ENGINES, default="node", help="spine engine to simulate with")
+    parser.add_argument("--creatures", type=int, default=1, help="number of snakes")
+    parser.add_argument("--workers", type=int, default=None, help="PNG encoding processes, one per CPU core by default")
+    parser.add_argument("--compression", type=int, default=6, choices=range(1, 10), help="PNG zlib level, 1 is fastest and 9 is smallest")
+    args = parser.parse_args()
+
+    framesPerSecond = exportFrames(args.output, args.frames, args.engine, args.creatures, args.fps, args.format, args.workers, args.compression)
+    print(f"exported {args.frames} frames to {args.output} at {framesPerSecond:.1f} frames/s ({framesPerSecond/args.fps:.2f}x real time)")
+
+
+if __name__ == "__main__":
+    main()
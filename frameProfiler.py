@@ -0,0 +1,204 @@
+#This file contains an optional per phase frame profiler. Each phase of a frame (moving the head, drawing the polygon, updating the
+#display...) is timed separately, the last few seconds of timings are kept to show rolling means and p95/p99 on a HUD, and the
+#same timings can be written out as Chrome trace JSON (open it in chrome://tracing or https://ui.perfetto.dev)
+
+
+
+
+import contextlib
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+
+
+
+class FrameProfiler:
+    """
+    Times the phases of every frame. Phases are timed either with section(), which records a span on the trace, or with addTime()
+    for phases that are spread across a loop (like the follow pass, which runs once per node) and are summed over the frame.
+    beginFrame() and endFrame() mark where each frame starts and ends.
+    """
+    def __init__(self, windowSize=240, maxTraceFrames=3600):
+        """
+        Args:
+            windowSize (_int_, optional): number of frames the rolling statistics are calculated over. Defaults to 240.
+            maxTraceFrames (_int_, optional): number of most recent frames kept for the trace export. Defaults to 3600.
+        """
+        self.windowSize = windowSize
+        self.showHud = False
+        self.clock = time.perf_counter
+
+        self.phaseOrder = []
+        self.frameTimes = {}
+        """Rolling per frame totals of every phase, in seconds
+        """
+        self._frameTotals = {}
+        self._frameStart = None
+        self._frameEvents = []
+        self._traceFrames = deque(maxlen=maxTraceFrames)
+        self._origin = self.clock()
+
+        self._hudFont = None
+        self._hudLines = []
+        self._hudRefreshFrames = 15
+        self._framesSinceHudRefresh = self._hudRefreshFrames
+
+
+    def beginFrame(self):
+        """Marks the start of a frame
+        """
+        self._frameTotals = {}
+        self._frameEvents = []
+        self._frameStart = self.clock()
+
+
+    def endFrame(self):
+        """Marks the end of a frame. The phase totals of the frame are added to the rolling statistics and the trace
+        """
+        if self._frameStart == None:
+            return
+        end = self.clock()
+        self.addTime("frame", end - self._frameStart)
+        self._frameEvents.append(("X", "frame", self._frameStart, end - self._frameStart))
+
+        for name, total in self._frameTotals.items():
+            if name not in self.frameTimes:
+                self.frameTimes[name] = deque(maxlen=self.windowSize)
+                self.phaseOrder.append(name)
+            self.frameTimes[name].append(total)
+
+        self._traceFrames.append((self._frameEvents, self._frameTotals, end))
+        self._frameStart = None
+        self._framesSinceHudRefresh += 1
+
+
+    def addFrame(self, other):
+        """Adds everything another profiler has timed since its last beginFrame() to the current frame, then starts a new frame on
+        it. Work timed on another thread is collected this way, so it never races with this profiler's own frames
+
+        Args:
+            other (_FrameProfiler_): the profiler to take the timings from
+        """
+        for name, total in other._frameTotals.items():
+            self.addTime(name, total)
+        self._frameEvents.extend(other._frameEvents)
+        other.beginFrame()
+
+
+    @contextlib.contextmanager
+    def section(self, name):
+        """Times the code inside a with block as the phase name
+
+        Args:
+            name (_str_): name of the phase
+        """
+        start = self.clock()
+        try:
+            yield
+        finally:
+            duration = self.clock() - start
+            self.addTime(name, duration)
+            self._frameEvents.append(("X", name, start, duration))
+
+
+    def addTime(self, name, seconds):
+        """Adds time to a phase of the current frame
+
+        Args:
+            name (_str_): name of the phase
+            seconds (_float_): time spent in the phase
+        """
+        self._frameTotals[name] = self._frameTotals.get(name, 0) + seconds
+
+
+    def stats(self, name):
+        """Rolling statistics of a phase over the last windowSize frames
+
+        Args:
+            name (_str_): name of the phase
+
+        Returns:
+            _(float, float, float)_: mean, p95 and p99 of the phase in milliseconds
+        """
+        times = sorted(self.frameTimes.get(name, ()))
+        if not times:
+            return (0.0, 0.0, 0.0)
+        mean = sum(times)/len(times)
+        return (mean*1000, _percentile(times, 95)*1000, _percentile(times, 99)*1000)
+
+
+    def toggleHud(self):
+        self.showHud = not self.showHud
+
+
+    def drawHud(self, surface, position=(10, 10)):
+        """Draws the rolling mean/p95/p99 of every phase onto a surface if the HUD is shown. The text is only re-rendered every
+        few frames so the HUD doesn't cost much itself
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the HUD on
+            position (_(int, int)_, optional): top left corner of the HUD. Defaults to (10, 10).
+
+        Returns:
+            _pygame.Rect or None_: the area the HUD was drawn over, or None if it is hidden
+        """
+        if not self.showHud:
+            return None
+        if self._hudFont == None:
+            pygame.font.init()
+            self._hudFont = pygame.font.Font(None, 20)
+
+        if self._framesSinceHudRefresh >= self._hudRefreshFrames:
+            self._framesSinceHudRefresh = 0
+            text = [f"{'phase':<24}{'mean':>8}{'p95':>8}{'p99':>8}  ms"]
+            for name in self.phaseOrder:
+                mean, p95, p99 = self.stats(name)
+                text.append(f"{name:<24}{mean:>8.3f}{p95:>8.3f}{p99:>8.3f}")
+            self._hudLines = [self._hudFont.render(line, True, (255, 255, 255), (0, 0, 0)) for line in text]
+
+        x, y = position
+        hudRect = pygame.Rect(x, y, 0, 0)
+        for line in self._hudLines:
+            hudRect.union_ip(surface.blit(line, (x, y)))
+            y += line.get_height()
+        return hudRect
+
+
+    def exportChromeTrace(self, path):
+        """Writes the recorded frames as Chrome trace event JSON. Phases timed with section() become spans, and phases timed with
+        addTime() become counters holding their total for the frame
+
+        Args:
+            path (_str_): file to write
+        """
+        events = []
+        for frameEvents, frameTotals, frameEnd in self._traceFrames:
+            for kind, name, start, duration in frameEvents:
+                events.append({"name": name, "ph": kind, "ts": (start - self._origin)*1e6, "dur": duration*1e6, "pid": os.getpid(), "tid": 0})
+            counters = {name: total*1000 for name, total in frameTotals.items()}
+            events.append({"name": "phase totals (ms)", "ph": "C", "ts": (frameEnd - self._origin)*1e6, "pid": os.getpid(), "tid": 0, "args": counters})
+
+        with open(path, "w") as traceFile:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, traceFile)
+
+
+
+
+def section(profiler, name):
+    """Times a with block on profiler if there is one, otherwise does nothing. Lets code be instrumented without checking for a profiler
+
+    Args:
+        profiler (_FrameProfiler or None_): the profiler to record the phase on
+        name (_str_): name of the phase
+    """
+    if profiler == None:
+        return contextlib.nullcontext()
+    return profiler.section(name)
+
+
+def _percentile(sortedValues, percent):
+    index = min(len(sortedValues) - 1, int(round(percent/100*(len(sortedValues) - 1))))
+    return sortedValues[index]
@@ -0,0 +1,155 @@
+#This file steps creatures as fast as possible without opening a window and reports the simulation throughput.
+#Every creature chases its own scripted target, so runs are repeatable and don't need a mouse
+#Example: python headlessRunner.py --engine world --creatures 500 --steps 1000
+
+
+
+
+import argparse
+import math
+import os
+import time
+
+#The dummy video driver lets pygame draw onto offscreen surfaces on machines with no display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from proceduralSpine import buildSnake, snakeProfile, snakeAngleLimits, SNAKE_HEAD_DRAW_POINTS, SNAKE_TAIL_DRAW_POINTS, SNAKE_SPEED, SNAKE_BODY_NODES, SPLINE_KINDS
+
+SCREEN_WIDTH = 1280
+SCREEN_HEIGHT = 1024
+
+ENGINES = ["node", "array", "world", "sharded"]
+
+
+
+def scriptedTarget(creature, step):
+    """The point a creature chases on a given step. Each creature follows its own lissajous curve across the screen
+
+    Args:
+        creature (_int_): index of the creature
+        step (_int_): the simulation step
+
+    Returns:
+        _(float, float)_: the target point
+    """
+    t = step/60 + creature*0.37
+    return (SCREEN_WIDTH/2 + SCREEN_WIDTH*0.4*math.cos(t*0.7 + creature), SCREEN_HEIGHT/2 + SCREEN_HEIGHT*0.4*math.sin(t*1.3))
+
+
+def startingPosition(creature):
+    return [100 + (creature*97) % (SCREEN_WIDTH - 200), 100 + (creature*61) % (SCREEN_HEIGHT - 200)]
+
+
+def buildCreatures(engine, creatureCount, workerCount=None, bodyNodes=SNAKE_BODY_NODES, splineKind=None):
+    """Builds creatureCount copies of the demo snake
+
+    Args:
+        engine (_str_): "node" for NodeGroups, "array" for ArrayNodeGroups, "world" for a single batched World or "sharded" for a World
+        stepped across worker processes
+        creatureCount (_int_): number of snakes
+        workerCount (_int_, optional): number of worker processes for the "sharded" engine. Defaults to one per CPU core.
+        bodyNodes (_int_, optional): number of body nodes per snake, see snakeProfile(). Defaults to SNAKE_BODY_NODES.
+        splineKind (_str_, optional): one of SPLINE_KINDS to draw the outlines as smooth curves. Defaults to None.
+
+    Returns:
+        _list, World or ShardedWorld_: the creatures, or the World holding them
+    """
+    if engine in ("world", "sharded"):
+        from spineArrays import World
+        world = World()
+        world.splineKind = splineKind
+        nodeSizes, nodeConstraintRadii = snakeProfile(bodyNodes)
+        angleLimits = snakeAngleLimits(bodyNodes)
+        for creature in range(creatureCount):
+            world.addCreature(SNAKE_SPEED, nodeSizes, nodeConstraintRadii, startingPosition(creature), SNAKE_HEAD_DRAW_POINTS, SNAKE_TAIL_DRAW_POINTS, angleLimits)
+        if engine == "sharded":
+            from shardedWorld import ShardedWorld
+            return ShardedWorld(world, workerCount)
+        return world
+    return [buildSnake(engine == "array", startingPosition(creature), bodyNodes=bodyNodes, splineKind=splineKind) for creature in range(creatureCount)]
+
+
+def stepCreatures(creatures, step):
+    """Advances every creature one step towards its scripted target
+    """
+    if isinstance(creatures, list):
+        for creature, nodeGroup in enumerate(creatures):
+            nodeGroup.desiredPoint = scriptedTarget(creature, step)
+            nodeGroup.updateHeadNode()
+            nodeGroup.updateNodePositions()
+    else:
+        for creature in range(creatures.creatureCount):
+            creatures.desiredPoints[creature] = scriptedTarget(creature, step)
+        creatures.step()
+
+
+def drawCreatures(creatures, surface):
+    surface.fill((60,60,60))
+    for nodeGroup in (creatures if isinstance(creatures, list) else [creatures]):
+        nodeGroup.draw(surface)
+
+
+def runBenchmark(engine, creatureCount, steps, warmupSteps=50, render=False, workerCount=None, bodyNodes=SNAKE_BODY_NODES, splineKind=None):
+    """Steps the creatures as fast as possible and measures how long it takes
+
+    Args:
+        engine (_str_): one of ENGINES
+        creatureCount (_int_): number of snakes
+        steps (_int_): number of timed steps
+        warmupSteps (_int_, optional): untimed steps run first. Defaults to 50.
+        render (_bool_, optional): also draw every step onto an offscreen surface. Defaults to False.
+        workerCount (_int_, optional): number of worker processes for the "sharded" engine. Defaults to one per CPU core.
+        bodyNodes (_int_, optional): number of body nodes per snake. Defaults to SNAKE_BODY_NODES.
+        splineKind (_str_, optional): one of SPLINE_KINDS to draw the outlines as smooth curves. Defaults to None.
+
+    Returns:
+        _dict_: steps per second, creature steps per second, node steps per second and milliseconds per step
+    """
+    creatures = buildCreatures(engine, creatureCount, workerCount, bodyNodes, splineKind)
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)) if render else None
+    nodesPerCreature = len(snakeProfile(bodyNodes)[0])
+
+    for step in range(warmupSteps):
+        stepCreatures(creatures, step)
+
+    start = time.perf_counter()
+    for step in range(warmupSteps, warmupSteps + steps):
+        stepCreatures(creatures, step)
+        if render:
+            drawCreatures(creatures, surface)
+    elapsed = time.perf_counter() - start
+
+    if engine == "sharded":
+        creatures.close()
+
+    stepsPerSecond = steps/elapsed
+    return {
+        "stepsPerSecond": stepsPerSecond,
+        "creatureStepsPerSecond": stepsPerSecond*creatureCount,
+        "nodeStepsPerSecond": stepsPerSecond*creatureCount*nodesPerCreature,
+        "msPerStep": elapsed/steps*1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Steps procedurally animated snakes without a window and reports steps/second")
+    parser.add_argument("--engine", choices=ENGINES, default="node", help="spine engine to simulate with")
+    parser.add_argument("--creatures", type=int, default=1, help="number of snakes")
+    parser.add_argument("--steps", type=int, default=1000, help="number of timed steps")
+    parser.add_argument("--warmup", type=int, default=50, help="untimed steps run before timing starts")
+    parser.add_argument("--render", action="store_true", help="also draw every step onto an offscreen surface")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for the sharded engine, one per CPU core by default")
+    parser.add_argument("--body-nodes", type=int, default=SNAKE_BODY_NODES, help="nodes between each snake's head and tail")
+    parser.add_argument("--spline", choices=SPLINE_KINDS, default=None, help="draw the outlines as smooth curves")
+    args = parser.parse_args()
+
+    results = runBenchmark(args.engine, args.creatures, args.steps, args.warmup, args.render, args.workers, args.body_nodes, args.spline)
+    print(f"engine={args.engine} creatures={args.creatures} nodes={len(snakeProfile(args.body_nodes)[0])} steps={args.steps} render={args.render}")
+    print(f"{results['stepsPerSecond']:.1f} steps/s ({results['msPerStep']:.3f} ms/step)")
+    print(f"{results['creatureStepsPerSecond']:.1f} creature steps/s")
+    print(f"{results['nodeStepsPerSecond']:.0f} node steps/s")
+
+
+if __name__ == "__main__":
+    main()
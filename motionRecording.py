@@ -0,0 +1,273 @@
+#This file contains a compact binary recorder for creature motion, and a replayer that draws recordings straight from the file.
+#Every frame stores, for each creature, its desired point, its node positions and the outline and eye points it was drawn with, as
+#float32 (or float64 for exact reproduction). Every frame is the same size, so any frame can be found without reading the ones before it.
+#Replays are drawn the same way the creatures were drawn live, with the spline kind, head size and level of detail they were drawn with.
+#
+#File layout (little endian):
+#   header: magic b"SNAKEREC", version (u32), bytes per value (u32), creature count (u32), unused (u32), frame count (u64),
+#           then the node count and outline point count (u32, u32), head size (f64), spline kind (u32, 0 for none, otherwise
+#           1 + its index in SPLINE_KINDS) and spline resolution (u32) of every creature, padded to a multiple of 64 bytes
+#   frames: per creature, desired point (2 values), node positions (2 per node), outline (2 per point), eyes (4 values), and 1 if the
+#           creature was drawn with a reduced level of detail outline, otherwise 0 (1 value)
+
+
+
+
+import struct
+import numpy as np
+import pygame
+from proceduralSpine import SPLINE_KINDS
+from spineArrays import drawOutlinePoints
+
+MAGIC = b"SNAKEREC"
+VERSION = 2
+_HEADER = struct.Struct("<8sIIIIQ")
+_CREATURE = struct.Struct("<IIdII")
+
+
+
+def _headerSize(creatureCount):
+    size = _HEADER.size + _CREATURE.size*creatureCount
+    return (size + 63)//64*64
+
+
+def _creatureLayout(nodeCounts, outlineCounts):
+    """Works out where each creature's values sit within a frame
+
+    Returns:
+        _([(int, int, int, int, int)...], int)_: the offsets of the desired point, node positions, outline, eyes and level of detail flag
+        of every creature, and the number of values in a frame
+    """
+    layout = []
+    offset = 0
+    for nodeCount, outlineCount in zip(nodeCounts, outlineCounts):
+        positionsStart = offset + 2
+        outlineStart = positionsStart + 2*nodeCount
+        eyesStart = outlineStart + 2*outlineCount
+        lodStart = eyesStart + 4
+        layout.append((offset, positionsStart, outlineStart, eyesStart, lodStart))
+        offset = lodStart + 1
+    return layout, offset
+
+
+def _headSize(nodeGroup):
+    #NodeGroup keeps its sizes on its nodes and ArrayNodeGroup in an array
+    if hasattr(nodeGroup, "headNode"):
+        return nodeGroup.headNode.size
+    return float(nodeGroup.sizes[0])
+
+
+def _splineKindCode(splineKind):
+    return 0 if splineKind == None else SPLINE_KINDS.index(splineKind) + 1
+
+
+
+
+class MotionRecorder:
+    """
+    Appends the state of a set of node groups to a recording file once per frame. The file grows a chunk of frames at a time and each
+    chunk is written through a memory map. The frame count in the header is updated whenever a chunk fills up and on close(), so a
+    recording that was cut short still holds every frame up to the last full chunk
+    """
+    def __init__(self, path, nodeGroups, dtype=np.float32, chunkFrames=256):
+        """
+        Args:
+            path (_str_): file to write. An existing file is replaced
+            nodeGroups (_[NodeGroup or ArrayNodeGroup...]_): the creatures to record. Their node counts, head size and spline settings
+            must not change while recording
+            dtype (_numpy.dtype_, optional): np.float32 for compact files or np.float64 to reproduce positions exactly. Defaults to np.float32.
+            chunkFrames (_int_, optional): number of frames the file grows by at a time. Defaults to 256.
+        """
+        self.path = path
+        self.nodeGroups = list(nodeGroups)
+        self.dtype = np.dtype(dtype).newbyteorder("<")
+        self.chunkFrames = chunkFrames
+        self.frameCount = 0
+
+        self._nodeCounts = [len(nodeGroup.getNodePositions()) for nodeGroup in self.nodeGroups]
+        self._outlineCounts = [len(nodeGroup.buildOutline()) for nodeGroup in self.nodeGroups]
+        self._drawSettings = [(_headSize(nodeGroup), _splineKindCode(nodeGroup.splineKind), nodeGroup.splineResolution) for nodeGroup in self.nodeGroups]
+        self._layout, self._frameValues = _creatureLayout(self._nodeCounts, self._outlineCounts)
+        self._frameBytes = self._frameValues*self.dtype.itemsize
+        self._headerSize = _headerSize(len(self.nodeGroups))
+
+        self._file = open(path, "w+b")
+        self._writeHeader()
+        self._chunk = None
+        self._chunkStart = 0
+
+
+    def _writeHeader(self):
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, self.dtype.itemsize, len(self.nodeGroups), 0, self.frameCount))
+        for nodeCount, outlineCount, (headSize, splineKind, splineResolution) in zip(self._nodeCounts, self._outlineCounts, self._drawSettings):
+            self._file.write(_CREATURE.pack(nodeCount, outlineCount, headSize, splineKind, splineResolution))
+        self._file.write(bytes(self._headerSize - self._file.tell()))
+        self._file.flush()
+
+
+    def _nextChunk(self):
+        """Flushes the current chunk, grows the file by chunkFrames frames and maps the new space
+        """
+        if self._chunk is not None:
+            self._chunk.flush()
+            self._writeHeader()
+        self._chunkStart = self.frameCount
+        self._file.truncate(self._headerSize + (self._chunkStart + self.chunkFrames)*self._frameBytes)
+        self._chunk = np.memmap(self._file, dtype=self.dtype, mode="r+", offset=self._headerSize + self._chunkStart*self._frameBytes, shape=(self.chunkFrames, self._frameValues))
+
+
+    def record(self):
+        """Appends the current state of every node group as a new frame
+        """
+        if self._file is None:
+            raise ValueError("the recording has been closed")
+        if self._chunk is None or self.frameCount - self._chunkStart == self.chunkFrames:
+            self._nextChunk()
+
+        frame = self._chunk[self.frameCount - self._chunkStart]
+        for nodeGroup, (desiredStart, positionsStart, outlineStart, eyesStart, lodStart) in zip(self.nodeGroups, self._layout):
+            positions = nodeGroup.getNodePositions()
+            outline = nodeGroup.buildOutline()
+            if 2*len(positions) != outlineStart - positionsStart or 2*len(outline) != eyesStart - outlineStart:
+                raise ValueError("node groups can't gain or lose nodes while they are being recorded")
+            frame[desiredStart:positionsStart] = nodeGroup.desiredPoint
+            frame[positionsStart:outlineStart].reshape(-1, 2)[:] = positions
+            frame[outlineStart:eyesStart].reshape(-1, 2)[:] = outline
+            frame[eyesStart:lodStart].reshape(2, 2)[:] = nodeGroup.getEyePositions()
+            frame[lodStart] = nodeGroup.getLodIndexes() is not None
+        self.frameCount += 1
+
+
+    def close(self):
+        """Writes out the last chunk, trims the unused space off the end of the file and updates the header
+        """
+        if self._file is None:
+            return
+        if self._chunk is not None:
+            self._chunk.flush()
+            self._chunk = None
+        self._file.truncate(self._headerSize + self.frameCount*self._frameBytes)
+        self._writeHeader()
+        self._file.close()
+        self._file = None
+
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+
+
+
+class MotionReplay:
+    """
+    Reads a recording made by MotionRecorder through a read only memory map. Frames are returned as views into the map and drawn
+    directly from it, so nothing is simulated and nothing is read from disk until a frame is used
+    """
+    def __init__(self, path):
+        """
+        Args:
+            path (_str_): the recording to read
+        """
+        with open(path, "rb") as recording:
+            magic, version, itemSize, creatureCount, unused, frameCount = _HEADER.unpack(recording.read(_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a creature motion recording")
+            if version != VERSION:
+                raise ValueError(f"{path} is recording version {version}, only version {VERSION} can be read")
+            creatures = [_CREATURE.unpack(recording.read(_CREATURE.size)) for creature in range(creatureCount)]
+
+        self.creatureCount = creatureCount
+        self.frameCount = frameCount
+        self.dtype = np.dtype("<f4" if itemSize == 4 else "<f8")
+        self.nodeCounts = [creature[0] for creature in creatures]
+        self._layout, frameValues = _creatureLayout(self.nodeCounts, [creature[1] for creature in creatures])
+        self.headSizes = [creature[2] for creature in creatures]
+        self.splineKinds = [SPLINE_KINDS[creature[3] - 1] if creature[3] else None for creature in creatures]
+        self.splineResolutions = [creature[4] for creature in creatures]
+        self._frames = None
+        if frameCount > 0:
+            self._frames = np.memmap(path, dtype=self.dtype, mode="r", offset=_headerSize(creatureCount), shape=(frameCount, frameValues))
+
+
+    def __len__(self):
+        return self.frameCount
+
+
+    def _creature(self, frame, creature):
+        if not -self.frameCount <= frame < self.frameCount:
+            raise IndexError(f"frame {frame} is outside the recording's {self.frameCount} frames")
+        return self._frames[frame], self._layout[creature]
+
+
+    def desiredPoint(self, frame, creature=0):
+        """Returns:
+            _numpy.ndarray_: the desired point of a creature on a frame
+        """
+        values, (desiredStart, positionsStart, outlineStart, eyesStart, lodStart) = self._creature(frame, creature)
+        return values[desiredStart:positionsStart]
+
+
+    def nodePositions(self, frame, creature=0):
+        """Returns:
+            _numpy.ndarray_: (n, 2) node positions of a creature on a frame, head first
+        """
+        values, (desiredStart, positionsStart, outlineStart, eyesStart, lodStart) = self._creature(frame, creature)
+        return values[positionsStart:outlineStart].reshape(-1, 2)
+
+
+    def renderState(self, frame, creature=0):
+        """Returns:
+            _(numpy.ndarray, numpy.ndarray)_: the outline and eye positions a creature was drawn with on a frame, in the same form as
+            captureRenderState()
+        """
+        values, (desiredStart, positionsStart, outlineStart, eyesStart, lodStart) = self._creature(frame, creature)
+        return values[outlineStart:eyesStart].reshape(-1, 2), values[eyesStart:lodStart].reshape(2, 2)
+
+
+    def applyFrame(self, frame, nodeGroups):
+        """Moves live node groups into the state they were recorded in on a frame, e.g. to carry on simulating from it
+
+        Args:
+            frame (_int_): the frame to load
+            nodeGroups (_[NodeGroup or ArrayNodeGroup...]_): one node group per recorded creature, with the same node counts
+        """
+        for creature, nodeGroup in enumerate(nodeGroups):
+            desiredPoint = self.desiredPoint(frame, creature)
+            nodeGroup.desiredPoint = [float(desiredPoint[0]), float(desiredPoint[1])]
+            nodeGroup.updateHeadNode()
+            nodeGroup.setNodePositions(self.nodePositions(frame, creature))
+
+
+    def draw(self, surface, frame):
+        """Draws every creature as it was drawn on a frame, through the same drawOutlinePoints() as ArrayNodeGroup.drawRenderState().
+        Creatures that were drawn with a reduced level of detail outline are drawn with the full outline, straight edged like the
+        reduced one, which stays within the creature's lodTolerance of it
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the creatures on
+            frame (_int_): the frame to draw
+
+        Returns:
+            _pygame.Rect or None_: the area drawn over, or None if there are no creatures
+        """
+        drawnRect = None
+        for creature in range(self.creatureCount):
+            values, (desiredStart, positionsStart, outlineStart, eyesStart, lodStart) = self._creature(frame, creature)
+            #pygame only takes float64 point arrays
+            outline = np.asarray(values[outlineStart:eyesStart].reshape(-1, 2), dtype=np.float64)
+            eyes = np.asarray(values[eyesStart:lodStart].reshape(2, 2), dtype=np.float64)
+            splineKind = self.splineKinds[creature] if values[lodStart] == 0 else None
+            creatureRect = drawOutlinePoints(surface, outline, eyes, self.headSizes[creature], splineKind, self.splineResolutions[creature])
+            if drawnRect == None:
+                drawnRect = creatureRect
+            else:
+                drawnRect.union_ip(creatureRect)
+        return drawnRect
+
+
+    def close(self):
+        self._frames = None
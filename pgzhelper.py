@@ -5,9 +5,16 @@ from pgzero.actor import Actor, POS_TOPLEFT, ANCHOR_CENTER, transform_anchor
 from pgzero import game, loaders
 import sys
 import time
+from collections import OrderedDict
 from typing import Sequence, Tuple, Union
 from pygame import Vector2
 
+# numpy is only needed by the batch (_mask and _all) Collide functions
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
 _Coordinate = Union[Tuple[float, float], Sequence[float], Vector2]
 _fullscreen = False
 
@@ -959,6 +966,7 @@ class Collide():
 
     return -1
 
+  @staticmethod
   def obb_obb(x, y, w, h, angle, x2, y2, w2, h2, angle2):
     r_angle = math.radians(angle)
     costheta = math.cos(r_angle)
@@ -970,21 +978,631 @@ class Collide():
     ry2 = ty2 * costheta + tx2 * sintheta
     return Collide.obb_rect(rx2, ry2, w2, h2, angle2-angle, 0, 0, w, h)
     
+  @staticmethod
   def obb_obbs(x, y, w, h, angle, obbs):
     r_angle = math.radians(angle)
     costheta = math.cos(r_angle)
     sintheta = math.sin(r_angle)
+
+    i = 0
     for obb in obbs:
       x2, y2, w2, h2, angle2 = obb
       tx2 = x2 - x
       ty2 = y2 - y 
       rx2 = tx2 * costheta - ty2 * sintheta
       ry2 = ty2 * costheta + tx2 * sintheta
-      return Collide.obb_rect(rx2, ry2, w2, h2, angle2-angle, 0, 0, w, h)
+      if Collide.obb_rect(rx2, ry2, w2, h2, angle2-angle, 0, 0, w, h):
+        return i
+      i += 1
+
+    return -1
+
+  # Batch versions of the plural functions. They take (N,2) points, (N,3) circles, (N,4) rects or lines and (N,5) obbs as numpy
+  # arrays (used as is, without copying) or anything numpy can turn into one. The _mask functions return a boolean array with an
+  # entry for every input, and the _all functions return the indices of every hit.
+
+  @staticmethod
+  def circle_points_mask(x, y, radius, points):
+    points = _batch_array(points, 2)
+    return (points[:, 0] - x)**2 + (points[:, 1] - y)**2 < radius ** 2
+
+  @staticmethod
+  def circle_points_all(x, y, radius, points):
+    return np.flatnonzero(Collide.circle_points_mask(x, y, radius, points))
+
+  @staticmethod
+  def rect_points_mask(x, y, w, h, points):
+    points = _batch_array(points, 2)
+    half_w = w / 2
+    half_h = h / 2
+    px = points[:, 0]
+    py = points[:, 1]
+    return (px >= x - half_w) & (px <= x + half_w) & (py >= y - half_h) & (py <= y + half_h)
+
+  @staticmethod
+  def rect_points_all(x, y, w, h, points):
+    return np.flatnonzero(Collide.rect_points_mask(x, y, w, h, points))
+
+  @staticmethod
+  def obb_points_mask(x, y, w, h, angle, points):
+    points = _batch_array(points, 2)
+    return _obb_contains(x, y, w / 2, h / 2, math.radians(angle), points[:, 0], points[:, 1])
+
+  @staticmethod
+  def obb_points_all(x, y, w, h, angle, points):
+    return np.flatnonzero(Collide.obb_points_mask(x, y, w, h, angle, points))
+
+  @staticmethod
+  def line_lines_mask(l1x1, l1y1, l1x2, l1y2, l2):
+    l2 = _batch_array(l2, 4)
+    return _line_line_mask(l1x1, l1y1, l1x2, l1y2, l2[:, 0], l2[:, 1], l2[:, 2], l2[:, 3])
+
+  @staticmethod
+  def line_lines_all(l1x1, l1y1, l1x2, l1y2, l2):
+    return np.flatnonzero(Collide.line_lines_mask(l1x1, l1y1, l1x2, l1y2, l2))
+
+  @staticmethod
+  def obb_lines_mask(x, y, w, h, angle, lines):
+    lines = _batch_array(lines, 4)
+    half_width = w / 2
+    half_height = h / 2
+    r_angle = math.radians(angle)
+    lx1 = lines[:, 0]
+    ly1 = lines[:, 1]
+    lx2 = lines[:, 2]
+    ly2 = lines[:, 3]
+
+    hit = _obb_contains(x, y, half_width, half_height, r_angle, lx1, ly1)
+    hit |= _obb_contains(x, y, half_width, half_height, r_angle, lx2, ly2)
+
+    p = _obb_corners(half_width, half_height, math.cos(r_angle), math.sin(r_angle))
+    for a, b in _OBB_EDGES:
+      hit |= _line_line_mask(lx1, ly1, lx2, ly2, x + p[a][0], y + p[a][1], x + p[b][0], y + p[b][1])
+    return hit
+
+  @staticmethod
+  def obb_lines_all(x, y, w, h, angle, lines):
+    return np.flatnonzero(Collide.obb_lines_mask(x, y, w, h, angle, lines))
+
+  @staticmethod
+  def obb_circles_mask(x, y, w, h, angle, circles):
+    circles = _batch_array(circles, 3)
+    half_width = w / 2
+    half_height = h / 2
+    r_angle = math.radians(angle)
+    costheta = math.cos(r_angle)
+    sintheta = math.sin(r_angle)
+
+    tx = circles[:, 0] - x
+    ty = circles[:, 1] - y
+    radius = circles[:, 2]
+    rx = tx * costheta - ty * sintheta
+    ry = ty * costheta + tx * sintheta
+
+    near = (rx >= -half_width - radius) & (rx <= half_width + radius) & (ry >= -half_height - radius) & (ry <= half_height + radius)
+    overlaps_side = ((rx <= half_width) & (rx >= -half_width)) | ((ry <= half_height) & (ry >= -half_height))
+    dx = np.abs(rx) - half_width
+    dy = np.abs(ry) - half_height
+    touches_corner = dx ** 2 + dy ** 2 <= radius ** 2
+    return near & (overlaps_side | touches_corner)
+
+  @staticmethod
+  def obb_circles_all(x, y, w, h, angle, circles):
+    return np.flatnonzero(Collide.obb_circles_mask(x, y, w, h, angle, circles))
+
+  @staticmethod
+  def obb_rects_mask(x, y, w, h, angle, rects):
+    rects = _batch_array(rects, 4)
+    return _obb_rect_mask(x, y, w, h, math.radians(angle), rects[:, 0], rects[:, 1], rects[:, 2], rects[:, 3])
+
+  @staticmethod
+  def obb_rects_all(x, y, w, h, angle, rects):
+    return np.flatnonzero(Collide.obb_rects_mask(x, y, w, h, angle, rects))
+
+  @staticmethod
+  def obb_obbs_mask(x, y, w, h, angle, obbs):
+    obbs = _batch_array(obbs, 5)
+    r_angle = math.radians(angle)
+    costheta = math.cos(r_angle)
+    sintheta = math.sin(r_angle)
+
+    # Every obb is moved into the frame of the first one, which turns the first one into an axis aligned rect at the origin
+    tx2 = obbs[:, 0] - x
+    ty2 = obbs[:, 1] - y
+    rx2 = tx2 * costheta - ty2 * sintheta
+    ry2 = ty2 * costheta + tx2 * sintheta
+    return _obb_rect_mask(rx2, ry2, obbs[:, 2], obbs[:, 3], np.radians(obbs[:, 4] - angle), 0, 0, w, h)
+
+  @staticmethod
+  def obb_obbs_all(x, y, w, h, angle, obbs):
+    return np.flatnonzero(Collide.obb_obbs_mask(x, y, w, h, angle, obbs))
+
+
+# Corner pairs of _obb_corners() that form the edges of an obb, in the order the Collide functions test them
+_OBB_EDGES = ((0, 1), (1, 3), (3, 2), (2, 0))
+
+def _batch_array(array, columns):
+  if np is None:
+    raise ImportError("the batch Collide functions need numpy")
+  array = np.asarray(array)
+  if array.size == 0:
+    return array.reshape(0, columns)
+  if array.ndim != 2 or array.shape[1] < columns:
+    raise ValueError(f"expected an (N,{columns}) array, got shape {array.shape}")
+  return array
+
+def _obb_corners(half_width, half_height, costheta, sintheta):
+  wc = half_width * costheta
+  hs = half_height * sintheta
+  hc = half_height * costheta
+  ws = half_width * sintheta
+  return (
+    (wc + hs, hc - ws),
+    (-wc + hs, hc + ws),
+    (wc - hs, -hc - ws),
+    (-wc - hs, -hc + ws),
+  )
+
+def _obb_contains(x, y, half_width, half_height, r_angle, px, py):
+  costheta = math.cos(r_angle)
+  sintheta = math.sin(r_angle)
+  tx = px - x
+  ty = py - y
+  rx = tx * costheta - ty * sintheta
+  ry = ty * costheta + tx * sintheta
+  return (rx > -half_width) & (rx < half_width) & (ry > -half_height) & (ry < half_height)
+
+def _line_line_mask(l1x1, l1y1, l1x2, l1y2, l2x1, l2y1, l2x2, l2y2):
+  # Collide.line_line over arrays. Any of the arguments can be arrays as long as they broadcast together
+  l1x2_l1x1 = l1x2-l1x1
+  l1y2_l1y1 = l1y2-l1y1
+  determinant = (l2y2-l2y1)*l1x2_l1x1 - (l2x2-l2x1)*l1y2_l1y1
+
+  # Parallel lines are never considered to be intersecting. Their division by zero is masked out afterwards
+  with np.errstate(divide='ignore', invalid='ignore'):
+    uA = ((l2x2-l2x1)*(l1y1-l2y1) - (l2y2-l2y1)*(l1x1-l2x1)) / determinant
+    uB = (l1x2_l1x1*(l1y1-l2y1) - l1y2_l1y1*(l1x1-l2x1)) / determinant
+  return (determinant != 0) & (uA >= 0) & (uA <= 1) & (uB >= 0) & (uB <= 1)
+
+def _obb_rect_mask(x, y, w, h, r_angle, rx, ry, rw, rh):
+  # Collide.obb_rect over arrays, with the obb angle already in radians. Any of the arguments can be arrays
+  half_width = w / 2
+  half_height = h / 2
+  tx = rx - x
+  ty = ry - y
+  near = tx ** 2 + ty ** 2 <= (half_height + half_width + rw + rh) ** 2
+
+  costheta = np.cos(r_angle)
+  sintheta = np.sin(r_angle)
+  tx2 = tx * costheta - ty * sintheta
+  ty2 = ty * costheta + tx * sintheta
+  hit = (tx2 > -half_width) & (tx2 < half_width) & (ty2 > -half_height) & (ty2 < half_height)
+
+  p = _obb_corners(half_width, half_height, costheta, sintheta)
+  h_rw = rw / 2
+  h_rh = rh / 2
+  rect_l = tx - h_rw
+  rect_r = tx + h_rw
+  rect_t = ty - h_rh
+  rect_b = ty + h_rh
+  for obb_p in p:
+    hit = hit | ((obb_p[0] > rect_l) & (obb_p[0] < rect_r) & (obb_p[1] > rect_t) & (obb_p[1] < rect_b))
+
+  rect_lines = (
+    (rect_l, rect_t, rect_l, rect_b),
+    (rect_r, rect_t, rect_r, rect_b),
+    (rect_l, rect_t, rect_r, rect_t),
+    (rect_l, rect_b, rect_r, rect_b),
+  )
+  for a, b in _OBB_EDGES:
+    for rect_line in rect_lines:
+      hit = hit | _line_line_mask(p[a][0], p[a][1], p[b][0], p[b][1], *rect_line)
+  return near & hit
+
+
+class SpatialHash():
+  # Uniform grid broad-phase. Objects are stored with their shape, and queries only run the Collide narrow-phase
+  # functions on objects sharing a grid cell with the query shape. Inserting an object that is already in the hash moves it,
+  # and the grid cells are only touched if it moved into different cells.
+  def __init__(self, cell_size=128):
+    self.cell_size = cell_size
+    self._cells = {}
+    self._objects = {}
+
+  def __len__(self):
+    return len(self._objects)
+
+  def __contains__(self, obj):
+    return obj in self._objects
+
+  def _cell_range(self, left, top, right, bottom):
+    size = self.cell_size
+    return (int(left // size), int(top // size), int(right // size), int(bottom // size))
+
+  def _insert(self, obj, shape, left, top, right, bottom):
+    cell_range = self._cell_range(left, top, right, bottom)
+    old = self._objects.get(obj)
+    self._objects[obj] = (shape, cell_range)
+    if old is not None:
+      if old[1] == cell_range:
+        return
+      self._remove_from_cells(obj, old[1])
+
+    cx1, cy1, cx2, cy2 = cell_range
+    cells = self._cells
+    for cx in range(cx1, cx2 + 1):
+      for cy in range(cy1, cy2 + 1):
+        cell = cells.get((cx, cy))
+        if cell is None:
+          cell = cells[(cx, cy)] = {}
+        cell[obj] = None
+
+  def _remove_from_cells(self, obj, cell_range):
+    cx1, cy1, cx2, cy2 = cell_range
+    cells = self._cells
+    for cx in range(cx1, cx2 + 1):
+      for cy in range(cy1, cy2 + 1):
+        cell = cells[(cx, cy)]
+        del cell[obj]
+        if len(cell) == 0:
+          del cells[(cx, cy)]
+
+  def insert_point(self, obj, x, y):
+    self._insert(obj, ('point', x, y), x, y, x, y)
+
+  def insert_circle(self, obj, x, y, radius):
+    self._insert(obj, ('circle', x, y, radius), x - radius, y - radius, x + radius, y + radius)
+
+  def insert_rect(self, obj, x, y, w, h):
+    # Like Collide, x and y are the center of the rect
+    half_w = w / 2
+    half_h = h / 2
+    self._insert(obj, ('rect', x, y, w, h), x - half_w, y - half_h, x + half_w, y + half_h)
+
+  def insert_obb(self, obj, x, y, w, h, angle):
+    # The cells are found from the obb's bounding circle, so they don't change as it rotates
+    b_radius = math.sqrt(w ** 2 + h ** 2) / 2
+    self._insert(obj, ('obb', x, y, w, h, angle), x - b_radius, y - b_radius, x + b_radius, y + b_radius)
+
+  def insert_actor(self, actor):
+    # Stored as the actor's rect at the time it was inserted. Shape queries treat it as that rect, and only actors are pixel tested
+    x = actor.centerx
+    y = actor.centery
+    half_w = actor.width / 2
+    half_h = actor.height / 2
+    self._insert(actor, ('actor', x, y, actor.width, actor.height), x - half_w, y - half_h, x + half_w, y + half_h)
+
+  def remove(self, obj):
+    old = self._objects.pop(obj, None)
+    if old is not None:
+      self._remove_from_cells(obj, old[1])
+
+  def clear(self):
+    self._cells.clear()
+    self._objects.clear()
+
+  def shape(self, obj):
+    return self._objects[obj][0]
+
+  def candidates(self, left, top, right, bottom):
+    cx1, cy1, cx2, cy2 = self._cell_range(left, top, right, bottom)
+    cells = self._cells
+    if cx1 == cx2 and cy1 == cy2:
+      return list(cells.get((cx1, cy1), ()))
+
+    found = {}
+    for cx in range(cx1, cx2 + 1):
+      for cy in range(cy1, cy2 + 1):
+        cell = cells.get((cx, cy))
+        if cell is not None:
+          found.update(cell)
+    return list(found)
+
+  def query_point(self, x, y):
+    hits = []
+    for obj in self.candidates(x, y, x, y):
+      shape = self._objects[obj][0]
+      kind = shape[0]
+      if kind == 'point':
+        hit = shape[1] == x and shape[2] == y
+      elif kind == 'circle':
+        hit = Collide.circle_point(shape[1], shape[2], shape[3], x, y)
+      elif kind == 'rect' or kind == 'actor':
+        hit = Collide.rect_point(shape[1], shape[2], shape[3], shape[4], x, y)
+      else:
+        hit = Collide.obb_point(shape[1], shape[2], shape[3], shape[4], shape[5], x, y)
+      if hit:
+        hits.append(obj)
+    return hits
+
+  def query_circle(self, x, y, radius):
+    hits = []
+    for obj in self.candidates(x - radius, y - radius, x + radius, y + radius):
+      shape = self._objects[obj][0]
+      kind = shape[0]
+      if kind == 'point':
+        hit = Collide.circle_point(x, y, radius, shape[1], shape[2])
+      elif kind == 'circle':
+        hit = Collide.circle_circle(x, y, radius, shape[1], shape[2], shape[3])
+      elif kind == 'rect' or kind == 'actor':
+        hit = Collide.circle_rect(x, y, radius, shape[1], shape[2], shape[3], shape[4])
+      else:
+        hit = Collide.obb_circle(shape[1], shape[2], shape[3], shape[4], shape[5], x, y, radius)
+      if hit:
+        hits.append(obj)
+    return hits
+
+  def query_rect(self, x, y, w, h):
+    hits = []
+    half_w = w / 2
+    half_h = h / 2
+    for obj in self.candidates(x - half_w, y - half_h, x + half_w, y + half_h):
+      shape = self._objects[obj][0]
+      kind = shape[0]
+      if kind == 'point':
+        hit = Collide.rect_point(x, y, w, h, shape[1], shape[2])
+      elif kind == 'circle':
+        hit = Collide.circle_rect(shape[1], shape[2], shape[3], x, y, w, h)
+      elif kind == 'rect' or kind == 'actor':
+        hit = Collide.rect_rect(x, y, w, h, shape[1], shape[2], shape[3], shape[4])
+      else:
+        hit = Collide.obb_rect(shape[1], shape[2], shape[3], shape[4], shape[5], x, y, w, h)
+      if hit:
+        hits.append(obj)
+    return hits
+
+  def query_obb(self, x, y, w, h, angle):
+    hits = []
+    b_radius = math.sqrt(w ** 2 + h ** 2) / 2
+    for obj in self.candidates(x - b_radius, y - b_radius, x + b_radius, y + b_radius):
+      shape = self._objects[obj][0]
+      kind = shape[0]
+      if kind == 'point':
+        hit = Collide.obb_point(x, y, w, h, angle, shape[1], shape[2])
+      elif kind == 'circle':
+        hit = Collide.obb_circle(x, y, w, h, angle, shape[1], shape[2], shape[3])
+      elif kind == 'rect' or kind == 'actor':
+        hit = Collide.obb_rect(x, y, w, h, angle, shape[1], shape[2], shape[3], shape[4])
+      else:
+        hit = Collide.obb_obb(x, y, w, h, angle, shape[1], shape[2], shape[3], shape[4], shape[5])
+      if hit:
+        hits.append(obj)
+    return hits
+
+  def query_actor_pixel(self, actor):
+    # Actors in the hash whose pixels overlap actor's. actor itself is never returned
+    hits = []
+    for other in self.candidates(actor.left, actor.top, actor.right, actor.bottom):
+      if other is not actor and self._objects[other][0][0] == 'actor' and actor.collide_pixel(other):
+        hits.append(other)
+    return hits
+
+
+def _transform(surf, angle, scale, flip_x, flip_y):
+  # Untransformed actors show the original surface, like pgzero's own Actor does
+  if angle == 0 and scale == 1 and not flip_x and not flip_y:
+    return surf
+  if scale != 1:
+    size = surf.get_size()
+    surf = pygame.transform.scale(surf, (int(size[0] * scale), int(size[1] * scale)))
+  if flip_x:
+    surf = pygame.transform.flip(surf, True, False)
+  if flip_y:
+    surf = pygame.transform.flip(surf, False, True)
+  return pygame.transform.rotate(surf, angle)
+
+
+class TransformCache():
+  # Shared cache of scaled, flipped and rotated surfaces, and the collision masks of those surfaces. Angles are snapped to multiples
+  # of angle_step so actors turning through a small set of headings reuse the same few surfaces. The least recently used surfaces
+  # are dropped once the cached surfaces and masks take up more than max_bytes.
+  # Actors only use a cache once it's set: Actor.transform_cache = TransformCache() for every actor, or actor.transform_cache for one.
+  def __init__(self, max_bytes=64 * 1024 * 1024, angle_step=1):
+    self.max_bytes = max_bytes
+    self.angle_step = angle_step
+    self.bytes = 0
+    self.hits = 0
+    self.misses = 0
+    self.mask_hits = 0
+    self.mask_misses = 0
+    self.evictions = 0
+    # key -> [surface, mask or None, bytes]
+    self._surfs = OrderedDict()
+
+  def __len__(self):
+    return len(self._surfs)
+
+  def quantize(self, angle):
+    if self.angle_step <= 0:
+      return angle
+    return (round(angle / self.angle_step) * self.angle_step) % 360
+
+  def get(self, key, surf):
+    # key is (source_key, angle, scale, flip_x, flip_y). source_key identifies surf, e.g. its image name, so actors showing the
+    # same image share entries. The angle must already be quantized
+    entry = self._surfs.get(key)
+    if entry is not None:
+      self._surfs.move_to_end(key)
+      self.hits += 1
+      return entry[0]
+
+    self.misses += 1
+    transformed = _transform(surf, key[1], key[2], key[3], key[4])
+    size = transformed.get_pitch() * transformed.get_height()
+    self._surfs[key] = [transformed, None, size]
+    self.bytes += size
+    self._evict()
+    return transformed
+
+  def get_mask(self, key, surf):
+    # The collision mask of the surface get() returned for key. surf is that surface, used if the entry has been evicted since
+    entry = self._surfs.get(key)
+    if entry is None:
+      self.mask_misses += 1
+      return pygame.mask.from_surface(surf)
+
+    self._surfs.move_to_end(key)
+    if entry[1] is not None:
+      self.mask_hits += 1
+      return entry[1]
+
+    self.mask_misses += 1
+    mask = pygame.mask.from_surface(entry[0])
+    entry[1] = mask
+    # A mask stores one bit per pixel
+    mask_size = (surf.get_width() + 7) // 8 * surf.get_height()
+    entry[2] += mask_size
+    self.bytes += mask_size
+    self._evict()
+    return mask
+
+  def _evict(self):
+    while self.bytes > self.max_bytes and len(self._surfs) > 1:
+      _, evicted = self._surfs.popitem(last=False)
+      self.bytes -= evicted[2]
+      self.evictions += 1
+
+  def stats(self):
+    lookups = self.hits + self.misses
+    return {
+      'hits': self.hits,
+      'misses': self.misses,
+      'hit_rate': self.hits / lookups if lookups else 0,
+      'mask_hits': self.mask_hits,
+      'mask_misses': self.mask_misses,
+      'evictions': self.evictions,
+      'surfaces': len(self._surfs),
+      'bytes': self.bytes,
+    }
+
+  def clear(self):
+    self._surfs.clear()
+    self.bytes = 0
+
+
+class SpriteAtlas():
+  # A sprite sheet sliced into frames once, shared by any number of actors. Frames are numbered left to right, then top to bottom,
+  # like load_images. Actors switch frames by index, without looking anything up.
+  # SpriteAtlas.shared() returns the same atlas for the same sheet and layout, which is what Actor.load_images uses
+  _shared = {}
+
+  def __init__(self, sheet_name:str, cols:int, rows:int, cnt:int=0, subrect:pygame.Rect=None):
+    self.name = sheet_name
+    sheet:pygame.Surface = loaders.images.load(sheet_name)
+    offset_x, offset_y = 0, 0
+    if subrect is not None:
+      subrect = pygame.Rect(subrect)
+      sheet = sheet.subsurface(subrect)
+      offset_x, offset_y = subrect.x, subrect.y
+
+    width = sheet.get_width() / cols
+    height = sheet.get_height() / rows
+    self.rects = []
+    for row in range(0, rows):
+      for col in range(0, cols):
+        self.rects.append((int(col*width), int(row*height), int(width), int(height)))
+    if cnt > 0:
+      self.rects = self.rects[:cnt]
+
+    self.frames = [sheet.subsurface(rect) for rect in self.rects]
+    # Same keys as Actor.subrect uses, so a TransformCache shares its entries between atlas frames and subrects of the sheet
+    self.keys = [(sheet_name, rect[0] + offset_x, rect[1] + offset_y, rect[2], rect[3]) for rect in self.rects]
+
+  @classmethod
+  def shared(cls, sheet_name:str, cols:int, rows:int, cnt:int=0, subrect:pygame.Rect=None):
+    key = (sheet_name, cols, rows, cnt, None if subrect is None else tuple(pygame.Rect(subrect)))
+    atlas = cls._shared.get(key)
+    if atlas is None:
+      atlas = cls._shared[key] = cls(sheet_name, cols, rows, cnt, subrect)
+    return atlas
+
+  def __len__(self):
+    return len(self.frames)
+
+  def prerender(self, cache, angles=(0,), scales=(1,), flips=((False, False),)):
+    # Fills a TransformCache with every frame at every combination of angle, scale and flip, so actors never transform while running
+    for i in range(len(self.frames)):
+      for angle in angles:
+        for scale in scales:
+          for flip_x, flip_y in flips:
+            cache.get((self.keys[i], cache.quantize(angle), scale, flip_x, flip_y), self.frames[i])
+
+
+class AnimationClock():
+  # Advances the animations of many actors from one clock. Actors are grouped by fps, each group works out once per update how many
+  # of its frames have elapsed, and only groups whose frame changed touch their actors. Every actor in a group is on the same frame
+  # tick, so animations subscribed at the same fps stay in step.
+  # Call update() once per frame. Use it instead of calling animate() on each actor
+  def __init__(self, time_source=time.perf_counter):
+    self.time_source = time_source
+    self.time_scale = 1
+    self.paused = False
+    self.time = 0
+    self._last = None
+    # fps -> [tick, {actor: None}]
+    self._groups = {}
+    self._fps_of = {}
+
+  def subscribe(self, actor, fps=None):
+    # Animates actor at fps frames per second, or at actor.fps. Subscribe again after changing an actor's fps
+    if fps is None:
+      fps = actor.fps
+    self.unsubscribe(actor)
+    group = self._groups.get(fps)
+    if group is None:
+      group = self._groups[fps] = [int(self.time * fps), {}]
+    group[1][actor] = None
+    self._fps_of[actor] = fps
+
+  def unsubscribe(self, actor):
+    fps = self._fps_of.pop(actor, None)
+    if fps is not None:
+      actors = self._groups[fps][1]
+      del actors[actor]
+      if len(actors) == 0:
+        del self._groups[fps]
+
+  def __len__(self):
+    return len(self._fps_of)
+
+  def pause(self):
+    self.paused = True
+
+  def resume(self):
+    self.paused = False
+
+  def update(self, dt=None):
+    # Moves the clock on by dt seconds, or by the time since the last update, scaled by time_scale. Returns the number of actors
+    # whose frame changed
+    if dt is None:
+      now = self.time_source()
+      dt = 0 if self._last is None else now - self._last
+      self._last = now
+    if self.paused or dt == 0:
+      return 0
+
+    self.time += dt * self.time_scale
+    changed = 0
+    for fps, group in self._groups.items():
+      tick = int(self.time * fps)
+      steps = tick - group[0]
+      if steps == 0:
+        continue
+      group[0] = tick
+      for actor in group[1]:
+        actor.advance_image(steps)
+      changed += len(group[1])
+    return changed
 
       
 class Actor(Actor):
+  transform_cache = None
+  # When True, setting angle, scale, flip_x or flip_y only marks the actor as needing a transform. The transform runs once, the next time
+  # the actor is drawn, tested for pixel collisions or its rect is read, however many of them were set in between
+  lazy_transforms = False
+
   def __init__(self, image:Union[str, pygame.Surface], pos=POS_TOPLEFT, anchor=ANCHOR_CENTER, **kwargs):
+    self._transform_dirty = False
     self._flip_x = False
     self._flip_y = False
     self._scale = 1
@@ -992,9 +1610,12 @@ class Actor(Actor):
     self._images = None
     self._image_idx = 0
     self._subrects = None
+    self._atlas = None
     self._transform_cnt = 0
     self._orig_surfs = {}        
     self._surfs = {}    
+    self._source_key = None
+    self._transform_key = None
     self._animate_counter = 0
     self._animate_run = False
     self._radius = None
@@ -1009,7 +1630,10 @@ class Actor(Actor):
     super().__init__(image_str, pos, anchor, **kwargs)
     if isinstance(image,pygame.Surface):
         self._orig_surf = image        
+        self._source_key = image
         self._update_pos()
+    elif isinstance(image,SpriteAtlas):
+        self.use_atlas(image)
     self._subrect=None
     if subrect is not None:
       self.subrect=subrect
@@ -1078,28 +1702,47 @@ class Actor(Actor):
   @images.setter
   def images(self, images):
     self._subrects = None    
+    self._atlas = None
     self._images = images
     if len(self._images) != 0:
       self.image = self._images[0]
 
   def load_images(self, sheet_name:str, cols:int, rows:int, cnt:int=0, subrect:pygame.Rect=None):
-    self._subrects=[None]*cols*rows
-    self._image_idx=0
-    sheet:pygame.Surface = loaders.images.load(sheet_name)
-    if subrect is not None:
-      sheet = sheet.subsurface(subrect)
-    for col in range(0,cols):
-      for row in range(0,rows):
-          width=sheet.get_width()/cols
-          height=sheet.get_height()/rows
-          self._subrects[col+row*cols]=(int(col*width),int(row*height),int(width),int(height))
-    if len(self._subrects) != 0:
-      self.image = sheet_name
-      self.subrect = self._subrects[0]
+    self.use_atlas(SpriteAtlas.shared(sheet_name, cols, rows, cnt, subrect))
+
+  @property
+  def atlas(self):
+    return self._atlas
+
+  def use_atlas(self, atlas:SpriteAtlas, idx:int=0):
+    self._atlas = atlas
+    self._images = None
+    self._subrects = None
+    self._subrect = None
+    self._image_name = atlas.name
+    if len(atlas) != 0:
+      self._show_frame(idx, True)
+
+  def _show_frame(self, idx, resized=False):
+    # All frames of an atlas are the same size, so switching frames never moves the rect or the anchor. Only the transformed
+    # surface is swapped, unless a transform is pending anyway
+    self._image_idx = idx
+    self._orig_surf = self._atlas.frames[idx]
+    self._source_key = self._atlas.keys[idx]
+    if resized:
+      self._surf = self._orig_surf
+      self._update_pos()
+      self._transform_surf()
+    elif not self._transform_dirty:
+      self._make_surf()
+      self._mask = None
 
   def sel_image(self, newimage:Union[str, int])-> bool:
     try:
       if isinstance(newimage, int):
+          if self._atlas is not None:
+            self._show_frame(newimage % len(self._atlas))
+            return True
           if self._subrects is None and self._images is None:
             return False
           if self._subrects is not None:
@@ -1115,7 +1758,9 @@ class Actor(Actor):
       return False
           
   def next_image(self)-> int:
-    if self._subrects is not None:
+    if self._atlas is not None:
+      self._show_frame((self._image_idx+1) % len(self._atlas))
+    elif self._subrects is not None:
       next_image_idx = (self._image_idx+1) % len(self._subrects)
       self._image_idx = next_image_idx
       self.subrect = self._subrects[self._image_idx]
@@ -1131,6 +1776,20 @@ class Actor(Actor):
       self._image_idx = 0
     return self._image_idx
       
+  def advance_image(self, steps:int=1)-> int:
+    # Moves the animation on by steps frames
+    if self._atlas is not None:
+      self._show_frame((self._image_idx+steps) % len(self._atlas))
+      return self._image_idx
+
+    if self._subrects is not None:
+      steps %= len(self._subrects)
+    elif self._images is not None and len(self._images) != 0:
+      steps %= len(self._images)
+    for i in range(steps):
+      self.next_image()
+    return self._image_idx
+
   def animate(self)-> int:
     now = int(time.time() * self.fps)
     if self._animate_counter == 0:
@@ -1151,7 +1810,7 @@ class Actor(Actor):
   @angle.setter
   def angle(self, angle):
     self._angle = angle
-    self._transform_surf()
+    self._transform_later()
     self._transform_cnt+=1
 
   @property
@@ -1161,7 +1820,7 @@ class Actor(Actor):
   @scale.setter
   def scale(self, scale):
     self._scale = scale
-    self._transform_surf()
+    self._transform_later()
     self._transform_cnt+=1
 
   @property
@@ -1171,7 +1830,7 @@ class Actor(Actor):
   @flip_x.setter
   def flip_x(self, flip_x):
     self._flip_x = flip_x
-    self._transform_surf()
+    self._transform_later()
     self._transform_cnt+=1
 
   @property
@@ -1181,7 +1840,7 @@ class Actor(Actor):
   @flip_y.setter
   def flip_y(self, flip_y):
     self._flip_y = flip_y
-    self._transform_surf()
+    self._transform_later()
     self._transform_cnt+=1
 
   @property
@@ -1190,13 +1849,16 @@ class Actor(Actor):
 
   @image.setter
   def image(self, image):
+    self._atlas = None
     if image is not None:
       self._orig_surf = self._surf = loaders.images.load(image)
       self._image_name = image
       self._orig_surfs[image]=self._orig_surf     
+      self._source_key = image
     else:
       self._orig_surf = self._surf = pygame.Surface((1,1),pygame.SRCALPHA)
       self._image_name = ''
+      self._source_key = self._orig_surf
     self._update_pos()
     if image is not None:
       if (image not in self._surfs) or (self._surfs[image][1]!=self._transform_cnt):       
@@ -1212,6 +1874,7 @@ class Actor(Actor):
     if subrect is not None:
       subr=pygame.Rect(subrect) 
     if subr != self._subrect:     
+      self._atlas = None
       self._subrect = subr
       if self._subrect is not None:
         hashv=hash((subr.x, subr.y,subr.width,subr.height))
@@ -1219,6 +1882,7 @@ class Actor(Actor):
         if surf_name not in self._orig_surfs:
           self._orig_surfs[surf_name] = loaders.images.load(self.image).subsurface(subr)
         self._orig_surf=self._orig_surfs[surf_name]
+        self._source_key = (self._image_name, subr.x, subr.y, subr.width, subr.height)
         self._update_pos()
         if (surf_name not in self._surfs) or (self._surfs[surf_name][1]!=self._transform_cnt):       
           self._transform_surf()
@@ -1226,6 +1890,7 @@ class Actor(Actor):
         self._surf=self._surfs[surf_name][0]     
       else:
         self._orig_surf = self._surf = loaders.images.load(self.image)
+        self._source_key = self.image
         self._update_pos()
         self._transform_surf()
     
@@ -1236,6 +1901,7 @@ class Actor(Actor):
   @orig_surf.setter
   def orig_surf(self, surf:pygame.Surface):
     self._orig_surf = self._surf =surf
+    self._source_key = surf
     self._update_pos()
     self._transform_surf()
   
@@ -1244,56 +1910,139 @@ class Actor(Actor):
     self._update_pos()
     self._transform_surf()
                 
-  def _transform_surf(self):
-    self._surf = self._orig_surf
-    p = self.pos
+  def __setattr__(self, attr, value):
+    # Rect attribute names never start with an underscore, so private attributes skip pgzero's search through them
+    if attr[0] == '_':
+      object.__setattr__(self, attr, value)
+    else:
+      # Rect attributes are written relative to the transformed rect, so any pending transform has to run first. pos, x and y aren't
+      # rect attributes and stay correct without it
+      if self.__dict__.get('_transform_dirty') and attr in self.DELEGATED_ATTRIBUTES:
+        self._transform_surf()
+      super().__setattr__(attr, value)
+
+  def __getattr__(self, attr):
+    # The rect attributes (left, width, center...) are only up to date once any pending transform has run
+    if self.__dict__.get('_transform_dirty') and attr in self.DELEGATED_ATTRIBUTES:
+      self._transform_surf()
+    return super().__getattr__(attr)
+
+  @property
+  def anchor(self):
+    return self._anchor_value
+
+  @anchor.setter
+  def anchor(self, val):
+    # The new anchor is placed on the transformed surface, the same as when the transform had already run
+    self.apply_transform()
+    self._anchor_value = val
+    self._calc_anchor()
+
+  # pos, x and y stay correct while a transform is pending, because transforming keeps the anchor where it is. Reading them
+  # straight from the rect means they don't force the transform
+  @property
+  def pos(self):
+    px, py = self._rect.topleft
+    ax, ay = self._anchor
+    return px + ax, py + ay
+
+  @pos.setter
+  def pos(self, pos):
+    px, py = pos
+    ax, ay = self._anchor
+    self._rect.topleft = px - ax, py - ay
 
-    if self._scale != 1:
-      size = self._orig_surf.get_size()
-      self._surf = pygame.transform.scale(self._surf, (int(size[0] * self.scale), int(size[1] * self.scale)))
-    if self._flip_x:
-      self._surf = pygame.transform.flip(self._surf, True, False)
-    if self._flip_y:
-      self._surf = pygame.transform.flip(self._surf, False, True)
+  @property
+  def x(self):
+    return self._rect.left + self._anchor[0]
 
-    self._surf = pygame.transform.rotate(self._surf, self._angle)
+  @x.setter
+  def x(self, px):
+    self._rect.left = px - self._anchor[0]
+
+  @property
+  def y(self):
+    return self._rect.top + self._anchor[1]
+
+  @y.setter
+  def y(self, py):
+    self._rect.top = py - self._anchor[1]
+
+  def _transform_later(self):
+    if self.lazy_transforms:
+      self._transform_dirty = True
+    else:
+      self._transform_surf()
+
+  def apply_transform(self):
+    if self._transform_dirty:
+      self._transform_surf()
+
+  def _make_surf(self):
+    # Sets _surf to the transformed original surface and returns the angle it was rotated by
+    angle = self._angle
+    cache = self.transform_cache
+    if cache is not None and self._source_key is not None:
+      # The surface is drawn at the quantized angle, so the anchor is rotated by the same angle
+      angle = cache.quantize(angle)
+      self._transform_key = (self._source_key, angle, self._scale, self._flip_x, self._flip_y)
+      self._surf = cache.get(self._transform_key, self._orig_surf)
+    else:
+      self._transform_key = None
+      self._surf = _transform(self._orig_surf, angle, self._scale, self._flip_x, self._flip_y)
+    return angle
+
+  def _transform_surf(self):
+    self._transform_dirty = False
+    p = self.pos
+    angle = self._make_surf()
 
     self.width, self.height = self._surf.get_size()
     w, h = self._orig_surf.get_size()
     ax, ay = self._untransformed_anchor
-    anchor = transform_anchor(ax, ay, w, h, self._angle)
+    anchor = transform_anchor(ax, ay, w, h, angle)
     self._anchor = (anchor[0] * self.scale, anchor[1] * self.scale)
 
     self.pos = p
     self._mask = None
     
+  def get_mask(self):
+    # The collision mask of the transformed surface. With a transform_cache it is shared by every actor showing the same image with
+    # the same transform, otherwise it is kept until the actor is transformed again
+    self.apply_transform()
+    if self._mask == None:
+      if self._transform_key is not None and self.transform_cache is not None:
+        self._mask = self.transform_cache.get_mask(self._transform_key, self._surf)
+      else:
+        self._mask = pygame.mask.from_surface(self._surf)
+    return self._mask
+
   def collidepoint_pixel(self, x, y=0):
     if isinstance(x, tuple):
       y = x[1]
       x = x[0]
-    if self._mask == None:
-      self._mask = pygame.mask.from_surface(self._surf)
 
+    # Points outside the rect are rejected before the mask is needed
     xoffset = int(x - self.left)
     yoffset = int(y - self.top)
     if xoffset < 0 or yoffset < 0:
       return 0
 
-    width, height = self._mask.get_size()
-    if xoffset > width or yoffset > height:
+    width, height = self._surf.get_size()
+    if xoffset >= width or yoffset >= height:
       return 0
 
-    return self._mask.get_at((xoffset, yoffset))
+    return self.get_mask().get_at((xoffset, yoffset))
 
   def collide_pixel(self, actor):
-    for a in [self, actor]:
-      if a._mask == None:
-        a._mask = pygame.mask.from_surface(a._surf)
+    # Actors whose rects don't overlap can't have overlapping pixels, so the masks are only needed when the rects overlap
+    if not self.get_rect().colliderect(actor.get_rect()):
+      return None
 
     xoffset = int(actor.left - self.left)
     yoffset = int(actor.top - self.top)
 
-    return self._mask.overlap(actor._mask, (xoffset, yoffset))
+    return self.get_mask().overlap(actor.get_mask(), (xoffset, yoffset))
 
   def collidelist_pixel(self, actors):
     for i in range(len(actors)):
@@ -1308,6 +2057,16 @@ class Actor(Actor):
         collided.append(i)
     return collided
 
+  def collidehash_pixel(self, spatial_hash):
+    # Like collidelist_pixel, but only tests the actors sharing a cell of spatial_hash with this one. Returns the first actor hit or None
+    hits = spatial_hash.query_actor_pixel(self)
+    if len(hits) == 0:
+      return None
+    return hits[0]
+
+  def collidehashall_pixel(self, spatial_hash):
+    return spatial_hash.query_actor_pixel(self)
+
   def _unrotated_size(self):
       w = self._orig_surf.get_width()*self.scale
       h = self._orig_surf.get_height()*self.scale
@@ -1386,7 +2145,9 @@ class Actor(Actor):
                               self.centerx, self.centery, self._radius)
 
   def draw(self):
+    self.apply_transform()
     game.screen.blit(self._surf, self.topleft)
 
   def get_rect(self):
+    self.apply_transform()
     return self._rect
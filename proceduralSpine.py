@@ -0,0 +1,1361 @@
+#This file contains the simulation core of the procedurally animated snake: the NodeGroup spine, its Nodes and the vector math they use.
+#It doesn't open a window or run a loop, so it can be imported by the pygame scripts, the headless runner or anything else that wants
+#to step creatures. The drawing methods draw onto whatever surface they are given
+
+
+
+
+import math
+import pygame
+from frameProfiler import section
+
+
+#Maximum difference in angle (degrees) between a node's heading and the heading of the node in front of it
+DEFAULT_ANGLE_LIMIT = 20
+
+#A node group counts as settled once its head is within SETTLE_EPSILON pixels of the desired point and no node moved more than
+#SETTLE_THRESHOLD pixels in the last update. Settled groups skip updating until the desired point changes
+SETTLE_EPSILON = 0.5
+SETTLE_THRESHOLD = 0.01
+
+#Speeds are in pixels per second. updateNodePositions() advances a group by SIMULATION_STEP seconds unless it is given another step length
+SIMULATION_HZ = 60
+SIMULATION_STEP = 1/SIMULATION_HZ
+
+#Level of detail for small creatures. Creatures whose head is smaller than LOD_SIZE pixels skip outline points wherever the outline stays
+#within LOD_TOLERANCE pixels of the full one. Below LOD_EYE_SIZE pixels the eyes aren't drawn, and below LOD_STROKE_SIZE the outline stroke isn't
+LOD_SIZE = 20
+LOD_TOLERANCE = 0.5
+LOD_EYE_SIZE = 8
+LOD_STROKE_SIZE = 6
+
+#Outline smoothing. A creature with a splineKind draws its outline as a closed curve through ("catmull-rom") or pulled towards ("b-spline")
+#its outline points, with splineResolution points per edge, so a spine with far fewer nodes still looks smooth
+SPLINE_KINDS = ["catmull-rom", "b-spline"]
+SPLINE_RESOLUTION = 3
+
+#The snake shown in pygameConversion.py. Its body is SNAKE_BODY_NODES nodes long, fewer nodes are spaced further apart
+SNAKE_STARTING_POSITION = [400, 400]
+SNAKE_BODY_NODES = 100
+SNAKE_HEAD_DRAW_POINTS = [-30, 0, 30]
+SNAKE_TAIL_DRAW_POINTS = [150, 155, 160, 165, 170, 175, 180, 185, 190, 195, 200, 205, 210]
+SNAKE_SPEED = 240
+
+
+
+
+#Each node group is comprised of at least 1 head node and any subsequent body nodes. The final node is considered the tail node and can have draw points added to it
+#to create more detailed polygon draws
+class NodeGroup:
+    """
+    A grouped set of nodes that comprise the spine of a simulated animal
+    Each node group is comprised of at least 1 head node and any subsequent body nodes. The final node is considered the tail node and can have draw points added to it
+    to create more detailed polygon draws.
+    """
+    def __init__(self, speed, headSize, headConstraintRadius, startingPosition, extraDrawAngles=None, angleLimit=DEFAULT_ANGLE_LIMIT, constraintMode="vector"):
+        """Constructor only creates head node. Additional nodes must be added using the attachNewNode() method
+
+        Args:
+            speed (_float_): the speed of the snake in pixels per second. 60 is slow, 300 is fast
+            headSize (_type_): the size of the initial head node
+            headConstraintRadius (_type_): the radius around the head node that the next node in the group is constrained to
+            startingPosition (_[int, int]_): the starting position of the head
+            extraDrawAngles (_[int, int...]_, optional): _description_. Any extra points to draw the animal polygon on the head. 0 is the front of the head, +ve angles are the left side of the head, & -ve angles are the right side of the head. Defaults to None.
+            angleLimit (_float_, optional): the default maximum bend in degrees between a node and the node in front of it. Nodes attached without their own limit use this. Defaults to DEFAULT_ANGLE_LIMIT.
+            constraintMode (_str_, optional): "vector" keeps nodes within their angle limit using unit vector dot products against the precomputed
+            cos/sin of each node's limit. "angle" uses the original degree based comparison. Both produce the same positions. Defaults to "vector".
+        """
+
+        
+        self.speed = speed
+        self.angleLimit = angleLimit
+        self.constraintMode = constraintMode
+
+        self.profiler = None
+        """An optional FrameProfiler that the phases of updating and drawing the group are timed on
+        """
+
+        self.settled = False
+        """True while the creature is resting on its desired point. updateNodePositions() does nothing until the desired point changes
+        """
+        self.settleEpsilon = SETTLE_EPSILON
+        self.settleThreshold = SETTLE_THRESHOLD
+        self._settledTarget = None
+        self._renderCache = None
+
+        self.lodSize = LOD_SIZE
+        self.lodTolerance = LOD_TOLERANCE
+        """How far in pixels the simplified outline of a small creature may stray from the full one. 0 always draws the full outline
+        """
+
+        self.splineKind = None
+        """One of SPLINE_KINDS to draw the outline as a smooth curve, or None to join the outline points with straight edges
+        """
+        self.splineResolution = SPLINE_RESOLUTION
+        
+        
+        self.desiredPoint = [0,0]
+        """The point the snake will move towards
+        """
+        self.startingPosition = startingPosition
+        self.headNode = Node(None, None, headConstraintRadius, headSize, startingPosition, [0,0], extraDrawAngles=extraDrawAngles)
+
+        #The last node is tracked so nodes can be attached and removed without walking the chain
+        self.tailNode = self.headNode
+        self.totalNodes = 1
+
+        #Outline buffer reused by connectTheDots() every frame. It is rebuilt whenever nodes are added or removed
+        self._outline = []
+        self._outlineSources = (None, None)
+        self._outlineDirty = True
+        self._lodProfile = None
+
+
+    @classmethod
+    def fromProfile(cls, speed, sizes, constraintRadii, startingPosition, headDrawAngles=None, tailDrawAngles=None, angleLimits=None):
+        """Builds a whole spine in one go. The first entry of each list describes the head and the last entry the tail
+
+        Args:
+            speed (_float_): the speed of the snake in pixels per second. 60 is slow, 300 is fast
+            sizes (_[float, float...]_): the visual size of every node, starting with the head
+            constraintRadii (_[float, float...]_): the constraint radius of every node, starting with the head
+            startingPosition (_[int, int]_): the starting position of the head
+            headDrawAngles (_[int, int...]_, optional): extra points to draw on the head, see the constructor. Defaults to None.
+            tailDrawAngles (_[int, int...]_, optional): extra points to draw on the tail, see attachTailNode(). Defaults to None.
+            angleLimits (_[float, float...]_, optional): maximum bend of every node in degrees. Defaults to DEFAULT_ANGLE_LIMIT for every node.
+
+        Returns:
+            _NodeGroup_: the new node group
+        """
+        if angleLimits == None:
+            angleLimits = [DEFAULT_ANGLE_LIMIT]*len(sizes)
+
+        nodeGroup = cls(speed, sizes[0], constraintRadii[0], startingPosition, headDrawAngles, angleLimits[0])
+        for i in range(1, len(sizes) - 1):
+            nodeGroup.attachNewNode(constraintRadii[i], sizes[i], angleLimits[i])
+        if len(sizes) > 1:
+            nodeGroup.attachTailNode(constraintRadii[-1], sizes[-1], tailDrawAngles, angleLimits[-1])
+        return nodeGroup
+
+
+
+    def attachNewNode(self, constraintRadius, size, angleLimit=None):
+        """Attaches a new node to the end of the group
+
+        Args:
+            constraintRadius (_int_): constraint radius of the new node
+            size (_int_): visual size of the new node
+            angleLimit (_float_, optional): maximum bend in degrees between the new node and the node in front of it. Defaults to the group's angleLimit.
+        """
+        self.attachTailNode(constraintRadius, size, None, angleLimit)
+
+
+    def attachTailNode(self, constraintRadius, size, pointAnglesList, angleLimit=None):
+        """A special node addition method that is used specifically for the final node in a spine. It has an additional parameter for 
+        adding extra draw points to the node for more detail
+
+        Args:
+            constraintRadius (_int_): constraint radius of the tails node
+            size (_int_): visual size of the new node
+            pointAnglesList (_[int, int...]_ (ascending order)): A list of angles relative to the front of the node where the points should be placed. The angles
+            must be added in ascending order and must all be POSITIVE
+            angleLimit (_float_, optional): maximum bend in degrees between the tail and the node in front of it. Defaults to the group's angleLimit.
+        """
+        if angleLimit == None:
+            angleLimit = self.angleLimit
+
+        newNode = Node(None, self.tailNode, constraintRadius, size, [self.startingPosition[0]-40*self.totalNodes, self.startingPosition[1]], extraDrawAngles=pointAnglesList, angleLimit=angleLimit)
+        self.tailNode.setNextNode(newNode)
+        self.tailNode = newNode
+        self.totalNodes += 1
+        self._outlineDirty = True
+        self._lodProfile = None
+        self.wake()
+
+
+    def insertNodeBeforeTail(self, constraintRadius, size, angleLimit=None):
+        """Grows the creature at runtime by adding a body node between the tail and the node in front of it. The new node starts halfway
+        between them and the tail gets pushed back onto the new node's constraint circle the next time the positions are updated
+
+        Args:
+            constraintRadius (_int_): constraint radius of the new node
+            size (_int_): visual size of the new node
+            angleLimit (_float_, optional): maximum bend in degrees between the new node and the node in front of it. Defaults to the group's angleLimit.
+        """
+        if self.tailNode == self.headNode:
+            self.attachNewNode(constraintRadius, size, angleLimit)
+            return
+
+        if angleLimit == None:
+            angleLimit = self.angleLimit
+
+        prevNode = self.tailNode.getPreviousNode()
+        midpoint = [(prevNode.position[0] + self.tailNode.position[0])/2, (prevNode.position[1] + self.tailNode.position[1])/2]
+        newNode = Node(self.tailNode, prevNode, constraintRadius, size, midpoint, angleLimit=angleLimit)
+        prevNode.setNextNode(newNode)
+        self.tailNode.setPreviousNode(newNode)
+        self.totalNodes += 1
+        self._outlineDirty = True
+        self._lodProfile = None
+        self.wake()
+
+
+    def removeTailNode(self):
+        """Removes the last node of the group, e.g. when the creature loses its tail. If the removed node had extra draw points
+        they are moved to the new last node so the creature keeps its tail shape. The head node can't be removed
+
+        Returns:
+            _Node_: the removed node, or None if only the head is left
+        """
+        removedNode = self.tailNode
+        if removedNode == self.headNode:
+            return None
+
+        self.tailNode = removedNode.getPreviousNode()
+        self.tailNode.setNextNode(None)
+        removedNode.setPreviousNode(None)
+        self.totalNodes -= 1
+        self._outlineDirty = True
+        self._lodProfile = None
+        self.wake()
+
+        if removedNode.extraDrawAngles != None and self.tailNode != self.headNode:
+            self.tailNode.setExtraDrawAngles(removedNode.extraDrawAngles)
+        return removedNode
+
+    
+    def setAngleLimit(self, angleDeg):
+        """Sets the maximum bend of every node in the group, e.g. to give a species a stiffer or looser spine
+
+        Args:
+            angleDeg (_float_): maximum bend in degrees between a node and the node in front of it
+        """
+        self.angleLimit = angleDeg
+        curNode = self.headNode
+        while curNode != None:
+            curNode.setAngleLimit(angleDeg)
+            curNode = curNode.getNextNode()
+        self.wake()
+
+
+    def setNodeSize(self, node, size):
+        """Resizes one node, e.g. to make a creature grow. The group is woken so its outline is rebuilt with the new size
+
+        Args:
+            node (_int_): index of the node, 0 being the head
+            size (_float_): the new visual size of the node
+        """
+        if not 0 <= node < self.totalNodes:
+            raise IndexError(f"node {node} is outside the group's {self.totalNodes} nodes")
+        curNode = self.headNode
+        for i in range(node):
+            curNode = curNode.getNextNode()
+        curNode.size = size
+        self._lodProfile = None
+        self.wake()
+
+
+    def wake(self):
+        """Makes a settled group update again on the next updateNodePositions(), e.g. after its spine has been changed
+        """
+        self.settled = False
+        self._renderCache = None
+
+
+    def getNodePositions(self):
+        """Returns:
+            _[[float, float]...]_: the position of every node, head first
+        """
+        positions = []
+        curNode = self.headNode
+        while curNode != None:
+            positions.append(curNode.position)
+            curNode = curNode.getNextNode()
+        return positions
+
+
+    def setNodePositions(self, positions):
+        """Moves every node straight to a new position without simulating anything, e.g. to load a recorded frame. The draw points
+        are updated to match
+
+        Args:
+            positions (_[[float, float]...]_): the new position of every node, head first
+        """
+        curNode = self.headNode
+        for position in positions:
+            curNode.position = [float(position[0]), float(position[1])]
+            curNode = curNode.getNextNode()
+
+        curNode = self.headNode
+        while curNode != None:
+            curNode.updateDrawPoints()
+            curNode = curNode.getNextNode()
+        self.wake()
+
+        
+
+    def drawSegments(self, surface):
+        """Draws the nodes as circles using their sizes as well as points on their left and right sides. 
+        This is currently unused as it is not necessary to draw the rendered snake but enabling it 
+        can be useful for seeing how the nodes function. The l/r dots are the points that the snake polygon is rendered using
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the segments on
+        """
+        curNode = self.headNode
+
+        #Main node
+        pygame.draw.circle(surface, (200, 200, 200), curNode.position, curNode.size, 5)
+        
+        #Left dot
+        pygame.draw.circle(surface, (0, 200, 0), curNode.leftLink, 3, 5)
+        
+        #Right dot
+        pygame.draw.circle(surface, (0, 0, 200), curNode.rightLink,3, 5)
+    
+        while curNode.getNextNode() != None:
+            curNode = curNode.getNextNode()
+            pygame.draw.circle(surface, (200, 200, 200), curNode.position, curNode.size, 5)
+            pygame.draw.circle(surface, (0, 200, 0), curNode.leftLink, 3, 5)
+            pygame.draw.circle(surface, (0, 0, 200), curNode.rightLink, 3, 5)
+
+
+    def drawEyes(self, surface, offset=None):
+        """Draws the eyes onto the rendered snake. This can be done by finding 2 points on the side of the head
+        and scaling them back using vector operations to place them inside the node's radius
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the eyes on
+            offset (_(int, int)_, optional): screen position of the surface's top left corner, when drawing onto an offscreen surface. Defaults to None.
+        """
+        if self.headNode.size < LOD_EYE_SIZE:
+            return
+        with section(self.profiler, "drawEyes"):
+            leftEye, rightEye = self.getEyePositions()
+            if offset != None:
+                leftEye = subtractVectors(leftEye, offset)
+                rightEye = subtractVectors(rightEye, offset)
+            pygame.draw.circle(surface, (255, 255, 255), leftEye, 10, 0)
+            pygame.draw.circle(surface, (255, 255, 255), rightEye, 10, 0)
+
+    
+    def getEyePositions(self):
+        """Finds where the eyes are drawn
+
+        Returns:
+            _([float, float], [float, float])_: the left and right eye positions
+        """
+        curNode = self.headNode
+
+        normalizedLeftEyeVector = normalizeVector(getVectorFromPoints(curNode.position, curNode.getPointOnNodeRelativeToPrevious(50)))
+        leftEyeVector = multiplyVectorByScalar(normalizedLeftEyeVector, curNode.size/2)
+        leftEye = subtractVectors(curNode.getPointOnNodeRelativeToPrevious(50), leftEyeVector)
+
+        normalizedRightEyeVector = normalizeVector(getVectorFromPoints(curNode.position, curNode.getPointOnNodeRelativeToPrevious(-50)))
+        rightEyeVector = multiplyVectorByScalar(normalizedRightEyeVector, curNode.size/2)
+        rightEye = subtractVectors(curNode.getPointOnNodeRelativeToPrevious(-50), rightEyeVector)
+        return leftEye, rightEye
+
+    
+    def connectTheDots(self, surface, offset=None):
+        """Collects all the points tracked on the nodes of the group and creates a polygon around them.
+        This creates the shape of the animal and is what is currently used to do rendering.
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the creature on
+            offset (_(int, int)_, optional): screen position of the surface's top left corner, when drawing onto an offscreen surface. Defaults to None.
+        """
+        with section(self.profiler, "connectTheDots polygon build"):
+            pointList = self.buildOutline()
+            lodIndexes = self.getLodIndexes()
+            if lodIndexes != None:
+                pointList = [pointList[i] for i in lodIndexes]
+            elif self.splineKind != None:
+                pointList = smoothOutline(pointList, self.splineKind, self.splineResolution)
+            if offset != None:
+                pointList = [(point[0] - offset[0], point[1] - offset[1]) for point in pointList]
+
+        with section(self.profiler, "pygame.draw.polygon"):
+            pygame.draw.polygon(surface, (225, 130, 0), pointList, 0)
+            if self.headNode.size >= LOD_STROKE_SIZE:
+                pygame.draw.polygon(surface, (255, 255, 255), pointList, 3)
+
+
+    def getLodIndexes(self):
+        """Picks which outline points to draw this frame. Creatures whose head is at least lodSize pixels draw every point. Smaller
+        ones only draw every few nodes' links (and every few tail points), spaced as far apart as the current bend and the taper of the
+        spine allow while keeping the outline within lodTolerance pixels of the full one, see lodStride()
+
+        Returns:
+            _[int, int...] or None_: indexes into buildOutline() of the points to draw, or None to draw all of them
+        """
+        size = self.headNode.size
+        if size >= self.lodSize or self.lodTolerance <= 0 or self.totalNodes < 3:
+            return None
+
+        #Node sizes and spacing only change when nodes are added or removed, so they are measured once and kept until then
+        if self._lodProfile == None or self._lodProfile[0] != self.lodTolerance:
+            sizes = []
+            spacing = 0
+            curNode = self.headNode
+            while curNode.getNextNode() != None:
+                sizes.append(curNode.size)
+                spacing = max(spacing, curNode.constraintRadius)
+                curNode = curNode.getNextNode()
+            #The product of the reciprocal widths of neighbouring nodes turns the dot product of their across vectors into a cos
+            widthScales = [1/(4*sizes[i]*sizes[i + 1]) for i in range(len(sizes) - 1)]
+            sizeCurve, keptNodes = lodSizeProfile(sizes, self.lodTolerance)
+            self._lodProfile = (self.lodTolerance, spacing, sizeCurve, keptNodes, widthScales)
+        tolerance, spacing, sizeCurve, keptNodes, widthScales = self._lodProfile
+
+        #A node's left link minus its right link is its heading turned sideways and scaled by twice its size, so the bend between
+        #consecutive nodes comes straight from the outline without walking the chain or normalizing any vectors
+        outline = self.buildOutline()
+        headCount = len(self.headNode.extraPoints)
+        linkCount = self.totalNodes - 1
+        tailCount = len(self.tailNode.extraPoints)
+        across = [(left[0] - right[0], left[1] - right[1]) for left, right in zip(outline[headCount:headCount + linkCount], outline[:headCount + linkCount + tailCount - 1:-1])]
+        minCos = min([(a[0]*b[0] + a[1]*b[1])*scale for a, b, scale in zip(across, across[1:], widthScales)])
+
+        nodeStride = min(lodStride(tolerance, spacing, math.acos(max(-1, min(1, minCos))), size, sizeCurve), linkCount)
+        tailStride = lodTailStride(tolerance, self.tailNode.extraDrawAngles, self.tailNode.size)
+
+        if nodeStride == 1 and tailStride == 1:
+            return None
+        return lodOutlineIndexes(headCount, linkCount, tailCount, nodeStride, tailStride, keptNodes)
+
+
+    def draw(self, surface):
+        """Draws the creature's body and eyes. While the group is settled nothing about it changes, so the body is rasterized once
+        into an offscreen surface and later frames only blit that. The cached surface is dropped as soon as the group moves again, and
+        redrawn if the spline or level of detail settings change
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the creature on
+        """
+        if not self.settled:
+            self.connectTheDots(surface)
+            self.drawEyes(surface)
+            return
+
+        drawSettings = (self.splineKind, self.splineResolution, self.lodSize, self.lodTolerance)
+        if self._renderCache == None or self._renderCache[2] != drawSettings:
+            bounds = self.getDrawBounds()
+            sprite = pygame.Surface(bounds.size, pygame.SRCALPHA)
+            self.connectTheDots(sprite, bounds.topleft)
+            self.drawEyes(sprite, bounds.topleft)
+            #Most of the sprite is transparent. Run length encoding lets blits skip those pixels instead of blending every one of them
+            sprite.set_alpha(255, pygame.RLEACCEL)
+            self._renderCache = (sprite, bounds.topleft, drawSettings)
+
+        with section(self.profiler, "blit render cache"):
+            surface.blit(self._renderCache[0], self._renderCache[1])
+
+
+    def captureRenderState(self, state=None):
+        """Copies the points the creature is drawn with, so they can be drawn later with drawRenderState() or blended with a newer state.
+        Fixed timestep loops call this before the last simulation step of a frame
+
+        Args:
+            state (_tuple_, optional): an earlier state to overwrite instead of allocating a new one, if its outline is the same size. Defaults to None.
+
+        Returns:
+            _([[float, float]...], [[float, float], [float, float]])_: the outline and eye positions
+        """
+        outline = self.buildOutline()
+        if state == None or len(state[0]) != len(outline):
+            return [[point[0], point[1]] for point in outline], self.getEyePositions()
+
+        points = state[0]
+        for i in range(len(outline)):
+            points[i][0] = outline[i][0]
+            points[i][1] = outline[i][1]
+        return points, self.getEyePositions()
+
+
+    def drawInterpolated(self, surface, previousState, alpha):
+        """Draws the creature part way between an earlier render state and its current one. The outline and eye points are blended,
+        which keeps motion smooth when frames are drawn between simulation steps. Settled groups, and groups whose outline changed size
+        since previousState was captured, are drawn normally with draw()
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the creature on
+            previousState (_tuple or None_): the state returned by captureRenderState() before the latest simulation step
+            alpha (_float_): how far to draw the creature from previousState (0) to its current state (1)
+
+        Returns:
+            _pygame.Rect_: the area drawn over
+        """
+        outline = self.buildOutline()
+        if previousState == None or self.settled or alpha >= 1 or len(previousState[0]) != len(outline):
+            self.draw(surface)
+            return self.getDrawBounds()
+        return self.drawRenderState(surface, (outline, self.getEyePositions()), previousState, alpha, self.getLodIndexes())
+
+
+    def drawRenderState(self, surface, state, previousState=None, alpha=1, lodIndexes=None):
+        """Draws the creature from a captured render state rather than from its nodes, optionally blended with an earlier state.
+        Only the state is read, so it can be drawn while another thread is updating the nodes
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the creature on
+            state (_tuple_): the state to draw, from captureRenderState()
+            previousState (_tuple or None_, optional): an earlier state of the same size to blend from. Defaults to None.
+            alpha (_float_, optional): how far to draw the creature from previousState (0) to state (1). Defaults to 1.
+            lodIndexes (_[int, int...] or None_, optional): only draw these outline points, see getLodIndexes(). Defaults to None.
+
+        Returns:
+            _pygame.Rect_: the area drawn over
+        """
+        pointList, eyes = state
+        if lodIndexes != None:
+            pointList = [pointList[i] for i in lodIndexes]
+            if previousState != None:
+                previousState = ([previousState[0][i] for i in lodIndexes], previousState[1])
+        if previousState != None and alpha < 1:
+            with section(self.profiler, "interpolate render state"):
+                pointList = [(previous[0] + (current[0] - previous[0])*alpha, previous[1] + (current[1] - previous[1])*alpha) for previous, current in zip(previousState[0], pointList)]
+                eyes = [(previous[0] + (current[0] - previous[0])*alpha, previous[1] + (current[1] - previous[1])*alpha) for previous, current in zip(previousState[1], eyes)]
+        #Splines are linear in their points, so smoothing the blended points gives the same curve as blending smoothed ones, for less work
+        if lodIndexes == None and self.splineKind != None:
+            with section(self.profiler, "smooth outline"):
+                pointList = smoothOutline(pointList, self.splineKind, self.splineResolution)
+
+        with section(self.profiler, "pygame.draw.polygon"):
+            drawnRect = pygame.draw.polygon(surface, (225, 130, 0), pointList, 0)
+            if self.headNode.size >= LOD_STROKE_SIZE:
+                drawnRect.union_ip(pygame.draw.polygon(surface, (255, 255, 255), pointList, 3))
+        if self.headNode.size >= LOD_EYE_SIZE:
+            with section(self.profiler, "drawEyes"):
+                for eye in eyes:
+                    drawnRect.union_ip(pygame.draw.circle(surface, (255, 255, 255), eye, 10, 0))
+        return drawnRect
+
+
+    def buildOutline(self):
+        """Returns the polygon outline of the group. The outline is a single list holding references to the draw point lists of the
+        nodes, which are updated in place every frame, so it is only rebuilt when nodes are added or removed and otherwise costs nothing
+
+        Returns:
+            _[[float, float]...]_: the outline points. The list is reused between frames and must not be modified
+        """
+        headCount = len(self.headNode.extraPoints)
+        tailCount = len(self.tailNode.extraPoints)
+        outlineSize = headCount + 2*(self.totalNodes - 1) + tailCount
+
+        #The head and tail extra point lists are replaced if a node's draw angles are changed, which also means a rebuild
+        outlineSources = (self.headNode.extraPoints, self.tailNode.extraPoints)
+        if self._outlineDirty or len(self._outline) != outlineSize or outlineSources[0] is not self._outlineSources[0] or outlineSources[1] is not self._outlineSources[1]:
+            self._outline = [None]*outlineSize
+            self._fillOutline()
+            self._outlineSources = outlineSources
+            self._outlineDirty = False
+        return self._outline
+
+
+    def getDrawBounds(self, margin=3):
+        """Finds the screen area the creature covers when it is drawn, eyes included. The eyes have a fixed radius, so on small heads
+        they stick out past the outline
+
+        Args:
+            margin (_int_, optional): extra pixels added around the outline, to cover the outline stroke. Defaults to 3.
+
+        Returns:
+            _pygame.Rect_: the bounding box of the outline polygon and the eyes
+        """
+        bounds = self.getOutlineBounds(margin)
+        if self.headNode.size >= LOD_EYE_SIZE:
+            for eye in self.getEyePositions():
+                bounds.union_ip(eyeBounds(eye))
+        return bounds
+
+
+    def getOutlineBounds(self, margin=3):
+        """Finds the screen area the creature covers when it is drawn
+
+        Args:
+            margin (_int_, optional): extra pixels added on every side, to cover the outline stroke. Defaults to 3.
+
+        Returns:
+            _pygame.Rect_: the bounding box of the outline polygon
+        """
+        outline = self.buildOutline()
+        #A Catmull-Rom curve can bulge slightly past the points it passes through, a B-spline stays within them
+        if self.splineKind == "catmull-rom":
+            outline = smoothOutline(outline, self.splineKind, self.splineResolution)
+        minX = maxX = outline[0][0]
+        minY = maxY = outline[0][1]
+        for point in outline:
+            x = point[0]
+            y = point[1]
+            if x < minX:
+                minX = x
+            elif x > maxX:
+                maxX = x
+            if y < minY:
+                minY = y
+            elif y > maxY:
+                maxY = y
+        left = math.floor(minX) - margin
+        top = math.floor(minY) - margin
+        return pygame.Rect(left, top, math.ceil(maxX) + margin - left + 1, math.ceil(maxY) + margin - top + 1)
+
+
+    def _fillOutline(self):
+        """Writes the point references into the outline buffer.
+
+        The polygon starts with the rightmost custom point on the head, wraps around all the default left
+        points on the nodes, then does the custom tail points from left to right before going up the 
+        right side default points starting from the tail, ending with the right default point on the head.
+        The links of the tail node itself are covered by its custom points so they aren't included
+        """
+        outline = self._outline
+
+        #Head points are placed in ascending order (rightmost angles to leftmost angles) therefore
+        #they don't have to be reversed before being added to the list
+        i = 0
+        for point in self.headNode.extraPoints:
+            outline[i] = point
+            i += 1
+
+        #The left points go from head to tail, and the right points are written from the far end of the buffer
+        #backwards so they come out tail to head without reversing anything
+        rightIndex = len(outline) - 1
+        curNode = self.headNode
+        while curNode.getNextNode() != None:
+            outline[i] = curNode.leftLink
+            outline[rightIndex] = curNode.rightLink
+            i += 1
+            rightIndex -= 1
+            curNode = curNode.getNextNode()
+
+        #Tail points are placed in ascending order, but all must be positive resulting in them being ordered
+        #left to right, so the list doesn't need to be reversed
+        for point in curNode.extraPoints:
+            outline[i] = point
+            i += 1
+
+            
+    def updateHeadNode(self):
+        """Updates the point that the head node moves towards
+        """
+        if self.settled and (self.desiredPoint[0] != self._settledTarget[0] or self.desiredPoint[1] != self._settledTarget[1]):
+            self.wake()
+        self.headNode.desiredPoint = self.desiredPoint
+
+
+    def updateNodePositions(self, dt=SIMULATION_STEP):
+        """Updates the position of each node in the group, and ensures all nodes are within the angle flexibility threshold.
+        Once the head reaches the desired point the group watches how far its nodes move, and when they have stopped it is marked
+        as settled and this does nothing until the desired point changes
+
+        Args:
+            dt (_float_, optional): length of the step in seconds. The head moves speed*dt pixels. Defaults to SIMULATION_STEP.
+        """
+        if self.settled:
+            if self.desiredPoint[0] == self._settledTarget[0] and self.desiredPoint[1] == self._settledTarget[1]:
+                return
+            self.wake()
+
+        profiler = self.profiler
+
+        #This block updates the head node's position based on the mouse position
+        with section(profiler, "head move"):
+            vectorToDesiredPos = [self.desiredPoint[0] - self.headNode.position[0], self.desiredPoint[1] - self.headNode.position[1]]
+            distanceToDesiredPos = calculateVectorMagnitude(vectorToDesiredPos)
+            #The head stops on the desired point rather than overshooting it and jittering back and forth around it
+            headStep = min(self.speed*dt, distanceToDesiredPos)
+            vectorToDesiredPos = normalizeVector(vectorToDesiredPos)
+            vectorToDesiredPos = multiplyVectorByScalar(vectorToDesiredPos, headStep)
+            #The position is reassigned rather than changed in place so the head's cached heading is invalidated
+            self.headNode.position = [self.headNode.position[0] + vectorToDesiredPos[0], self.headNode.position[1] + vectorToDesiredPos[1]]
+
+        #Node movement is only measured once the head has arrived, so moving creatures don't pay for it
+        watchSettling = distanceToDesiredPos - headStep <= self.settleEpsilon
+        
+        #With a profiler the time spent in each step is summed over every node. The checks are cheap next to the steps themselves,
+        #so both cases share one loop
+        timed = profiler != None
+        if timed:
+            clock = profiler.clock
+            drawPointsTime = 0
+            followTime = 0
+            constraintTime = 0
+            start = clock()
+
+        maxMovement = 0
+        curNode = self.headNode
+        curNode.updateDrawPoints()
+        if timed:
+            drawPointsTime += clock() - start
+
+        while curNode.getNextNode() != None:
+            curNode = curNode.getNextNode()
+            oldPosition = curNode.position
+            if timed:
+                start = clock()
+            curNode.updateDrawPoints()
+            if timed:
+                drawPointsDone = clock()
+            curNode.updateNodePosition()
+            if timed:
+                followDone = clock()
+            self.constrainNode(curNode)
+            if timed:
+                constraintDone = clock()
+                drawPointsTime += drawPointsDone - start
+                followTime += followDone - drawPointsDone
+                constraintTime += constraintDone - followDone
+            if watchSettling:
+                maxMovement = max(maxMovement, abs(curNode.position[0] - oldPosition[0]), abs(curNode.position[1] - oldPosition[1]))
+
+        if timed:
+            profiler.addTime("follow pass", followTime)
+            profiler.addTime("angle constraint", constraintTime)
+            profiler.addTime("updateDrawPoints", drawPointsTime)
+
+        if watchSettling and max(maxMovement, headStep) <= self.settleThreshold:
+            self.settled = True
+            self._settledTarget = (self.desiredPoint[0], self.desiredPoint[1])
+
+
+    def constrainNode(self, curNode):
+        """This aims to ensure that the snake doesn't collapse in on itself, by maintaining a maximum difference in
+        angle between a current node and the previous node it is constrained to
+
+        Args:
+            curNode (_Node_): the node being constrained. Must not be the head
+        """
+        if self.constraintMode == "angle":
+            self.applyAngleConstraintInDegrees(curNode)
+        else:
+            self.applyAngleConstraint(curNode)
+
+
+    def applyAngleConstraint(self, curNode):
+        """Keeps a node within its angle limit of the node in front of it without any inverse trig. The headings of both nodes are
+        unit vectors, so the bend is too large whenever their dot product drops below the cosine of the limit. The two allowed edges
+        of the cone are the previous heading rotated by +/- the limit using the node's precomputed cos/sin
+
+        Args:
+            curNode (_Node_): the node being constrained. Must not be the head
+        """
+        prevNode = curNode.getPreviousNode()
+        prevHeading = prevNode.calculateHeadingToConnectedNode()
+        curHeading = curNode.calculateHeadingToConnectedNode()
+
+        if vectorDotProduct(curHeading, prevHeading) >= curNode.angleLimitCos:
+            return
+
+        limitCos = curNode.angleLimitCos
+        limitSin = curNode.angleLimitSin
+
+        #Because 2 possible vectors exist that form the desired angle, we create both then check with is closer to the node's current vector
+        #The closer one has the larger dot product with the current heading
+        leftHeading = [prevHeading[0]*limitCos + prevHeading[1]*limitSin, prevHeading[1]*limitCos - prevHeading[0]*limitSin]
+        rightHeading = [prevHeading[0]*limitCos - prevHeading[1]*limitSin, prevHeading[1]*limitCos + prevHeading[0]*limitSin]
+
+        if vectorDotProduct(curHeading, leftHeading) > vectorDotProduct(curHeading, rightHeading):
+            newHeading = leftHeading
+        else:
+            newHeading = rightHeading
+
+        curNode.position = subtractVectors(prevNode.position, multiplyVectorByScalar(newHeading, prevNode.constraintRadius))
+
+
+    def applyAngleConstraintInDegrees(self, curNode):
+        """The original angle constraint. We effectively check the difference in angle between the vector connecting the current node to
+        it's previous node and the previous node's vector to it's own constraining node.
+
+        If the angle is found to be above the threshold, we calculate a new position for the current just within the angle
+        threshold on the previous node's constraint circle
+
+        Args:
+            curNode (_Node_): the node being constrained. Must not be the head
+        """
+        prevNodeAngle = math.degrees(curNode.getPreviousNode().calculateAngleToConnectedNode())
+        curNodeAngle = math.degrees(curNode.calculateAngleToConnectedNode())
+        if prevNodeAngle > 180:
+            prevNodeAngle = prevNodeAngle - 360
+        if curNodeAngle > 180:
+            curNodeAngle = curNodeAngle - 360   
+
+        angleDifference = (curNodeAngle - prevNodeAngle)
+
+        if 360 - curNode.angleLimit > abs(angleDifference) > curNode.angleLimit:
+
+            #Because 2 possible vectors exist that form the desired angle, we create both then check with is closer to the node's current vector
+            #This finds the correction that is closest to the nodes current position and creates the most natural look
+            newPos1 = curNode.getPreviousNode().getPointOnNodeConstraintRadiusRelativeToPrevious(180 - curNode.angleLimit)
+            newPos2 = curNode.getPreviousNode().getPointOnNodeConstraintRadiusRelativeToPrevious(curNode.angleLimit - 180)
+
+            angleDiff1 = calculateAngleBetweenVectors(curNode.calculateVectorToConnectedNode(), getVectorFromPoints(newPos1, curNode.previousNode.position))
+            angleDiff2 = calculateAngleBetweenVectors(curNode.calculateVectorToConnectedNode(), getVectorFromPoints(newPos2, curNode.previousNode.position))
+            
+            if angleDiff1 < angleDiff2:
+                curNode.position = newPos1
+            else:
+                curNode.position = newPos2
+                
+                
+    
+        
+
+
+
+
+
+
+
+
+class Node:
+    """The individual nodes that comprise a node group. Each node can be connected to 2 other nodes, one node above it in the chain, 
+    and one node below it. Each node can be thought of as a segment of the spine of the creature being simulated, with
+    the movement of each node is constrained by the previous node in the group.
+
+    The node's heading (the unit vector to the previous node) is cached the first time it is needed and reused by every draw point and
+    constraint query until the node, the previous node or the head's desiredPoint is reassigned. Positions must therefore be replaced
+    with a new list rather than modified in place.
+    """
+    def __init__(self, nextNode, previousNode, constraintRadius, size, position, desiredPoint=None, extraDrawAngles=None, angleLimit=DEFAULT_ANGLE_LIMIT):
+        self._heading = None
+        self._headingAngle = None
+        #Nodes start out in a line facing right. A node keeps its last heading while it sits exactly on the point it faces
+        self._lastHeading = [1, 0]
+        self.nextNode = nextNode
+        self.previousNode = previousNode
+        self.constraintRadius = constraintRadius
+        self.size = size
+        self.position = position
+        self.desiredPoint = desiredPoint
+        self.leftLink = self.getPointOnNodeRelativeToPrevious(90)
+        self.rightLink = self.getPointOnNodeConstraintRadiusRelativeToPrevious(-90)
+        self.setAngleLimit(angleLimit)
+        
+
+        #Angles should be provided in ascending order
+        self.setExtraDrawAngles(extraDrawAngles)
+
+
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, position):
+        #Moving a node changes its own heading and the heading of the node behind it
+        self._position = position
+        self._heading = None
+        self._headingAngle = None
+        if self.nextNode != None:
+            self.nextNode.invalidateHeading()
+
+    @property
+    def desiredPoint(self):
+        return self._desiredPoint
+
+    @desiredPoint.setter
+    def desiredPoint(self, desiredPoint):
+        self._desiredPoint = desiredPoint
+        self.invalidateHeading()
+
+
+    def invalidateHeading(self):
+        """Clears the cached heading so it is recalculated the next time it is needed
+        """
+        self._heading = None
+        self._headingAngle = None
+
+
+    def updateNodePosition(self):
+        """Updates the node to its new position based on the position of the previous node. Finds the vector between the 
+        current and previous nodes then reducing the vector until the current node lies on the constraint circle of the prev node
+        """
+        curVector = self.calculateVectorToConnectedNode()
+        normalizedVector = normalizeVector(curVector, self._lastHeading)
+
+        #The node is constrained based on the constraintRadius of the previous node
+        correctedVector = multiplyVectorByScalar(normalizedVector, self.getPreviousNode().constraintRadius)
+        self.position = [self.previousNode.position[0] - correctedVector[0], self.previousNode.position[1] - correctedVector[1]]
+
+
+    def calculateVectorToConnectedNode(self):
+        """Calculates the vector from the current node to the previous node. Note that this vector is not normalized
+
+        Returns:
+            _[float, float]_: a [x,y] list representing a 2d vector from the current node to the previous node
+        """
+        connectedNodePosition = self.previousNode.position
+        xDisp = connectedNodePosition[0] - self.position[0]
+        yDisp = connectedNodePosition[1] - self.position[1]
+        return [xDisp, yDisp]
+
+
+    def calculateHeadingToConnectedNode(self):
+        """Calculates the unit vector pointing from the node to the previous node.
+        If this is called on a head node (no previous node), then it points from the head node to the desiredPoint(mouse)
+
+        Returns:
+            _[float, float]_: a normalized [x,y] vector. This is the cached heading and must not be modified
+        """
+        if self._heading == None:
+            if self.previousNode == None:
+                self._heading = normalizeVector([self.desiredPoint[0] - self.position[0], self.desiredPoint[1] - self.position[1]], self._lastHeading)
+            else:
+                self._heading = normalizeVector(self.calculateVectorToConnectedNode(), self._lastHeading)
+            self._lastHeading = self._heading
+        return self._heading
+
+
+    def setAngleLimit(self, angleDeg):
+        """Sets the maximum difference in angle between this node's heading and the previous node's heading. The cos and sin
+        of the limit are precomputed so the constraint never needs trig while the creature is moving
+
+        Args:
+            angleDeg (_float_): the limit in degrees
+        """
+        self.angleLimit = angleDeg
+        self.angleLimitCos = math.cos(math.radians(angleDeg))
+        self.angleLimitSin = math.sin(math.radians(angleDeg))
+
+
+    def calculateAngleToConnectedNode(self):
+        """Calculates the angle to the connected node in radians. right is 0, up is pi/2, left is pi, down is 3pi/2.
+        If this is called on a head node (no previous node), then it finds the angle from the head node to the desiredPoint(mouse)
+
+        Returns:
+            _float_: the angle from the node to the previous node in radians
+        """
+        if self._headingAngle == None:
+            normalizedVector = self.calculateHeadingToConnectedNode()
+            angle = math.acos(normalizedVector[0])
+            if normalizedVector[1] < 0:
+                angle = 2*math.pi - angle
+            self._headingAngle = abs(2*math.pi - angle)
+        return self._headingAngle
+    
+
+    
+    #Returns a point on a node circle relative to the angle of the vector from it to the previous node
+    def getPointOnNodeRelativeToPrevious(self, angleDeg):
+        """Returns the screen coordinates of a point on the node's draw circle relative to its front(front is the angle this node makes with the prev node) 
+        given an angle. Used to help render the creature by providing points along the nodes to draw a polygon over.
+        The similarily named method used for the constraint circle is not used to render the creature, but is useful for debugging
+
+        Args:
+            angleDeg (_int_): The angle from the front of the node in degrees
+
+        Returns:
+            _[int, int]_: screen coordinates of the requested point on the node's size circle
+        """
+        return self.getPointOnCircleRelativeToPrevious(angleDeg, self.size)
+
+
+    def getPointOnNodeConstraintRadiusRelativeToPrevious(self, angleDeg):
+        """Identical to it's sister method above, other than the fact that the points it finds are on the node's constraint circle
+
+        Args:
+            angleDeg (_int_): The angle from the front of the node in degrees
+
+        Returns:
+            _[int, int]_: screen coordinates of the requested point on the node's constraint circle
+        """
+        return self.getPointOnCircleRelativeToPrevious(angleDeg, self.constraintRadius)
+
+
+    def getPointOnCircleRelativeToPrevious(self, angleDeg, radius):
+        """Finds a point on a circle around the node by rotating the cached heading by angleDeg. The cos and sin of the angle come
+        from a shared cache, so no trig is done once every angle has been seen
+
+        Args:
+            angleDeg (_int_): The angle from the front of the node in degrees
+            radius (_float_): radius of the circle the point lies on
+
+        Returns:
+            _[float, float]_: screen coordinates of the requested point
+        """
+        heading = self.calculateHeadingToConnectedNode()
+        cosOffset, sinOffset = getAngleBasis(angleDeg)
+
+        #The y component must be reversed here, as the screen coordinates consider y values up on the screen to be smaller
+        #which contradicts the unit circle mindset of x and y coordinates
+        return [self.position[0] + radius*(heading[0]*cosOffset + heading[1]*sinOffset), self.position[1] + radius*(heading[1]*cosOffset - heading[0]*sinOffset)]
+
+
+    def getPreviousNode(self):
+        """Returns the previous node this node is connected to
+
+        Returns:
+            _Node_:previous nod3
+        """
+        return self.previousNode
+    
+    def getNextNode(self):
+        """Returns the next node this node is connected to
+
+        Returns:
+            _Node_: previous node
+        """
+        return self.nextNode
+    
+    def setNextNode(self, nextNode):
+        """Sets the next node
+
+        Args:
+            nextNode (_Node_): the next node in the chain
+        """
+        self.nextNode = nextNode
+
+    def setPreviousNode(self, previousNode):
+        """Sets the previous node. The node's heading points at the previous node, so its cached heading is cleared
+
+        Args:
+            previousNode (_Node_): the previous node in the chain
+        """
+        self.previousNode = previousNode
+        self.invalidateHeading()
+
+    def setExtraDrawAngles(self, extraDrawAngles):
+        """Replaces the extra draw points of the node
+
+        Args:
+            extraDrawAngles (_[int, int...]_): angles of the extra points, in the same order rules as attachTailNode()
+        """
+        self.extraDrawAngles = extraDrawAngles
+        self.extraPoints = []
+        if extraDrawAngles != None:
+            for angle in extraDrawAngles:
+                self.extraPoints.append(self.getPointOnNodeRelativeToPrevious(angle))
+
+    def updateDrawPoints(self):
+        """Updates the points along the node that are used to render the creature. The points are written into the node's existing
+        point lists rather than replacing them, so the group's outline buffer can keep referencing them between frames
+        """
+        heading = self.calculateHeadingToConnectedNode()
+        x = self.position[0]
+        y = self.position[1]
+        size = self.size
+
+        #The left link is the heading rotated 90 degrees to the left (screen y points down), the right link is the opposite side
+        leftLink = self.leftLink
+        leftLink[0] = x + size*heading[1]
+        leftLink[1] = y - size*heading[0]
+        rightLink = self.rightLink
+        rightLink[0] = x - size*heading[1]
+        rightLink[1] = y + size*heading[0]
+
+        #If a node (usually the head or tail) has extra points, this block is in charge of updating them 
+        if self.extraDrawAngles != None:
+            for i in range(len(self.extraDrawAngles)):
+                cosOffset, sinOffset = getAngleBasis(self.extraDrawAngles[i])
+                point = self.extraPoints[i]
+                point[0] = x + size*(heading[0]*cosOffset + heading[1]*sinOffset)
+                point[1] = y + size*(heading[1]*cosOffset - heading[0]*sinOffset)
+                
+
+
+
+
+###-----------------------------------
+#Bunch of vector functions I made that are used throughout the math in the rest of the methods.
+#If you want to learn more about the math and formulas behind these functions, take a look at this article
+#https://www.superprof.co.uk/resources/academic/maths/analytical-geometry/vectors/vector-formulas.html
+
+def getVectorFromPoints(p1, p2):
+    return [p2[0]-p1[0], p2[1]-p1[1]]
+
+def calculateVectorMagnitude(vectorArray):
+    return math.sqrt((math.pow(vectorArray[0], 2) + math.pow(vectorArray[1], 2)))
+
+def normalizeVector(vectorArray, fallback=None):
+    """Scales a vector to length 1. A zero length vector has no direction, so fallback is returned for it instead (a copy of it), or
+    [0, 0] if no fallback is given
+    """
+    magnitude = calculateVectorMagnitude(vectorArray)
+    if magnitude == 0:
+        return [0, 0] if fallback == None else [fallback[0], fallback[1]]
+    normalizedVector = [vectorArray[0]/magnitude, vectorArray[1]/magnitude]
+    return normalizedVector
+
+
+def multiplyVectorByScalar(vectorArray, scalar):
+    multipliedVector = [vectorArray[0]*scalar, vectorArray[1]*scalar]
+    return multipliedVector
+
+
+def vectorDotProduct(v1, v2):
+    return v1[0]*v2[0] + v1[1]*v2[1]
+
+
+
+def subtractVectors(v1, v2):
+    return [v1[0]-v2[0], v1[1]-v2[1]]
+
+
+#cos and sin of every angle (degrees) that nodes have placed points at so far
+_angleBasisCache = {}
+
+def getAngleBasis(angleDeg):
+    basis = _angleBasisCache.get(angleDeg)
+    if basis == None:
+        basis = (math.cos(math.radians(angleDeg)), math.sin(math.radians(angleDeg)))
+        _angleBasisCache[angleDeg] = basis
+    return basis
+
+
+def eyeBounds(eye):
+    """Returns:
+        _pygame.Rect_: the area covered by an eye drawn at eye, which drawEyes() draws as a circle of radius 10
+    """
+    left = math.floor(eye[0]) - 10
+    top = math.floor(eye[1]) - 10
+    return pygame.Rect(left, top, math.ceil(eye[0]) + 10 - left + 1, math.ceil(eye[1]) + 10 - top + 1)
+
+
+def lodStride(tolerance, spacing, bend, radius, sizeCurve=0):
+    """Finds how many nodes apart the outline points of a spine can be drawn while the outline stays within tolerance of the full one.
+    If nodes are spacing apart and turn at most bend radians per node, the sides of the spine curve no tighter than an arc of radius
+    spacing/bend, widened by radius on the outside. A chord across k nodes strays (spacing/bend + radius)(1 - cos(k*bend/2)) from that arc.
+    Where the body widens or narrows unevenly the sides bulge away from the chord as well, by up to k*k*sizeCurve/8
+
+    Args:
+        tolerance (_float_): furthest the simplified outline may stray from the full one, in pixels
+        spacing (_float_): largest distance between neighbouring nodes
+        bend (_float_): largest bend between neighbouring nodes in radians
+        radius (_float_): largest node size
+        sizeCurve (_float_, optional): largest change in the difference between neighbouring node sizes, see lodSizeProfile(). Defaults to 0.
+
+    Returns:
+        _int_: the stride, 1 to keep every node
+    """
+    stride = 1 << 30
+    arcRadius = 0
+    if bend > 1e-9:
+        arcRadius = spacing/bend + radius
+        if tolerance < 2*arcRadius:
+            stride = max(1, int(2*math.acos(1 - tolerance/arcRadius)/bend))
+    if sizeCurve <= 0:
+        return stride
+
+    #Each bound uses the whole tolerance on its own, so the longest stride where the two errors together fit is searched for below both
+    low = 1
+    high = min(stride, max(1, int(math.sqrt(8*tolerance/sizeCurve))))
+    while low < high:
+        stride = (low + high + 1)//2
+        if arcRadius*(1 - math.cos(min(math.pi, stride*bend/2))) + stride*stride*sizeCurve/8 <= tolerance:
+            low = stride
+        else:
+            high = stride - 1
+    return low
+
+
+def lodSizeProfile(sizes, tolerance):
+    """Finds how unevenly a spine's width changes, from the second differences of its node sizes. A body that tapers at a steady rate
+    scores 0 and can be simplified as far as its bend allows. Nodes where the width changes sharply, like a neck, would hold the whole
+    spine back, so they are always drawn instead and left out of the score
+
+    Args:
+        sizes (_[float, float...]_): node sizes, head first
+        tolerance (_float_): furthest the simplified outline may stray from the full one, in pixels
+
+    Returns:
+        _(float, (int, int...))_: the largest |sizes[i - 1] - 2*sizes[i] + sizes[i + 1]| of the other nodes, and the nodes always drawn
+    """
+    sizeCurve = 0
+    keptNodes = []
+    for i in range(1, len(sizes) - 1):
+        curve = abs(sizes[i - 1] - 2*sizes[i] + sizes[i + 1])
+        #Past tolerance/2 a node alone would keep the stride below 4
+        if curve > tolerance/2:
+            keptNodes.append(i)
+        else:
+            sizeCurve = max(sizeCurve, curve)
+    return sizeCurve, tuple(keptNodes)
+
+
+def lodTailStride(tolerance, tailAngles, size):
+    """Finds how many of a node's extra draw points apart the drawn points can be while staying within tolerance of the full outline.
+    The points sit on a circle of radius size, so this is lodStride() for an arc
+
+    Args:
+        tolerance (_float_): furthest the simplified outline may stray from the full one, in pixels
+        tailAngles (_[float, float...] or None_): the node's extra draw angles in degrees, in ascending order
+        size (_float_): the node's size
+
+    Returns:
+        _int_: the stride, 1 to keep every point
+    """
+    if tailAngles is None or len(tailAngles) < 3:
+        return 1
+    angleStep = math.radians(min(tailAngles[i + 1] - tailAngles[i] for i in range(len(tailAngles) - 1)))
+    return min(lodStride(tolerance, size*angleStep, angleStep, 0), len(tailAngles))
+
+
+#Outline index lists picked by lodOutlineIndexes() so far
+_lodIndexCache = {}
+
+def lodOutlineIndexes(headCount, linkCount, tailCount, nodeStride, tailStride, keptNodes=()):
+    """Picks the points of an outline laid out as head points, left links, tail points and then right links from tail to head that
+    are kept when only every nodeStride-th node and every tailStride-th tail point is drawn. The first and last of each are always kept,
+    as are keptNodes, and the count restarts from each of them
+
+    Returns:
+        _[int, int...]_: indexes of the kept points, in outline order
+    """
+    key = (headCount, linkCount, tailCount, nodeStride, tailStride, keptNodes)
+    indexes = _lodIndexCache.get(key)
+    if indexes == None:
+        nodes = [0]
+        for kept in list(keptNodes) + [linkCount - 1]:
+            if kept >= linkCount:
+                break
+            nodes += range(nodes[-1] + nodeStride, kept, nodeStride)
+            if kept > nodes[-1]:
+                nodes.append(kept)
+        tailPoints = list(range(0, tailCount, tailStride))
+        if tailCount and tailPoints[-1] != tailCount - 1:
+            tailPoints.append(tailCount - 1)
+
+        tailStart = headCount + linkCount
+        rightEnd = tailStart + tailCount + linkCount - 1
+        indexes = list(range(headCount))
+        indexes += [headCount + node for node in nodes]
+        indexes += [tailStart + point for point in tailPoints]
+        indexes += [rightEnd - node for node in reversed(nodes)]
+        _lodIndexCache[key] = indexes
+    return indexes
+
+
+#Spline basis weights worked out by splineBasis() so far
+_splineBasisCache = {}
+
+#Coefficients of 1, t, t^2 and t^3 in the weight of each of the four control points around a segment
+_SPLINE_MATRICES = {
+    "catmull-rom": ((0, 1, 0, 0), (-0.5, 0, 0.5, 0), (1, -2.5, 2, -0.5), (-0.5, 1.5, -1.5, 0.5)),
+    "b-spline": ((1/6, 2/3, 1/6, 0), (-0.5, 0, 0.5, 0), (0.5, -1, 0.5, 0), (-1/6, 0.5, -0.5, 1/6)),
+}
+
+def splineBasis(kind, resolution):
+    """Works out the weights of the four control points around a segment at resolution evenly spaced points along it. The weights
+    only depend on the kind and resolution, so every outline is smoothed with the same precomputed table
+
+    Args:
+        kind (_str_): one of SPLINE_KINDS
+        resolution (_int_): number of points per segment
+
+    Returns:
+        _((float, float, float, float)...)_: the weights of the point before the segment, its start, its end and the point after it
+    """
+    key = (kind, resolution)
+    basis = _splineBasisCache.get(key)
+    if basis == None:
+        if kind not in _SPLINE_MATRICES:
+            raise ValueError(f"kind must be one of {SPLINE_KINDS}")
+        matrix = _SPLINE_MATRICES[kind]
+        basis = []
+        for sample in range(resolution):
+            t = sample/resolution
+            powers = (1, t, t*t, t*t*t)
+            basis.append(tuple(sum(powers[power]*matrix[power][point] for power in range(4)) for point in range(4)))
+        basis = tuple(basis)
+        _splineBasisCache[key] = basis
+    return basis
+
+
+def smoothOutline(points, kind, resolution):
+    """Samples a closed spline through a polygon's points, see splineBasis()
+
+    Args:
+        points (_[[float, float]...]_): the polygon's points, in order
+        kind (_str_): one of SPLINE_KINDS
+        resolution (_int_): number of points per edge of the polygon
+
+    Returns:
+        _[(float, float)...]_: resolution times as many points, tracing the curve
+    """
+    basis = splineBasis(kind, resolution)
+    pointCount = len(points)
+    smoothPoints = []
+    for i in range(pointCount):
+        p0 = points[i - 1]
+        p1 = points[i]
+        p2 = points[(i + 1) % pointCount]
+        p3 = points[(i + 2) % pointCount]
+        for w0, w1, w2, w3 in basis:
+            smoothPoints.append((w0*p0[0] + w1*p1[0] + w2*p2[0] + w3*p3[0], w0*p0[1] + w1*p1[1] + w2*p2[1] + w3*p3[1]))
+    return smoothPoints
+
+
+def calculateAngleBetweenVectors(v1, v2):
+    val = 0
+    val = vectorDotProduct(v1,v2)/(calculateVectorMagnitude(v1)*calculateVectorMagnitude(v2))
+    #In certain scenarios val will be slightly outside of acos domain due to floating point errors. We round val to ensure this
+    #doesn't occur
+    val = round(val, 8)
+    return math.acos(val)
+###-----------------------------------
+
+
+
+def snakeProfile(bodyNodes=SNAKE_BODY_NODES):
+    """The node sizes and constraint radii of the demo snake, head first. The body is always the same length. With fewer body nodes
+    they are spaced further apart, each taking the size the full body has at the same point along it
+
+    Args:
+        bodyNodes (_int_, optional): number of nodes between the head and the tail. Defaults to SNAKE_BODY_NODES, 104 nodes in all.
+
+    Returns:
+        _([float...], [float...])_: the sizes and constraint radii
+    """
+    if bodyNodes < 1:
+        raise ValueError(f"bodyNodes must be at least 1, not {bodyNodes}")
+    nodeSizes = [30, 30, 25]
+    nodeConstraintRadii = [10, 10, 10]
+    for i in range(bodyNodes):
+        #The full body narrows by a third of a pixel every second node
+        nodeSizes.append(28 - (i*SNAKE_BODY_NODES//bodyNodes//2)/3)
+        nodeConstraintRadii.append(10*SNAKE_BODY_NODES/bodyNodes)
+    nodeSizes.append(15)
+    nodeConstraintRadii.append(20)
+    return nodeSizes, nodeConstraintRadii
+
+
+def snakeAngleLimits(bodyNodes=SNAKE_BODY_NODES):
+    """The angle limits of the demo snake, head first. Body nodes spaced further apart may bend further, so the body can curl just as
+    tightly whatever its node count
+
+    Args:
+        bodyNodes (_int_, optional): number of nodes between the head and the tail. Defaults to SNAKE_BODY_NODES.
+
+    Returns:
+        _[float...]_: the angle limit of every node in degrees
+    """
+    return [DEFAULT_ANGLE_LIMIT]*3 + [DEFAULT_ANGLE_LIMIT*SNAKE_BODY_NODES/bodyNodes]*bodyNodes + [DEFAULT_ANGLE_LIMIT]
+
+
+def buildSnake(useArrayEngine=False, startingPosition=None, speed=SNAKE_SPEED, bodyNodes=SNAKE_BODY_NODES, splineKind=None):
+    """Builds the demo snake
+
+    Args:
+        useArrayEngine (_bool_, optional): build it as an ArrayNodeGroup from spineArrays.py instead of a NodeGroup. Defaults to False.
+        startingPosition (_[int, int]_, optional): the starting position of the head. Defaults to SNAKE_STARTING_POSITION.
+        speed (_float_, optional): the speed of the snake in pixels per second. Defaults to SNAKE_SPEED.
+        bodyNodes (_int_, optional): number of nodes between the head and the tail, see snakeProfile(). Defaults to SNAKE_BODY_NODES.
+        splineKind (_str_, optional): one of SPLINE_KINDS to draw the outline as a smooth curve. Defaults to None.
+
+    Returns:
+        _NodeGroup or ArrayNodeGroup_: the snake
+    """
+    if startingPosition == None:
+        startingPosition = list(SNAKE_STARTING_POSITION)
+    nodeSizes, nodeConstraintRadii = snakeProfile(bodyNodes)
+    angleLimits = snakeAngleLimits(bodyNodes)
+
+    if useArrayEngine:
+        #Imported here so the linked engine can be used without NumPy
+        from spineArrays import ArrayNodeGroup
+        nodeGroup = ArrayNodeGroup(speed, nodeSizes, nodeConstraintRadii, startingPosition, SNAKE_HEAD_DRAW_POINTS, SNAKE_TAIL_DRAW_POINTS, angleLimits)
+    else:
+        nodeGroup = NodeGroup.fromProfile(speed, nodeSizes, nodeConstraintRadii, startingPosition, SNAKE_HEAD_DRAW_POINTS, SNAKE_TAIL_DRAW_POINTS, angleLimits)
+    nodeGroup.splineKind = splineKind
+    return nodeGroup
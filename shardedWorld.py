@@ -0,0 +1,174 @@
+#This file contains a multi process version of World.step() for large populations. The node arrays of a World are moved into shared
+#memory and its creatures are split into one shard per worker process. Every step, each worker advances its own columns of the arrays in
+#place, and the main process draws straight from the same arrays, so positions are never copied between processes
+
+
+
+
+import os
+import types
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+from proceduralSpine import SIMULATION_STEP
+from spineArrays import _stepSpines, _updateLinks
+
+#World arrays that are moved into shared memory. All of them are node-major, with one column per creature (speeds is one row)
+SHARED_ARRAYS = ["xs", "ys", "headingXs", "headingYs", "sizes", "constraintRadii", "angleLimitCos", "angleLimitSin", "speeds", "leftXs", "leftYs", "rightXs", "rightYs"]
+
+
+
+class ShardedWorld:
+    """
+    Steps the creatures of a World across several worker processes. The World's arrays are replaced by views into shared memory, so it
+    can still be drawn, queried and have its desiredPoints and angle limits changed as usual, but creatures can't be added while it
+    is sharded. close() copies the arrays back out of shared memory and stops the workers
+    """
+    def __init__(self, world, workerCount=None):
+        """
+        Args:
+            world (_World_): the creatures to simulate
+            workerCount (_int_, optional): number of worker processes. Defaults to one per CPU core.
+        """
+        if world._pending:
+            world._pack()
+        if world.creatureCount == 0:
+            raise ValueError("a ShardedWorld needs at least one creature")
+        if workerCount == None:
+            workerCount = os.cpu_count() or 1
+        workerCount = max(1, min(workerCount, world.creatureCount))
+
+        self.world = world
+        self._blocks = []
+        self._workers = []
+        self._connections = []
+
+        sharedNames = {}
+        for name in SHARED_ARRAYS:
+            array = self._share(getattr(world, name))
+            setattr(world, name, array)
+            sharedNames[name] = (self._blocks[-1].name, array.shape)
+        self._desired = self._share(world.desiredPoints[world._creatureInSlot])
+        sharedNames["desired"] = (self._blocks[-1].name, self._desired.shape)
+
+        #Shards are split so each one has about the same number of nodes rather than the same number of creatures
+        nodeCounts = world._nodeCounts[world._creatureInSlot]
+        totalNodes = np.cumsum(nodeCounts)
+        bounds = [0] + [int(np.searchsorted(totalNodes, totalNodes[-1]*i/workerCount)) + 1 for i in range(1, workerCount)] + [world.creatureCount]
+        self.shards = [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+        """The (first column, last column + 1) of each worker's shard
+        """
+
+        context = multiprocessing.get_context()
+        for start, end in self.shards:
+            activeInRow = [min(max(active - start, 0), end - start) for active in world._activeInRow]
+            connection, workerConnection = context.Pipe()
+            worker = context.Process(target=_runShard, args=(workerConnection, sharedNames, start, end, activeInRow), daemon=True)
+            worker.start()
+            self._workers.append(worker)
+            self._connections.append(connection)
+
+
+    def _share(self, array):
+        """Copies an array into a new block of shared memory
+
+        Returns:
+            _numpy.ndarray_: the copy, backed by the shared memory
+        """
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self._blocks.append(block)
+        shared = np.ndarray(array.shape, dtype=np.float64, buffer=block.buf)
+        shared[...] = array
+        return shared
+
+
+    @property
+    def creatureCount(self):
+        return self.world.creatureCount
+
+    @property
+    def desiredPoints(self):
+        return self.world.desiredPoints
+
+
+    def step(self, dt=SIMULATION_STEP):
+        """Advances every creature one step towards its own desired point, the same as World.step(). Returns once every worker is done
+
+        Args:
+            dt (_float_, optional): length of the step in seconds. Defaults to SIMULATION_STEP.
+        """
+        if self._connections == []:
+            raise ValueError("the ShardedWorld has been closed")
+        if self.world._pending:
+            raise ValueError("creatures can't be added to a World while it is sharded")
+        np.take(self.world.desiredPoints, self.world._creatureInSlot, axis=0, out=self._desired)
+        for connection in self._connections:
+            connection.send(dt)
+        for connection in self._connections:
+            connection.recv()
+
+
+    def draw(self, surface):
+        """Draws every creature straight from the shared arrays
+        """
+        self.world.draw(surface)
+
+
+    def close(self):
+        """Stops the workers and gives the World ordinary copies of its arrays back
+        """
+        for connection in self._connections:
+            connection.send(None)
+        for worker in self._workers:
+            worker.join()
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+        self._workers = []
+
+        for name in SHARED_ARRAYS:
+            setattr(self.world, name, getattr(self.world, name).copy())
+        self._desired = None
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+
+
+
+def _runShard(connection, sharedNames, start, end, activeInRow):
+    """Worker process loop. Attaches to the shared arrays and steps columns start to end every time a step length arrives, until None
+    arrives instead
+    """
+    blocks = []
+    spines = types.SimpleNamespace()
+    for name, (blockName, shape) in sharedNames.items():
+        block = shared_memory.SharedMemory(name=blockName)
+        blocks.append(block)
+        array = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+        #desiredPoints are stored one row per column, every other array has one column per creature
+        setattr(spines, name, array[start:end] if name == "desired" else array[..., start:end])
+
+    try:
+        while True:
+            dt = connection.recv()
+            if dt == None:
+                break
+            _stepSpines(spines, spines.desired, activeInRow, dt)
+            _updateLinks(spines)
+            connection.send(True)
+    finally:
+        #The views have to be released before the shared memory they look into can be closed
+        spines = None
+        array = None
+        for block in blocks:
+            block.close()
@@ -0,0 +1,173 @@
+#This file contains the pipelined simulate/render mode used by pygameConversion.py. The creature is simulated on a worker thread one
+#frame ahead of the renderer: while frame N is being rasterized and flipped on the main thread, frame N+1 is being simulated. pygame
+#releases the GIL for much of its drawing and display work, so the two stages overlap on machines with more than one core.
+#The worker writes its results into one of two render state buffers while the renderer reads the other, so the renderer always
+#draws a complete snapshot. The cost is one frame of extra latency between input and what is drawn.
+#If the node group has a profiler, the worker times its phases on a profiler of its own, which is added to the main one each time the
+#renderer waits for the worker
+
+
+
+
+import queue
+import threading
+
+from frameProfiler import FrameProfiler
+
+
+
+class SimulationPipeline:
+    """
+    Runs the simulation steps of a NodeGroup or ArrayNodeGroup on a worker thread and draws the results from double buffered render
+    states. Each frame, call submit() with that frame's desired point and steps, then draw(). The node group must not be touched by
+    anything else between submit() and the next submit()
+    """
+    def __init__(self, nodeGroup):
+        """
+        Args:
+            nodeGroup (_NodeGroup or ArrayNodeGroup_): the creature to simulate
+        """
+        self.nodeGroup = nodeGroup
+        self._profiler = None
+        if nodeGroup.profiler != None:
+            self._profiler = _PipelineProfiler(nodeGroup.profiler)
+            nodeGroup.profiler = self._profiler
+
+        #Each buffer holds [state before the last step, state after the last step, alpha to draw the pair with, outline points to draw]
+        self._buffers = [[None, nodeGroup.captureRenderState(), 1, nodeGroup.getLodIndexes()], [None, None, 1, None]]
+        self._front = 0
+        self._working = False
+        self._drawLive = False
+
+        self._jobs = queue.Queue(maxsize=1)
+        self._results = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        if self._profiler != None:
+            self._profiler.workerThread = self._thread
+        self._thread.start()
+
+
+    def _run(self):
+        """Worker thread loop. Runs each submitted job and reports when it is done, until None is submitted
+        """
+        while True:
+            job = self._jobs.get()
+            if job == None:
+                return
+            steps, dt, buffer = job
+            try:
+                for step in range(steps):
+                    #Only the state before the final step is needed to blend between the last two simulated states
+                    if step == steps - 1:
+                        buffer[0] = self.nodeGroup.captureRenderState(buffer[0])
+                    self.nodeGroup.updateNodePositions(dt)
+                buffer[1] = self.nodeGroup.captureRenderState(buffer[1])
+                buffer[3] = self.nodeGroup.getLodIndexes()
+            except BaseException as error:
+                self._results.put(error)
+            else:
+                self._results.put(None)
+
+
+    def wait(self):
+        """Waits for the job submitted last frame to finish and makes its results the ones drawn. Afterwards the worker is idle and
+        the node group can be used directly
+        """
+        if not self._working:
+            return
+        error = self._results.get()
+        self._working = False
+        self._front = 1 - self._front
+        if self._profiler != None:
+            self._profiler.mainProfiler.addFrame(self._profiler.workerProfiler)
+        if error != None:
+            raise error
+
+
+    def submit(self, desiredPoint, steps, dt, alpha=1):
+        """Starts simulating the next frame on the worker thread. The results of the previous submit() become the ones drawn
+
+        Args:
+            desiredPoint (_(float, float)_): the point the creature moves towards
+            steps (_int_): number of simulation steps to run
+            dt (_float_): length of each step in seconds
+            alpha (_float_, optional): how far between the last two simulated states to draw, see FixedTimestep.alpha. Defaults to 1.
+        """
+        self.wait()
+        self.nodeGroup.desiredPoint = desiredPoint
+        self.nodeGroup.updateHeadNode()
+
+        #A settled creature with an unchanged desired point has nothing to simulate, so it is drawn directly and can use its render cache
+        self._drawLive = self.nodeGroup.settled
+        if self._drawLive:
+            return
+        if steps == 0:
+            self._buffers[self._front][2] = alpha
+            return
+
+        buffer = self._buffers[1 - self._front]
+        buffer[2] = alpha
+        self._working = True
+        self._jobs.put((steps, dt, buffer))
+
+
+    def draw(self, surface):
+        """Draws the latest finished render state
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the creature on
+
+        Returns:
+            _pygame.Rect_: the area drawn over
+        """
+        if self._drawLive:
+            self.nodeGroup.draw(surface)
+            return self.nodeGroup.getDrawBounds()
+
+        previousState, state, alpha, lodIndexes = self._buffers[self._front]
+        if previousState != None and len(previousState[0]) != len(state[0]):
+            previousState = None
+        return self.nodeGroup.drawRenderState(surface, state, previousState, alpha, lodIndexes)
+
+
+    def close(self):
+        """Finishes the current job and stops the worker thread
+        """
+        self.wait()
+        self._jobs.put(None)
+        self._thread.join()
+        if self._profiler != None:
+            self.nodeGroup.profiler = self._profiler.mainProfiler
+            self._profiler = None
+
+
+
+
+class _PipelineProfiler:
+    """
+    Stands in for a node group's profiler while it is run by a SimulationPipeline. The main thread's drawing is timed on the node
+    group's own profiler as before, while the worker thread's simulation is timed on a separate one. The main profiler's current frame
+    is whichever frame the renderer has open, so timing the worker on it would put the times in the wrong frame and race with
+    beginFrame() and endFrame()
+    """
+    def __init__(self, mainProfiler):
+        self.mainProfiler = mainProfiler
+        self.workerProfiler = FrameProfiler(windowSize=1, maxTraceFrames=1)
+        self.workerProfiler.clock = mainProfiler.clock
+        self.workerProfiler.beginFrame()
+        self.workerThread = None
+        self.clock = mainProfiler.clock
+
+
+    def _current(self):
+        if threading.current_thread() is self.workerThread:
+            return self.workerProfiler
+        return self.mainProfiler
+
+
+    def section(self, name):
+        return self._current().section(name)
+
+
+    def addTime(self, name, seconds):
+        self._current().addTime(name, seconds)
@@ -0,0 +1,1107 @@
+#This file contains an array backed version of the NodeGroup spine from proceduralSpine.py
+#Instead of a linked chain of Node objects, every segment of a creature is a row in a handful of contiguous NumPy arrays.
+#The positions, sizes and constraint radii of the whole creature live side by side, so the draw points and the outline
+#can be produced with a few vectorized passes instead of per node method calls
+
+
+
+
+import math
+import numpy as np
+import pygame
+from proceduralSpine import DEFAULT_ANGLE_LIMIT, SETTLE_EPSILON, SETTLE_THRESHOLD, SIMULATION_STEP, LOD_SIZE, LOD_TOLERANCE, LOD_EYE_SIZE, LOD_STROKE_SIZE
+from proceduralSpine import eyeBounds, lodStride, lodTailStride, lodSizeProfile, lodOutlineIndexes, splineBasis, SPLINE_RESOLUTION
+from frameProfiler import section
+
+
+class ArrayNodeGroup:
+    """
+    A creature spine whose node data is stored in NumPy arrays rather than a chain of Node objects.
+    Row 0 of every array is the head node and the final row is the tail node. Node i is constrained to the
+    constraint circle of node i-1, exactly like the linked NodeGroup.
+    """
+    def __init__(self, speed, sizes, constraintRadii, startingPosition, headDrawAngles=None, tailDrawAngles=None, angleLimits=DEFAULT_ANGLE_LIMIT):
+        """Builds the whole spine in one go from per node sizes and constraint radii
+
+        Args:
+            speed (_float_): the speed of the snake in pixels per second. 60 is slow, 300 is fast
+            sizes (_[float, float...]_): the visual size of every node, starting with the head
+            constraintRadii (_[float, float...]_): the constraint radius of every node, starting with the head. The
+            radius of node i is the distance node i+1 is kept at
+            startingPosition (_[int, int]_): the starting position of the head
+            headDrawAngles (_[int, int...]_, optional): Extra points to draw the animal polygon on the head. 0 is the front of the head, +ve angles
+            are the left side of the head, & -ve angles are the right side of the head. Defaults to None.
+            tailDrawAngles (_[int, int...]_, optional): Extra points to draw on the tail, in ascending order and all POSITIVE. Defaults to None.
+            angleLimits (_float or [float, float...]_, optional): maximum bend in degrees between each node and the node in front of it,
+            either one value for every node or one per node. Defaults to DEFAULT_ANGLE_LIMIT.
+        """
+        if len(sizes) != len(constraintRadii):
+            raise ValueError("sizes and constraintRadii must have the same length")
+        if len(sizes) < 2:
+            raise ValueError("an ArrayNodeGroup needs at least a head and a tail node")
+
+        self.speed = speed
+
+        self.desiredPoint = [0,0]
+        """The point the snake will move towards
+        """
+        self.headDesiredPoint = [0,0]
+        self.startingPosition = startingPosition
+        nodeCount = len(sizes)
+
+        self.profiler = None
+        """An optional FrameProfiler that the phases of updating and drawing the group are timed on
+        """
+
+        self.settled = False
+        """True while the creature is resting on its desired point. updateNodePositions() does nothing until the desired point changes
+        """
+        self.settleEpsilon = SETTLE_EPSILON
+        self.settleThreshold = SETTLE_THRESHOLD
+        self._settledTarget = None
+        self._renderCache = None
+
+        self.lodSize = LOD_SIZE
+        self.lodTolerance = LOD_TOLERANCE
+        """How far in pixels the simplified outline of a small creature may stray from the full one. 0 always draws the full outline
+        """
+
+        self.splineKind = None
+        """One of SPLINE_KINDS to draw the outline as a smooth curve, or None to join the outline points with straight edges
+        """
+        self.splineResolution = SPLINE_RESOLUTION
+        self._tailDrawAngles = tailDrawAngles
+
+        self.headDrawBasis = _angleBasis(headDrawAngles)
+        self.tailDrawBasis = _angleBasis(tailDrawAngles)
+        self.headExtraPoints = np.empty((len(self.headDrawBasis), 2), dtype=np.float64)
+        self.tailExtraPoints = np.empty((len(self.tailDrawBasis), 2), dtype=np.float64)
+
+        #The node arrays are views into larger buffers so nodes can be added and removed without reallocating every time
+        self._capacity = 0
+        self._reserve(nodeCount)
+        self._setTotalNodes(nodeCount)
+
+        self.sizes[:] = sizes
+        self.constraintRadii[:] = constraintRadii
+
+        #Nodes are laid out in a line going left from the starting position, 40 pixels apart
+        self.positions[:, 0] = startingPosition[0] - 40*np.arange(nodeCount)
+        self.positions[:, 1] = startingPosition[1]
+
+        #Unit vector from each node towards the node in front of it (towards the desired point for the head)
+        self.headings[:, 0] = 1
+        self.headings[:, 1] = 0
+
+        self.setAngleLimit(angleLimits)
+
+        self.updateDrawPoints()
+
+
+    def _reserve(self, capacity):
+        """Makes sure the node buffers can hold at least capacity nodes. The buffers grow by doubling so adding nodes one at a
+        time is amortized O(1)
+        """
+        if capacity <= self._capacity:
+            return
+        capacity = max(capacity, 2*self._capacity)
+        nodeCount = self.totalNodes if self._capacity else 0
+
+        buffers = {}
+        for name, columns in (("positions", 2), ("headings", 2), ("leftLinks", 2), ("rightLinks", 2), ("sizes", 0), ("constraintRadii", 0), ("angleLimitCos", 0), ("angleLimitSin", 0)):
+            shape = (capacity, columns) if columns else (capacity,)
+            buffer = np.zeros(shape, dtype=np.float64)
+            if nodeCount:
+                buffer[:nodeCount] = getattr(self, name)
+            buffers[name] = buffer
+        self._buffers = buffers
+
+        #The polygon outline is written into this buffer every frame rather than being rebuilt from lists
+        self._outlineBuffer = np.empty((len(self.headExtraPoints) + 2*capacity + len(self.tailExtraPoints), 2), dtype=np.float64)
+        self._capacity = capacity
+        if nodeCount:
+            self._setTotalNodes(nodeCount)
+
+
+    def _setTotalNodes(self, nodeCount):
+        """Points the public node arrays at the first nodeCount rows of the buffers
+        """
+        self.totalNodes = nodeCount
+        self._lodProfile = None
+        for name, buffer in self._buffers.items():
+            setattr(self, name, buffer[:nodeCount])
+        self.outline = self._outlineBuffer[:len(self.headExtraPoints) + 2*(nodeCount - 1) + len(self.tailExtraPoints)]
+
+
+    def insertNodeBeforeTail(self, constraintRadius, size, angleLimit=DEFAULT_ANGLE_LIMIT):
+        """Grows the creature by adding a body node between the tail and the node in front of it. The new node starts halfway
+        between them and the tail gets pushed back onto the new node's constraint circle the next time the positions are updated
+
+        Args:
+            constraintRadius (_float_): constraint radius of the new node
+            size (_float_): visual size of the new node
+            angleLimit (_float_, optional): maximum bend in degrees between the new node and the node in front of it. Defaults to DEFAULT_ANGLE_LIMIT.
+        """
+        self._reserve(self.totalNodes + 1)
+        newNode = self.totalNodes - 1
+        self._setTotalNodes(self.totalNodes + 1)
+
+        #Only the old tail row moves, everything in front of it stays where it is
+        for name in self._buffers:
+            array = getattr(self, name)
+            array[newNode + 1] = array[newNode]
+
+        self.positions[newNode] = (self.positions[newNode - 1] + self.positions[newNode + 1])/2
+        self.sizes[newNode] = size
+        self.constraintRadii[newNode] = constraintRadius
+        self.setAngleLimit(angleLimit, newNode)
+        self._updateLinks(newNode)
+
+
+    def removeTailNode(self):
+        """Removes the last node, e.g. when the creature loses its tail. The node in front of it becomes the tail and takes over
+        the tail draw points
+        """
+        if self.totalNodes <= 2:
+            raise ValueError("an ArrayNodeGroup needs at least a head and a tail node")
+        self._setTotalNodes(self.totalNodes - 1)
+        if len(self.tailExtraPoints):
+            _pointsAtAngles(self.positions[-1], self.headings[-1], self.sizes[-1], self.tailDrawBasis, self.tailExtraPoints)
+        self.wake()
+
+
+    def _updateLinks(self, node):
+        """Updates the left and right links of a single node, see updateDrawPoints()
+        """
+        offsetX = self.sizes[node]*self.headings[node, 1]
+        offsetY = self.sizes[node]*self.headings[node, 0]
+        self.leftLinks[node] = (self.positions[node, 0] + offsetX, self.positions[node, 1] - offsetY)
+        self.rightLinks[node] = (self.positions[node, 0] - offsetX, self.positions[node, 1] + offsetY)
+
+
+    def updateHeadNode(self):
+        """Updates the point that the head node moves towards
+        """
+        if self.settled and (self.desiredPoint[0] != self._settledTarget[0] or self.desiredPoint[1] != self._settledTarget[1]):
+            self.wake()
+        self.headDesiredPoint = self.desiredPoint
+
+
+    def setAngleLimit(self, angleDeg, node=None):
+        """Sets the maximum bend between nodes and the node in front of them. The cos and sin of the limits are precomputed so
+        the constraint never needs trig while the creature is moving
+
+        Args:
+            angleDeg (_float or [float, float...]_): the limit in degrees, either one value or one per node
+            node (_int or slice_, optional): the node(s) to set the limit on. Defaults to every node.
+        """
+        if node is None:
+            node = slice(None)
+        radians = np.radians(angleDeg)
+        self.angleLimitCos[node] = np.cos(radians)
+        self.angleLimitSin[node] = np.sin(radians)
+        self.wake()
+
+
+    def setNodeSize(self, node, size):
+        """Resizes nodes, the same way as NodeGroup.setNodeSize()
+
+        Args:
+            node (_int or slice_): the node(s) to resize, 0 being the head
+            size (_float or [float, float...]_): the new visual size, either one value or one per node
+        """
+        self.sizes[node] = size
+        self._lodProfile = None
+        self.wake()
+
+
+    def wake(self):
+        """Makes a settled group update again on the next updateNodePositions(), e.g. after its spine has been changed
+        """
+        self.settled = False
+        self._renderCache = None
+
+
+    def getNodePositions(self):
+        """Returns:
+            _numpy.ndarray_: the (n, 2) position of every node, head first. This is the group's own array and must not be modified
+        """
+        return self.positions
+
+
+    def setNodePositions(self, positions):
+        """Moves every node straight to a new position without simulating anything, e.g. to load a recorded frame. The headings and
+        draw points are worked out from the new positions
+
+        Args:
+            positions (_[[float, float]...]_): the new position of every node, head first
+        """
+        self.positions[:] = positions
+
+        #Each node faces the node in front of it and the head faces the desired point. Nodes sitting on that point keep their heading
+        toFront = np.empty_like(self.positions)
+        toFront[0] = (self.headDesiredPoint[0] - self.positions[0, 0], self.headDesiredPoint[1] - self.positions[0, 1])
+        np.subtract(self.positions[:-1], self.positions[1:], out=toFront[1:])
+        distance = np.hypot(toFront[:, 0], toFront[:, 1])[:, np.newaxis]
+        np.divide(toFront, distance, out=self.headings, where=distance > 0)
+
+        self.updateDrawPoints()
+        self.wake()
+
+
+    def updateNodePositions(self, dt=SIMULATION_STEP):
+        """Updates the position of each node in the group, and ensures all nodes are within the angle flexibility threshold.
+
+        Every node depends on the freshly moved node in front of it, so the follow and angle constraint pass walks the spine once
+        using plain floats pulled out of the arrays. The draw points are then produced from the arrays in a single vectorized pass.
+
+        Once the head reaches the desired point the group watches how far its nodes move, and when they have stopped it is marked
+        as settled and this does nothing until the desired point changes
+
+        Args:
+            dt (_float_, optional): length of the step in seconds. The head moves speed*dt pixels. Defaults to SIMULATION_STEP.
+        """
+        if self.settled:
+            if self.desiredPoint[0] == self._settledTarget[0] and self.desiredPoint[1] == self._settledTarget[1]:
+                return
+            self.wake()
+
+        with section(self.profiler, "head move"):
+            headStep, distanceLeft = self.moveHeadNode(dt)
+
+        #Node movement is only measured once the head has arrived, so moving creatures don't pay for it
+        watchSettling = distanceLeft <= self.settleEpsilon
+        with section(self.profiler, "follow pass"):
+            maxMovement = self.followHeadNode(watchSettling)
+        with section(self.profiler, "updateDrawPoints"):
+            self.updateDrawPoints()
+
+        if watchSettling and max(maxMovement, headStep) <= self.settleThreshold:
+            self.settled = True
+            self._settledTarget = (self.desiredPoint[0], self.desiredPoint[1])
+
+
+    def moveHeadNode(self, dt=SIMULATION_STEP):
+        """Moves the head node speed*dt pixels towards the desired point. The head stops on the desired point rather than overshooting
+        it and jittering back and forth around it
+
+        Args:
+            dt (_float_, optional): length of the step in seconds. Defaults to SIMULATION_STEP.
+
+        Returns:
+            _(float, float)_: how far the head moved, and how far it still is from the desired point
+        """
+        headX, headY = self.positions[0]
+        toDesiredX = self.desiredPoint[0] - headX
+        toDesiredY = self.desiredPoint[1] - headY
+        distance = math.hypot(toDesiredX, toDesiredY)
+        headStep = min(self.speed*dt, distance)
+        if distance > 0:
+            self.positions[0] = (headX + toDesiredX/distance*headStep, headY + toDesiredY/distance*headStep)
+        return headStep, distance - headStep
+
+
+    def followHeadNode(self, watchSettling=False):
+        """Moves every node after the head onto the constraint circle of the node in front of it and keeps it within its angle
+        limit. The follow and the angle constraint are done in the same pass, so they are timed together
+
+        Args:
+            watchSettling (_bool_, optional): also measure how far the nodes moved. Defaults to False.
+
+        Returns:
+            _float_: the furthest any node moved along x or y, if watchSettling is set. Otherwise 0
+        """
+        positions = self.positions
+        desiredX, desiredY = self.headDesiredPoint
+
+        xs = positions[:, 0].tolist()
+        ys = positions[:, 1].tolist()
+        radii = self.constraintRadii.tolist()
+        headX = xs[0]
+        headY = ys[0]
+
+        #The head faces the desired point. If it is sitting on the desired point it keeps its previous heading
+        prevHeadingX, prevHeadingY = self.headings[0]
+        toDesiredX = desiredX - headX
+        toDesiredY = desiredY - headY
+        distance = math.hypot(toDesiredX, toDesiredY)
+        if distance > 0:
+            prevHeadingX = toDesiredX/distance
+            prevHeadingY = toDesiredY/distance
+
+        headingXs = [prevHeadingX]
+        headingYs = [prevHeadingY]
+
+        limitCosines = self.angleLimitCos.tolist()
+        limitSines = self.angleLimitSin.tolist()
+
+        for i in range(1, self.totalNodes):
+            prevX = xs[i - 1]
+            prevY = ys[i - 1]
+            dx = prevX - xs[i]
+            dy = prevY - ys[i]
+            distance = math.hypot(dx, dy)
+            if distance > 0:
+                headingX = dx/distance
+                headingY = dy/distance
+            else:
+                headingX = prevHeadingX
+                headingY = prevHeadingY
+
+            #If the node bends further than the limit relative to the node in front of it, it is moved onto whichever edge of the
+            #allowed cone is closest to where it currently is. Comparing dot products avoids converting anything to angles
+            limitCos = limitCosines[i]
+            if headingX*prevHeadingX + headingY*prevHeadingY < limitCos:
+                limitSin = limitSines[i]
+                leftX = prevHeadingX*limitCos + prevHeadingY*limitSin
+                leftY = prevHeadingY*limitCos - prevHeadingX*limitSin
+                rightX = prevHeadingX*limitCos - prevHeadingY*limitSin
+                rightY = prevHeadingY*limitCos + prevHeadingX*limitSin
+                if headingX*leftX + headingY*leftY > headingX*rightX + headingY*rightY:
+                    headingX = leftX
+                    headingY = leftY
+                else:
+                    headingX = rightX
+                    headingY = rightY
+
+            radius = radii[i - 1]
+            xs[i] = prevX - headingX*radius
+            ys[i] = prevY - headingY*radius
+            headingXs.append(headingX)
+            headingYs.append(headingY)
+            prevHeadingX = headingX
+            prevHeadingY = headingY
+
+        maxMovement = 0
+        if watchSettling:
+            maxMovement = max(np.abs(positions[1:, 0] - xs[1:]).max(), np.abs(positions[1:, 1] - ys[1:]).max())
+
+        positions[:, 0] = xs
+        positions[:, 1] = ys
+        self.headings[:, 0] = headingXs
+        self.headings[:, 1] = headingYs
+        return float(maxMovement)
+
+
+    def updateDrawPoints(self):
+        """Updates the points along every node that are used to render the creature. The left and right links are the points
+        at +90 and -90 degrees from the front of each node, found by scaling the perpendicular of the heading by the node size.
+        This runs after the nodes have moved, whereas NodeGroup updates each node's draw points just before moving it. The outline
+        has the same points in the same order as NodeGroup's, but it is drawn one step fresher, so the two engines' pixels differ slightly
+        """
+        headings = self.headings
+        sizes = self.sizes[:, np.newaxis]
+
+        #Rotating the heading 90 degrees to the left (screen y points down)
+        np.multiply(headings[:, ::-1], sizes, out=self.leftLinks)
+        self.leftLinks[:, 1] *= -1
+        np.subtract(self.positions, self.leftLinks, out=self.rightLinks)
+        self.leftLinks += self.positions
+
+        if len(self.headExtraPoints):
+            _pointsAtAngles(self.positions[0], headings[0], self.sizes[0], self.headDrawBasis, self.headExtraPoints)
+        if len(self.tailExtraPoints):
+            _pointsAtAngles(self.positions[-1], headings[-1], self.sizes[-1], self.tailDrawBasis, self.tailExtraPoints)
+
+
+    def buildOutline(self):
+        """Writes the polygon outline into the preallocated outline buffer. The outline starts with the head points, goes down the
+        left side, around the tail points and back up the right side
+
+        Returns:
+            _numpy.ndarray_: the (n, 2) outline buffer
+        """
+        headCount = len(self.headExtraPoints)
+        tailCount = len(self.tailExtraPoints)
+        #The tail node's own links are covered by its tail points, so like NodeGroup they are left out
+        linkCount = self.totalNodes - 1
+        outline = self.outline
+
+        outline[:headCount] = self.headExtraPoints
+        outline[headCount:headCount + linkCount] = self.leftLinks[:linkCount]
+        outline[headCount + linkCount:headCount + linkCount + tailCount] = self.tailExtraPoints
+        outline[headCount + linkCount + tailCount:] = self.rightLinks[:linkCount][::-1]
+        return outline
+
+
+    def getOutlineBounds(self, margin=3):
+        """Finds the screen area the creature covers when it is drawn
+
+        Args:
+            margin (_int_, optional): extra pixels added on every side, to cover the outline stroke. Defaults to 3.
+
+        Returns:
+            _pygame.Rect_: the bounding box of the outline polygon
+        """
+        outline = self.buildOutline()
+        #A Catmull-Rom curve can bulge slightly past the points it passes through, a B-spline stays within them
+        if self.splineKind == "catmull-rom":
+            outline = _smoothOutline(outline, self.splineKind, self.splineResolution)
+        left, top = np.floor(outline.min(axis=0)).astype(int) - margin
+        right, bottom = np.ceil(outline.max(axis=0)).astype(int) + margin
+        return pygame.Rect(int(left), int(top), int(right - left) + 1, int(bottom - top) + 1)
+
+
+    def getDrawBounds(self, margin=3):
+        """Finds the screen area the creature covers when it is drawn, eyes included, the same way as NodeGroup.getDrawBounds()
+
+        Args:
+            margin (_int_, optional): extra pixels added around the outline, to cover the outline stroke. Defaults to 3.
+
+        Returns:
+            _pygame.Rect_: the bounding box of the outline polygon and the eyes
+        """
+        bounds = self.getOutlineBounds(margin)
+        if self.sizes[0] >= LOD_EYE_SIZE:
+            for eye in self.getEyePositions():
+                bounds.union_ip(eyeBounds(eye))
+        return bounds
+
+
+    def draw(self, surface):
+        """Draws the creature's body and eyes. While the group is settled nothing about it changes, so the body is rasterized once
+        into an offscreen surface and later frames only blit that. The cached surface is dropped as soon as the group moves again, and
+        redrawn if the spline or level of detail settings change
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the creature on
+        """
+        if not self.settled:
+            self.connectTheDots(surface)
+            self.drawEyes(surface)
+            return
+
+        drawSettings = (self.splineKind, self.splineResolution, self.lodSize, self.lodTolerance)
+        if self._renderCache is None or self._renderCache[2] != drawSettings:
+            bounds = self.getDrawBounds()
+            sprite = pygame.Surface(bounds.size, pygame.SRCALPHA)
+            self.connectTheDots(sprite, bounds.topleft)
+            self.drawEyes(sprite, bounds.topleft)
+            #Most of the sprite is transparent. Run length encoding lets blits skip those pixels instead of blending every one of them
+            sprite.set_alpha(255, pygame.RLEACCEL)
+            self._renderCache = (sprite, bounds.topleft, drawSettings)
+
+        with section(self.profiler, "blit render cache"):
+            surface.blit(self._renderCache[0], self._renderCache[1])
+
+
+    def captureRenderState(self, state=None):
+        """Copies the points the creature is drawn with, the same way as NodeGroup.captureRenderState()
+
+        Args:
+            state (_tuple_, optional): an earlier state to overwrite instead of allocating a new one, if its outline is the same size. Defaults to None.
+
+        Returns:
+            _(numpy.ndarray, numpy.ndarray)_: copies of the outline and the eye positions
+        """
+        outline = self.buildOutline()
+        if state is None or state[0].shape != outline.shape:
+            return outline.copy(), self.getEyePositions()
+        np.copyto(state[0], outline)
+        return state[0], self.getEyePositions()
+
+
+    def drawInterpolated(self, surface, previousState, alpha):
+        """Draws the creature part way between an earlier render state and its current one, the same way as NodeGroup.drawInterpolated()
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the creature on
+            previousState (_tuple or None_): the state returned by captureRenderState() before the latest simulation step
+            alpha (_float_): how far to draw the creature from previousState (0) to its current state (1)
+
+        Returns:
+            _pygame.Rect_: the area drawn over
+        """
+        outline = self.buildOutline()
+        if previousState is None or self.settled or alpha >= 1 or len(previousState[0]) != len(outline):
+            self.draw(surface)
+            return self.getDrawBounds()
+        return self.drawRenderState(surface, (outline, self.getEyePositions()), previousState, alpha, self.getLodIndexes())
+
+
+    def drawRenderState(self, surface, state, previousState=None, alpha=1, lodIndexes=None):
+        """Draws the creature from a captured render state rather than from its arrays, the same way as NodeGroup.drawRenderState()
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the creature on
+            state (_tuple_): the state to draw, from captureRenderState()
+            previousState (_tuple or None_, optional): an earlier state of the same size to blend from. Defaults to None.
+            alpha (_float_, optional): how far to draw the creature from previousState (0) to state (1). Defaults to 1.
+            lodIndexes (_[int, int...] or None_, optional): only draw these outline points, see getLodIndexes(). Defaults to None.
+
+        Returns:
+            _pygame.Rect_: the area drawn over
+        """
+        outline, eyes = state
+        if lodIndexes is not None:
+            outline = outline[lodIndexes]
+            if previousState is not None:
+                previousState = (previousState[0][lodIndexes], previousState[1])
+        if previousState is not None and alpha < 1:
+            with section(self.profiler, "interpolate render state"):
+                outline = previousState[0] + (outline - previousState[0])*alpha
+                eyes = previousState[1] + (eyes - previousState[1])*alpha
+        splineKind = self.splineKind if lodIndexes is None else None
+        return drawOutlinePoints(surface, outline, eyes, self.sizes[0], splineKind, self.splineResolution, self.profiler)
+
+
+    def connectTheDots(self, surface, offset=None):
+        """Draws the creature as a filled polygon with an outline
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the creature on
+            offset (_(int, int)_, optional): screen position of the surface's top left corner, when drawing onto an offscreen surface. Defaults to None.
+        """
+        with section(self.profiler, "connectTheDots polygon build"):
+            outline = self.buildOutline()
+            lodIndexes = self.getLodIndexes()
+            if lodIndexes is not None:
+                outline = outline[lodIndexes]
+            elif self.splineKind is not None:
+                outline = _smoothOutline(outline, self.splineKind, self.splineResolution)
+            if offset is not None:
+                outline = outline - offset
+        with section(self.profiler, "pygame.draw.polygon"):
+            pygame.draw.polygon(surface, (225, 130, 0), outline, 0)
+            if self.sizes[0] >= LOD_STROKE_SIZE:
+                pygame.draw.polygon(surface, (255, 255, 255), outline, 3)
+
+
+    def getLodIndexes(self):
+        """Picks which outline points to draw this frame, the same way as NodeGroup.getLodIndexes(). The bend between nodes comes
+        straight from the headings array
+
+        Returns:
+            _[int, int...] or None_: indexes into buildOutline() of the points to draw, or None to draw all of them
+        """
+        size = self.sizes[0]
+        if size >= self.lodSize or self.lodTolerance <= 0 or self.totalNodes < 3:
+            return None
+
+        #Node sizes only change when nodes are added or removed, so their profile is kept until then
+        if self._lodProfile == None or self._lodProfile[0] != self.lodTolerance:
+            self._lodProfile = (self.lodTolerance,) + lodSizeProfile(self.sizes[:-1].tolist(), self.lodTolerance)
+        tolerance, sizeCurve, keptNodes = self._lodProfile
+
+        #Only the nodes whose links are in the outline count, which is every node but the tail
+        linkCount = self.totalNodes - 1
+        headings = self.headings[:linkCount]
+        minCos = np.einsum("ij,ij->i", headings[1:], headings[:-1]).min()
+        nodeStride = min(lodStride(tolerance, self.constraintRadii[:-1].max(), math.acos(max(-1.0, min(1.0, minCos))), size, sizeCurve), linkCount)
+        tailStride = lodTailStride(tolerance, self._tailDrawAngles, self.sizes[-1])
+        if nodeStride == 1 and tailStride == 1:
+            return None
+        return lodOutlineIndexes(len(self.headExtraPoints), linkCount, len(self.tailExtraPoints), nodeStride, tailStride, keptNodes)
+
+
+    def drawEyes(self, surface, offset=None):
+        """Draws the eyes on the head. Each eye sits halfway between the head's center and the point 50 degrees either side
+        of the front of the head
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the eyes on
+            offset (_(int, int)_, optional): screen position of the surface's top left corner, when drawing onto an offscreen surface. Defaults to None.
+        """
+        if self.sizes[0] < LOD_EYE_SIZE:
+            return
+        with section(self.profiler, "drawEyes"):
+            eyes = self.getEyePositions()
+            if offset is not None:
+                eyes -= offset
+            for eye in eyes:
+                pygame.draw.circle(surface, (255, 255, 255), eye, 10, 0)
+
+
+    def getEyePositions(self):
+        """Finds where the eyes are drawn
+
+        Returns:
+            _numpy.ndarray_: (2, 2) array of the left and right eye positions
+        """
+        eyes = np.empty((2, 2), dtype=np.float64)
+        _pointsAtAngles(self.positions[0], self.headings[0], self.sizes[0]/2, _angleBasis([50, -50]), eyes)
+        return eyes
+
+
+    def drawSegments(self, surface):
+        """Draws the nodes as circles along with their left and right links. Useful for seeing how the nodes function
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the segments on
+        """
+        for i in range(self.totalNodes):
+            pygame.draw.circle(surface, (200, 200, 200), self.positions[i], self.sizes[i], 5)
+            pygame.draw.circle(surface, (0, 200, 0), self.leftLinks[i], 3, 5)
+            pygame.draw.circle(surface, (0, 0, 200), self.rightLinks[i], 3, 5)
+
+
+
+
+def _angleBasis(angles):
+    """Precomputes the cos and sin of a list of angles (degrees) so points can be placed around a node without trig each frame
+
+    Returns:
+        _numpy.ndarray_: a (n, 2) array of [cos, sin] rows
+    """
+    if angles is None:
+        return np.empty((0, 2), dtype=np.float64)
+    radians = np.radians(np.asarray(angles, dtype=np.float64))
+    return np.column_stack((np.cos(radians), np.sin(radians)))
+
+
+def _pointsAtAngles(position, heading, radius, basis, out):
+    """Places points on a circle around a node at angles relative to its heading. Rotating the heading by an angle is done
+    with the precomputed basis, and the y component is flipped because screen y values grow downwards
+    """
+    cosines = basis[:, 0]
+    sines = basis[:, 1]
+    out[:, 0] = position[0] + radius*(heading[0]*cosines + heading[1]*sines)
+    out[:, 1] = position[1] + radius*(heading[1]*cosines - heading[0]*sines)
+
+
+
+#splineBasis() tables as arrays, keyed by (kind, resolution)
+_splineBasisArrays = {}
+
+def _smoothOutline(outline, kind, resolution):
+    """Samples a closed spline through an (n, 2) outline, the same curve as proceduralSpine.smoothOutline(), in one vectorized pass.
+    The four points around every edge are viewed as an (n, 2, 4) window, without copying, and weighted by the whole basis at once
+
+    Returns:
+        _numpy.ndarray_: the (n*resolution, 2) points of the curve
+    """
+    basis = _splineBasisArrays.get((kind, resolution))
+    if basis is None:
+        basis = np.array(splineBasis(kind, resolution), dtype=np.float64)
+        _splineBasisArrays[(kind, resolution)] = basis
+    wrapped = np.concatenate((outline[-1:], outline, outline[:2]))
+    windows = np.lib.stride_tricks.sliding_window_view(wrapped, 4, axis=0)
+    return np.matmul(windows, basis.T).transpose(0, 2, 1).reshape(-1, 2)
+
+
+
+
+def drawOutlinePoints(surface, outline, eyes, headSize, splineKind=None, splineResolution=SPLINE_RESOLUTION, profiler=None):
+    """Draws a creature from its outline and eye points, smoothing the outline first if it has a spline kind. The stroke and eyes are
+    left out below LOD_STROKE_SIZE and LOD_EYE_SIZE. ArrayNodeGroup.drawRenderState() and MotionReplay.draw() both draw through this
+
+    Args:
+        surface (_pygame.Surface_): the surface to draw the creature on
+        outline (_numpy.ndarray_): (n, 2) outline points
+        eyes (_numpy.ndarray_): (2, 2) eye positions
+        headSize (_float_): size of the creature's head node
+        splineKind (_str or None_, optional): one of SPLINE_KINDS to draw the outline as a smooth curve. Defaults to None.
+        splineResolution (_int_, optional): number of curve points per outline edge. Defaults to SPLINE_RESOLUTION.
+        profiler (_FrameProfiler or None_, optional): profiler to time the drawing on. Defaults to None.
+
+    Returns:
+        _pygame.Rect_: the area drawn over
+    """
+    if splineKind is not None:
+        with section(profiler, "smooth outline"):
+            outline = _smoothOutline(outline, splineKind, splineResolution)
+
+    with section(profiler, "pygame.draw.polygon"):
+        drawnRect = pygame.draw.polygon(surface, (225, 130, 0), outline, 0)
+        if headSize >= LOD_STROKE_SIZE:
+            drawnRect.union_ip(pygame.draw.polygon(surface, (255, 255, 255), outline, 3))
+    if headSize >= LOD_EYE_SIZE:
+        with section(profiler, "drawEyes"):
+            for eye in eyes:
+                drawnRect.union_ip(pygame.draw.circle(surface, (255, 255, 255), eye, 10, 0))
+    return drawnRect
+
+
+
+
+def _stepSpines(spines, desired, activeInRow, dt):
+    """Advances the creatures held in a set of World style node-major arrays one step. World.step() runs it over every column and
+    ShardedWorld workers run it over their own slice of the columns
+
+    Args:
+        spines (_World or namespace_): anything with xs, ys, headingXs, headingYs, constraintRadii, angleLimitCos, angleLimitSin and speeds arrays
+        desired (_numpy.ndarray_): (n, 2) desired point of every column
+        activeInRow (_[int, int...]_): number of columns, counted from the first, that have a node in each row
+        dt (_float_): length of the step in seconds
+    """
+    xs, ys = spines.xs, spines.ys
+    headingXs, headingYs = spines.headingXs, spines.headingYs
+
+    #Head nodes move speed*dt pixels towards their desired points, stopping on them rather than overshooting, then face them
+    toDesiredX = desired[:, 0] - xs[0]
+    toDesiredY = desired[:, 1] - ys[0]
+    distance = np.hypot(toDesiredX, toDesiredY)
+    moveScale = np.divide(np.minimum(spines.speeds*dt, distance), distance, out=np.zeros_like(distance), where=distance > 0)
+    xs[0] += toDesiredX*moveScale
+    ys[0] += toDesiredY*moveScale
+
+    toDesiredX = desired[:, 0] - xs[0]
+    toDesiredY = desired[:, 1] - ys[0]
+    distance = np.hypot(toDesiredX, toDesiredY)
+    facing = distance > 0
+    np.divide(toDesiredX, distance, out=headingXs[0], where=facing)
+    np.divide(toDesiredY, distance, out=headingYs[0], where=facing)
+
+    for row in range(1, len(activeInRow)):
+        active = activeInRow[row]
+        if active == 0:
+            break
+        prevX = xs[row - 1, :active]
+        prevY = ys[row - 1, :active]
+        prevHeadingX = headingXs[row - 1, :active]
+        prevHeadingY = headingYs[row - 1, :active]
+
+        dx = prevX - xs[row, :active]
+        dy = prevY - ys[row, :active]
+        distance = np.hypot(dx, dy)
+        np.maximum(distance, 1e-12, out=distance)
+        headingX = dx/distance
+        headingY = dy/distance
+
+        #Nodes that bend past the angle limit are moved onto the closest edge of the allowed cone
+        limitCos = spines.angleLimitCos[row, :active]
+        bent = headingX*prevHeadingX + headingY*prevHeadingY < limitCos
+        if bent.any():
+            limitSin = spines.angleLimitSin[row, :active]
+            leftX = prevHeadingX*limitCos + prevHeadingY*limitSin
+            leftY = prevHeadingY*limitCos - prevHeadingX*limitSin
+            rightX = prevHeadingX*limitCos - prevHeadingY*limitSin
+            rightY = prevHeadingY*limitCos + prevHeadingX*limitSin
+            useLeft = headingX*leftX + headingY*leftY > headingX*rightX + headingY*rightY
+            headingX = np.where(bent, np.where(useLeft, leftX, rightX), headingX)
+            headingY = np.where(bent, np.where(useLeft, leftY, rightY), headingY)
+
+        headingXs[row, :active] = headingX
+        headingYs[row, :active] = headingY
+        radius = spines.constraintRadii[row - 1, :active]
+        xs[row, :active] = prevX - headingX*radius
+        ys[row, :active] = prevY - headingY*radius
+
+
+def _updateLinks(spines):
+    """Writes the left and right links of every node into the leftXs, leftYs, rightXs and rightYs arrays of spines
+    """
+    offsetX = spines.sizes*spines.headingYs
+    offsetY = spines.sizes*spines.headingXs
+    np.add(spines.xs, offsetX, out=spines.leftXs)
+    np.subtract(spines.ys, offsetY, out=spines.leftYs)
+    np.subtract(spines.xs, offsetX, out=spines.rightXs)
+    np.add(spines.ys, offsetY, out=spines.rightYs)
+
+
+
+
+class World:
+    """
+    A population of creatures that are all stepped together. Every creature's nodes are packed into shared padded arrays
+    laid out node-major (row i holds node i of every creature), so a single step walks the rows once and moves node i of
+    every creature with one set of vectorized operations. Creatures are stored longest first, which means the creatures
+    that still have a node at row i are always a contiguous slice at the start of the row.
+    """
+    def __init__(self):
+        self.creatureCount = 0
+
+        self.desiredPoints = np.zeros((0, 2), dtype=np.float64)
+        """The point each creature moves towards, indexed by the id returned from addCreature()
+        """
+        self._pending = []
+        self._nodeCounts = np.zeros(0, dtype=np.intp)
+        self._headDrawBases = []
+        self._tailDrawBases = []
+        self._tailDrawAngles = []
+        self._lodProfiles = []
+        self._outlines = []
+
+        self.lodSize = LOD_SIZE
+        self.lodTolerance = LOD_TOLERANCE
+        """How far in pixels the simplified outlines of small creatures may stray from the full ones. 0 always draws the full outlines
+        """
+
+        self.splineKind = None
+        """One of SPLINE_KINDS to draw every outline as a smooth curve, or None to join the outline points with straight edges
+        """
+        self.splineResolution = SPLINE_RESOLUTION
+
+        #slotOfCreature[id] is the column a creature is stored in, creatureInSlot[column] is the reverse
+        self._slotOfCreature = np.zeros(0, dtype=np.intp)
+        self._creatureInSlot = np.zeros(0, dtype=np.intp)
+        self._activeInRow = []
+
+        self.xs = np.zeros((0, 0), dtype=np.float64)
+        self.ys = np.zeros((0, 0), dtype=np.float64)
+        self.headingXs = np.zeros((0, 0), dtype=np.float64)
+        self.headingYs = np.zeros((0, 0), dtype=np.float64)
+        self.sizes = np.zeros((0, 0), dtype=np.float64)
+        self.constraintRadii = np.zeros((0, 0), dtype=np.float64)
+        self.speeds = np.zeros(0, dtype=np.float64)
+        self.angleLimitCos = np.zeros(0, dtype=np.float64)
+        self.angleLimitSin = np.zeros(0, dtype=np.float64)
+
+
+    def addCreature(self, speed, sizes, constraintRadii, startingPosition, headDrawAngles=None, tailDrawAngles=None, angleLimits=DEFAULT_ANGLE_LIMIT):
+        """Adds a creature to the world. The arguments are the same as ArrayNodeGroup's constructor
+
+        Returns:
+            _int_: the id of the creature, used to index desiredPoints and to look the creature up
+        """
+        if len(sizes) != len(constraintRadii):
+            raise ValueError("sizes and constraintRadii must have the same length")
+        if len(sizes) < 2:
+            raise ValueError("a creature needs at least a head and a tail node")
+
+        nodeCount = len(sizes)
+        positions = np.empty((nodeCount, 2), dtype=np.float64)
+        positions[:, 0] = startingPosition[0] - 40*np.arange(nodeCount)
+        positions[:, 1] = startingPosition[1]
+
+        limits = np.radians(np.broadcast_to(np.asarray(angleLimits, dtype=np.float64), (nodeCount,)))
+
+        self._pending.append((self.creatureCount, speed, np.asarray(sizes, dtype=np.float64), np.asarray(constraintRadii, dtype=np.float64), positions, np.cos(limits), np.sin(limits)))
+        self._headDrawBases.append(_angleBasis(headDrawAngles))
+        self._tailDrawBases.append(_angleBasis(tailDrawAngles))
+        self._tailDrawAngles.append(tailDrawAngles)
+        self._lodProfiles.append(None)
+        self._outlines.append(np.empty((len(self._headDrawBases[-1]) + 2*(nodeCount - 1) + len(self._tailDrawBases[-1]), 2), dtype=np.float64))
+        self._nodeCounts = np.append(self._nodeCounts, nodeCount)
+        self.desiredPoints = np.append(self.desiredPoints, [startingPosition], axis=0)
+
+        self.creatureCount += 1
+        return self.creatureCount - 1
+
+
+    def _pack(self):
+        """Rebuilds the shared arrays so they include any newly added creatures. Existing creatures keep their current state
+        """
+        creatureCount = self.creatureCount
+        order = np.argsort(-self._nodeCounts, kind="stable")
+        slotOfCreature = np.empty(creatureCount, dtype=np.intp)
+        slotOfCreature[order] = np.arange(creatureCount)
+        rowCount = int(self._nodeCounts.max())
+
+        xs = np.zeros((rowCount, creatureCount), dtype=np.float64)
+        ys = np.zeros((rowCount, creatureCount), dtype=np.float64)
+        headingXs = np.ones((rowCount, creatureCount), dtype=np.float64)
+        headingYs = np.zeros((rowCount, creatureCount), dtype=np.float64)
+        sizes = np.zeros((rowCount, creatureCount), dtype=np.float64)
+        constraintRadii = np.zeros((rowCount, creatureCount), dtype=np.float64)
+        speeds = np.zeros(creatureCount, dtype=np.float64)
+        angleLimitCos = np.ones((rowCount, creatureCount), dtype=np.float64)
+        angleLimitSin = np.zeros((rowCount, creatureCount), dtype=np.float64)
+
+        #Creatures that were already packed are copied column by column out of the old arrays
+        oldCount = len(self._creatureInSlot)
+        if oldCount:
+            oldRows = self.xs.shape[0]
+            newSlots = slotOfCreature[self._creatureInSlot]
+            xs[:oldRows, newSlots] = self.xs
+            ys[:oldRows, newSlots] = self.ys
+            headingXs[:oldRows, newSlots] = self.headingXs
+            headingYs[:oldRows, newSlots] = self.headingYs
+            sizes[:oldRows, newSlots] = self.sizes
+            constraintRadii[:oldRows, newSlots] = self.constraintRadii
+            speeds[newSlots] = self.speeds
+            angleLimitCos[:oldRows, newSlots] = self.angleLimitCos
+            angleLimitSin[:oldRows, newSlots] = self.angleLimitSin
+
+        for creature, speed, creatureSizes, creatureRadii, positions, limitCos, limitSin in self._pending:
+            slot = slotOfCreature[creature]
+            nodeCount = len(creatureSizes)
+            xs[:nodeCount, slot] = positions[:, 0]
+            ys[:nodeCount, slot] = positions[:, 1]
+            sizes[:nodeCount, slot] = creatureSizes
+            constraintRadii[:nodeCount, slot] = creatureRadii
+            speeds[slot] = speed
+            angleLimitCos[:nodeCount, slot] = limitCos
+            angleLimitSin[:nodeCount, slot] = limitSin
+        self._pending = []
+
+        self.xs, self.ys = xs, ys
+        self.headingXs, self.headingYs = headingXs, headingYs
+        self.sizes, self.constraintRadii = sizes, constraintRadii
+        self.speeds = speeds
+        self.angleLimitCos, self.angleLimitSin = angleLimitCos, angleLimitSin
+        self._slotOfCreature = slotOfCreature
+        self._creatureInSlot = order
+
+        #Number of creatures that have a node in each row. Because the columns are sorted longest first these are always a prefix
+        sortedCounts = self._nodeCounts[order]
+        self._activeInRow = [int(np.count_nonzero(sortedCounts > row)) for row in range(rowCount)]
+
+        self.updateDrawPoints()
+
+
+    def step(self, dt=SIMULATION_STEP):
+        """Advances every creature one step towards its own desired point
+
+        Args:
+            dt (_float_, optional): length of the step in seconds. Heads move their speed*dt pixels. Defaults to SIMULATION_STEP.
+        """
+        if self._pending:
+            self._pack()
+        if self.creatureCount == 0:
+            return
+
+        _stepSpines(self, self.desiredPoints[self._creatureInSlot], self._activeInRow, dt)
+        self.updateDrawPoints()
+
+
+    def updateDrawPoints(self):
+        """Updates the left and right links of every node of every creature in one vectorized pass
+        """
+        if getattr(self, "leftXs", None) is None or self.leftXs.shape != self.xs.shape:
+            self.leftXs = np.empty_like(self.xs)
+            self.leftYs = np.empty_like(self.xs)
+            self.rightXs = np.empty_like(self.xs)
+            self.rightYs = np.empty_like(self.xs)
+        _updateLinks(self)
+
+
+    def setAngleLimit(self, creature, angleDeg):
+        """Sets the maximum bend between the nodes of a creature and the node in front of them
+
+        Args:
+            creature (_int_): id of the creature
+            angleDeg (_float or [float, float...]_): the limit in degrees, either one value or one per node
+        """
+        if self._pending:
+            self._pack()
+        slot = self._slotOfCreature[creature]
+        nodeCount = self._nodeCounts[creature]
+        radians = np.radians(angleDeg)
+        self.angleLimitCos[:nodeCount, slot] = np.cos(radians)
+        self.angleLimitSin[:nodeCount, slot] = np.sin(radians)
+
+
+    def creaturePositions(self, creature):
+        """Returns the node positions of a single creature
+
+        Args:
+            creature (_int_): id of the creature
+
+        Returns:
+            _numpy.ndarray_: a (n, 2) array of node positions, head first
+        """
+        if self._pending:
+            self._pack()
+        slot = self._slotOfCreature[creature]
+        nodeCount = self._nodeCounts[creature]
+        return np.column_stack((self.xs[:nodeCount, slot], self.ys[:nodeCount, slot]))
+
+
+    def buildOutline(self, creature):
+        """Writes the polygon outline of a single creature into its preallocated outline buffer, in the same order as
+        ArrayNodeGroup.buildOutline()
+
+        Args:
+            creature (_int_): id of the creature
+
+        Returns:
+            _numpy.ndarray_: the (n, 2) outline buffer of the creature
+        """
+        slot = self._slotOfCreature[creature]
+        nodeCount = self._nodeCounts[creature]
+        headBasis = self._headDrawBases[creature]
+        tailBasis = self._tailDrawBases[creature]
+        headCount = len(headBasis)
+        tailCount = len(tailBasis)
+        outline = self._outlines[creature]
+
+        if headCount:
+            _pointsAtAngles((self.xs[0, slot], self.ys[0, slot]), (self.headingXs[0, slot], self.headingYs[0, slot]), self.sizes[0, slot], headBasis, outline[:headCount])
+
+        #The tail node's own links are covered by its tail points, so like NodeGroup they are left out
+        tail = nodeCount - 1
+        leftStart = headCount
+        outline[leftStart:leftStart + tail, 0] = self.leftXs[:tail, slot]
+        outline[leftStart:leftStart + tail, 1] = self.leftYs[:tail, slot]
+
+        tailStart = leftStart + tail
+        if tailCount:
+            _pointsAtAngles((self.xs[tail, slot], self.ys[tail, slot]), (self.headingXs[tail, slot], self.headingYs[tail, slot]), self.sizes[tail, slot], tailBasis, outline[tailStart:tailStart + tailCount])
+
+        rightStart = tailStart + tailCount
+        outline[rightStart:, 0] = self.rightXs[:tail, slot][::-1]
+        outline[rightStart:, 1] = self.rightYs[:tail, slot][::-1]
+        return outline
+
+
+    def connectTheDots(self, surface):
+        """Draws every creature as a filled polygon with an outline
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the creatures on
+        """
+        if self._pending:
+            self._pack()
+        lodIndexes = self.getLodIndexes()
+        for creature in range(self.creatureCount):
+            outline = self.buildOutline(creature)
+            if lodIndexes[creature] is not None:
+                outline = outline[lodIndexes[creature]]
+            elif self.splineKind is not None:
+                outline = _smoothOutline(outline, self.splineKind, self.splineResolution)
+            pygame.draw.polygon(surface, (225, 130, 0), outline, 0)
+            if self.sizes[0, self._slotOfCreature[creature]] >= LOD_STROKE_SIZE:
+                pygame.draw.polygon(surface, (255, 255, 255), outline, 3)
+
+
+    def getLodIndexes(self):
+        """Picks which outline points of every creature to draw this frame, the same way as NodeGroup.getLodIndexes(). The bends of
+        every creature are found together from the heading arrays
+
+        Returns:
+            _[[int, int...] or None...]_: for each creature, indexes into buildOutline() of the points to draw, or None to draw all of them
+        """
+        if self._pending:
+            self._pack()
+        lodIndexes = [None]*self.creatureCount
+        small = self.sizes[0] < self.lodSize
+        if self.lodTolerance <= 0 or not small.any():
+            return lodIndexes
+
+        #Rows past the end of a creature are padding, so they are left out of its bend and spacing. Like ArrayNodeGroup, only the
+        #nodes whose links are in the outline count towards the bend
+        nodeCounts = self._nodeCounts[self._creatureInSlot]
+        rows = np.arange(1, self.xs.shape[0])[:, np.newaxis]
+        bendCos = np.where(rows < nodeCounts - 1, self.headingXs[1:]*self.headingXs[:-1] + self.headingYs[1:]*self.headingYs[:-1], 1).min(axis=0)
+        spacing = np.where(rows < nodeCounts, self.constraintRadii[:-1], 0).max(axis=0)
+
+        for slot in np.flatnonzero(small):
+            creature = self._creatureInSlot[slot]
+            nodeCount = int(nodeCounts[slot])
+            if nodeCount < 3:
+                continue
+            if self._lodProfiles[creature] == None or self._lodProfiles[creature][0] != self.lodTolerance:
+                self._lodProfiles[creature] = (self.lodTolerance,) + lodSizeProfile(self.sizes[:nodeCount - 1, slot].tolist(), self.lodTolerance)
+            tolerance, sizeCurve, keptNodes = self._lodProfiles[creature]
+
+            nodeStride = min(lodStride(tolerance, spacing[slot], math.acos(max(-1.0, min(1.0, bendCos[slot]))), self.sizes[0, slot], sizeCurve), nodeCount - 1)
+            tailStride = lodTailStride(tolerance, self._tailDrawAngles[creature], self.sizes[nodeCount - 1, slot])
+            if nodeStride > 1 or tailStride > 1:
+                lodIndexes[creature] = lodOutlineIndexes(len(self._headDrawBases[creature]), nodeCount - 1, len(self._tailDrawBases[creature]), nodeStride, tailStride, keptNodes)
+        return lodIndexes
+
+
+    def draw(self, surface):
+        """Draws the bodies and eyes of every creature
+        """
+        self.connectTheDots(surface)
+        self.drawEyes(surface)
+
+
+    def drawEyes(self, surface):
+        """Draws the eyes of every creature, placed the same way as ArrayNodeGroup.drawEyes()
+
+        Args:
+            surface (_pygame.Surface_): the surface to draw the eyes on
+        """
+        if self._pending:
+            self._pack()
+        eyeBasis = _angleBasis([50, -50])
+        eyes = np.empty((2, 2), dtype=np.float64)
+        for slot in range(self.creatureCount):
+            if self.sizes[0, slot] < LOD_EYE_SIZE:
+                continue
+            _pointsAtAngles((self.xs[0, slot], self.ys[0, slot]), (self.headingXs[0, slot], self.headingYs[0, slot]), self.sizes[0, slot]/2, eyeBasis, eyes)
+            for eye in eyes:
+                pygame.draw.circle(surface, (255, 255, 255), eye, 10, 0)
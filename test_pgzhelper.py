@@ -0,0 +1,100 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+import pytest
+
+from pgzhelper import Actor, Collide
+
+
+COUNT = 300
+
+def random_shape(rng):
+  # x, y, w, h, angle of the shape every batch is tested against
+  return (rng.uniform(300, 500), rng.uniform(200, 400), rng.uniform(60, 200), rng.uniform(60, 200), rng.uniform(-180, 180))
+
+def random_points(rng):
+  return np.column_stack((rng.uniform(200, 600, COUNT), rng.uniform(100, 500, COUNT)))
+
+def random_circles(rng):
+  return np.column_stack((random_points(rng), rng.uniform(1, 80, COUNT)))
+
+def random_rects(rng):
+  return np.column_stack((random_points(rng), rng.uniform(5, 150, COUNT), rng.uniform(5, 150, COUNT)))
+
+def random_lines(rng):
+  return np.column_stack((random_points(rng), random_points(rng)))
+
+def random_obbs(rng):
+  return np.column_stack((random_rects(rng), rng.uniform(-180, 180, COUNT)))
+
+
+# name: (shape arguments, batch maker, single test)
+CASES = {
+  'circle_points': (lambda s: s[:2] + (s[2] / 2,), random_points, Collide.circle_point),
+  'rect_points': (lambda s: s[:4], random_points, Collide.rect_point),
+  'obb_points': (lambda s: s, random_points, Collide.obb_point),
+  'line_lines': (lambda s: s[:4], random_lines, Collide.line_line),
+  'obb_lines': (lambda s: s, random_lines, Collide.obb_line),
+  'obb_circles': (lambda s: s, random_circles, Collide.obb_circle),
+  'obb_rects': (lambda s: s, random_rects, Collide.obb_rect),
+  'obb_obbs': (lambda s: s, random_obbs, Collide.obb_obb),
+}
+
+
+@pytest.mark.parametrize('name', list(CASES))
+@pytest.mark.parametrize('seed', range(5))
+def test_batch_matches_scalar(name, seed):
+  shape_args, make_batch, single = CASES[name]
+  rng = np.random.default_rng(seed)
+  args = shape_args(random_shape(rng))
+  batch = make_batch(rng)
+
+  mask = getattr(Collide, name + '_mask')(*args, batch)
+  expected = np.array([bool(single(*args, *row)) for row in batch.tolist()])
+  assert mask.dtype == bool
+  assert mask.shape == (COUNT,)
+  assert np.array_equal(mask, expected)
+  assert mask.any() and not mask.all()
+
+  assert np.array_equal(getattr(Collide, name + '_all')(*args, batch), np.flatnonzero(expected))
+
+  # The scalar plural functions return the index of the first hit
+  first_hit = int(np.argmax(expected)) if expected.any() else -1
+  assert getattr(Collide, name)(*args, [tuple(row) for row in batch.tolist()]) == first_hit
+
+
+@pytest.mark.parametrize('name', list(CASES))
+def test_batch_empty(name):
+  shape_args, make_batch, single = CASES[name]
+  args = shape_args((400, 300, 100, 50, 30))
+  assert getattr(Collide, name + '_mask')(*args, []).shape == (0,)
+  assert getattr(Collide, name + '_all')(*args, []).shape == (0,)
+
+
+def test_obb_obbs_checks_past_the_first():
+  obbs = [(0, 0, 10, 10, 0), (1000, 1000, 10, 10, 0), (400, 300, 10, 10, 45)]
+  assert Collide.obb_obbs(400, 300, 50, 50, 10, obbs) == 2
+  assert Collide.obb_obbs(400, 300, 50, 50, 10, obbs[:2]) == -1
+  assert Collide.obb_obbs_all(400, 300, 50, 50, 10, obbs).tolist() == [2]
+
+
+def placed_actor(lazy, changes):
+  actor = Actor(pygame.Surface((20, 40)), pos=(100, 100))
+  actor.lazy_transforms = lazy
+  for attr, value in changes:
+    setattr(actor, attr, value)
+  return (*actor.get_rect().topleft, *actor.pos)
+
+
+@pytest.mark.parametrize('changes', [
+  [('angle', 45), ('topleft', (0, 0))],
+  [('scale', 2), ('angle', 30), ('midbottom', (50, 60))],
+  [('angle', 60), ('width', 30), ('centerx', 200)],
+  [('angle', 90), ('anchor', ('left', 'top'))],
+  [('scale', 0.5), ('flip_x', True), ('angle', 20), ('anchor', ('right', 'bottom')), ('x', 40)],
+])
+def test_lazy_transforms_place_actors_like_eager(changes):
+  assert placed_actor(True, changes) == pytest.approx(placed_actor(False, changes))
@@ -0,0 +1,120 @@
+import math
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from proceduralSpine import NodeGroup, buildSnake, snakeProfile, SNAKE_HEAD_DRAW_POINTS, SNAKE_TAIL_DRAW_POINTS
+
+
+def chaseTarget(step):
+    #A tight circle that makes the body curl into its angle limits, with a sharp turn back every 90 steps
+    t = step/15
+    if (step//90) % 2:
+        t = -t
+    return (400 + 150*math.cos(t), 300 + 150*math.sin(t))
+
+
+def stepGroup(nodeGroup, target):
+    nodeGroup.desiredPoint = [target[0], target[1]]
+    nodeGroup.updateHeadNode()
+    nodeGroup.updateNodePositions()
+
+
+def buildProfileGroup(angleLimit, constraintMode):
+    nodeSizes, nodeConstraintRadii = snakeProfile()
+    nodeGroup = NodeGroup.fromProfile(300, nodeSizes, nodeConstraintRadii, [400, 300], SNAKE_HEAD_DRAW_POINTS, SNAKE_TAIL_DRAW_POINTS, [angleLimit]*len(nodeSizes))
+    nodeGroup.constraintMode = constraintMode
+    return nodeGroup
+
+
+def assertPositionsClose(positions, expected, tolerance):
+    assert len(positions) == len(expected)
+    for position, expectedPosition in zip(positions, expected):
+        assert abs(position[0] - expectedPosition[0]) <= tolerance
+        assert abs(position[1] - expectedPosition[1]) <= tolerance
+
+
+@pytest.mark.parametrize("angleLimit", [20, 45, 90, 160])
+def test_vector_and_angle_constraints_match(angleLimit):
+    vectorGroup = buildProfileGroup(angleLimit, "vector")
+    angleGroup = buildProfileGroup(angleLimit, "angle")
+    for step in range(400):
+        target = chaseTarget(step)
+        stepGroup(vectorGroup, target)
+        stepGroup(angleGroup, target)
+        assertPositionsClose(vectorGroup.getNodePositions(), angleGroup.getNodePositions(), 1e-6)
+
+
+def test_array_engine_matches_node_group():
+    nodeGroup = buildSnake(False)
+    arrayGroup = buildSnake(True)
+    for step in range(400):
+        target = chaseTarget(step)
+        stepGroup(nodeGroup, target)
+        stepGroup(arrayGroup, target)
+    assertPositionsClose(arrayGroup.getNodePositions(), nodeGroup.getNodePositions(), 1e-6)
+    assert len(arrayGroup.buildOutline()) == len(nodeGroup.buildOutline())
+
+
+@pytest.mark.parametrize("useArrayEngine", [False, True])
+def test_group_settles_on_a_fixed_target(useArrayEngine):
+    nodeGroup = buildSnake(useArrayEngine)
+    for step in range(200):
+        stepGroup(nodeGroup, chaseTarget(step))
+    assert not nodeGroup.settled
+
+    for step in range(2000):
+        stepGroup(nodeGroup, (700, 500))
+        if nodeGroup.settled:
+            break
+    assert nodeGroup.settled
+
+    #A settled group stays put until the target moves
+    positions = [list(position) for position in nodeGroup.getNodePositions()]
+    stepGroup(nodeGroup, (700, 500))
+    assert nodeGroup.settled
+    assertPositionsClose(nodeGroup.getNodePositions(), positions, 0)
+
+    stepGroup(nodeGroup, (100, 100))
+    assert not nodeGroup.settled
+
+
+def drawnPixels(nodeGroup, cached):
+    surface = pygame.Surface((800, 600))
+    if cached:
+        nodeGroup.draw(surface)
+    else:
+        nodeGroup.connectTheDots(surface)
+        nodeGroup.drawEyes(surface)
+    return pygame.surfarray.array3d(surface)
+
+
+def settle(nodeGroup, target=(700, 500)):
+    for step in range(2000):
+        stepGroup(nodeGroup, target)
+        if nodeGroup.settled:
+            return
+    raise AssertionError("the group never settled")
+
+
+@pytest.mark.parametrize("useArrayEngine", [False, True])
+def test_settled_render_cache_follows_draw_settings(useArrayEngine):
+    nodeGroup = buildSnake(useArrayEngine, bodyNodes=24)
+    settle(nodeGroup)
+    drawnPixels(nodeGroup, True)
+
+    nodeGroup.splineKind = "catmull-rom"
+    assert (drawnPixels(nodeGroup, True) == drawnPixels(nodeGroup, False)).all()
+    nodeGroup.splineResolution = 6
+    assert (drawnPixels(nodeGroup, True) == drawnPixels(nodeGroup, False)).all()
+
+    #Shrinking the head below LOD_SIZE switches to the reduced outline, and below LOD_EYE_SIZE drops the eyes
+    nodeGroup.setNodeSize(0, 6)
+    assert not nodeGroup.settled
+    settle(nodeGroup)
+    assert (drawnPixels(nodeGroup, True) == drawnPixels(nodeGroup, False)).all()
+    nodeGroup.lodTolerance = 0
+    assert (drawnPixels(nodeGroup, True) == drawnPixels(nodeGroup, False)).all()
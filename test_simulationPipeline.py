@@ -0,0 +1,46 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import threading
+
+import pygame
+import pytest
+
+from frameProfiler import FrameProfiler
+from proceduralSpine import buildSnake
+from simulationPipeline import SimulationPipeline
+
+
+class ThreadCheckingProfiler(FrameProfiler):
+    """A FrameProfiler that remembers if it was ever used off the main thread
+    """
+    def __init__(self):
+        super().__init__()
+        self.usedOffMainThread = False
+
+    def addTime(self, name, seconds):
+        if threading.current_thread() is not threading.main_thread():
+            self.usedOffMainThread = True
+        super().addTime(name, seconds)
+
+
+@pytest.mark.parametrize("useArrayEngine", [False, True])
+def test_worker_timings_land_on_the_main_thread(useArrayEngine):
+    nodeGroup = buildSnake(useArrayEngine, bodyNodes=24)
+    profiler = ThreadCheckingProfiler()
+    nodeGroup.profiler = profiler
+    pipeline = SimulationPipeline(nodeGroup)
+    surface = pygame.Surface((800, 600))
+    for frame in range(20):
+        profiler.beginFrame()
+        pipeline.submit((100 + 20*frame, 100), 2, 1/120)
+        pipeline.draw(surface)
+        profiler.endFrame()
+    pipeline.close()
+
+    assert not profiler.usedOffMainThread
+    assert nodeGroup.profiler is profiler
+    #Every frame after the first waits for the job submitted the frame before, and takes its timings
+    assert len(profiler.frameTimes["head move"]) == 19
+    assert len(profiler.frameTimes["pygame.draw.polygon"]) == 20